@@ -1,8 +1,10 @@
 from ._version import __version__
-from typing import List, Optional, Dict, Union, Any
-from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import time
+import logging
+import threading
 
 # ---------------------------------------------------------------------------
 # Sub-module imports
@@ -17,6 +19,8 @@ from bdshare.stock.trading import (
     get_basic_historical_data,
     get_close_price_data,
     get_last_trade_price_data,
+    iter_historical_rows,
+    iter_historical_chunks,
 )
 
 # Market data
@@ -26,6 +30,7 @@ from bdshare.stock.market import (
     get_latest_pe,
     get_market_info_more_data,
     get_market_depth_data,
+    get_market_depth_many,
     get_sector_performance,
     get_top_gainers_losers,
 )
@@ -39,19 +44,45 @@ from bdshare.stock.news import (
     get_news,
 )
 
+# Live snapshots
+from bdshare.stock.snapshot import (
+    SnapshotDelta,
+    SymbolIndex,
+    TradeSnapshot,
+    get_dsex_quotes,
+    get_top_movers,
+    get_trade_quotes,
+    rank_snapshot,
+)
+from bdshare.stock.stream import Subscription, TradeBroker, astream_trades, stream_trades
+from bdshare.stock.ticks import BarBuilder, TickStore
+from bdshare.stock.orderbook import OrderBookStore, depth_levels
+from bdshare.stock.scheduler import AdaptivePoller
+
 # Utilities
 from bdshare.util import (
     Store,
+    Manifest,
     Tickers,
     get_token,
     set_token,
     get_session,
     set_session,
     clear_cache,
+    configure_cache,
     configure_proxy,
+    SQLiteCache,
+    set_cache_backend,
+    get_output,
+    set_output,
 )
-from bdshare.util.cache import _TTLCache
-from bdshare.util.helper import deprecated
+from bdshare.util.cache import _TTLCache, _MISSING, _bypass_lookup
+from bdshare.util.output import resolve_output
+from bdshare.util.helper import RateLimiter, deprecated
+from bdshare.util.helper import BDShareError as _FetchError
+from requests import RequestException
+
+logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # Type aliases
@@ -90,33 +121,6 @@ class BDShareError(Exception):
     """Top-level client exception."""
 
 
-# ---------------------------------------------------------------------------
-# Rate limiter
-# ---------------------------------------------------------------------------
-
-class RateLimiter:
-    """Sliding-window rate limiter (default: 5 calls / second)."""
-
-    def __init__(self, max_calls: int = 5, period: float = 1.0):
-        self.max_calls = max_calls
-        self.period    = period
-        self.calls: list = []
-
-    def __call__(self, func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            now = time.monotonic()
-            self.calls = [t for t in self.calls if now - t < self.period]
-            if len(self.calls) >= self.max_calls:
-                sleep_for = self.period - (now - self.calls[0])
-                if sleep_for > 0:
-                    time.sleep(sleep_for)
-                self.calls.clear()
-            self.calls.append(time.monotonic())
-            return func(*args, **kwargs)
-        return wrapper
-
-
 # ---------------------------------------------------------------------------
 # Main client
 # ---------------------------------------------------------------------------
@@ -133,10 +137,71 @@ class BDShare:
 
     _rate_limiter = RateLimiter(max_calls=5, period=1.0)
 
-    def __init__(self, api_key: Optional[str] = None, cache_enabled: bool = True):
+    # Cache TTL in seconds, keyed by cache-key prefix.
+    _TTL = {
+        "market_summary":     60,
+        "company_profile":    3600,
+        "pe_ratios":          3600,
+        "top_movers":         300,
+        "sector_performance": 300,
+        "hist":               86400,
+        "current_trades":     30,
+        "dsex_index":         60,
+        "trading_codes":      86400,
+        "news":               300,
+    }
+
+    # Endpoints accepted by warm() / start_prefetch(), mapped to the getter
+    # that fills them with default arguments.
+    _WARMABLE = {
+        "market_summary":     "get_market_summary",
+        "pe_ratios":          "get_latest_pe_ratios",
+        "top_movers":         "get_top_movers",
+        "sector_performance": "get_sector_performance",
+        "current_trades":     "get_current_trades",
+        "dsex_index":         "get_dsex_index",
+        "trading_codes":      "get_trading_codes",
+        "news":               "get_news",
+    }
+    _DEFAULT_WARM = ("trading_codes", "pe_ratios", "sector_performance", "current_trades")
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache_enabled: bool = True,
+        cache_backend: Optional[Any] = None,
+        max_stale: float = 0,
+        stale_while_revalidate: bool = False,
+        output: Optional[str] = None,
+    ):
+        """
+        :param api_key:       Optional premium API key.
+        :param cache_enabled: Set ``False`` to bypass caching entirely.
+        :param cache_backend: Shared backend such as :class:`SQLiteCache`;
+                              defaults to a private in-process ``_TTLCache``.
+        :param max_stale:     Seconds past its TTL an entry may still be
+                              served — as a fallback when DSE fails, or
+                              immediately when *stale_while_revalidate*.
+        :param stale_while_revalidate: Return a stale entry at once and
+                              refresh it on a background thread.
+        :param output:        Result type of the table getters - 'pandas',
+                              'arrow' or 'polars'; defaults to
+                              :func:`get_output`.
+        """
         self._session      = get_session()
-        self._store        = _TTLCache() if cache_enabled else None
+        # Only a private backend is ours to wipe on __exit__.
+        self._owns_store   = cache_backend is None
+        if cache_backend is None:
+            cache_backend = _TTLCache()
+        self._store        = cache_backend if cache_enabled else None
         self.cache_enabled = cache_enabled
+        self.max_stale     = max_stale
+        self.stale_while_revalidate = stale_while_revalidate
+        self.output        = resolve_output(output) if output is not None else None
+        self._refreshing: set = set()
+        self._refresh_lock = threading.Lock()
+        self._prefetch_thread: Optional[threading.Thread] = None
+        self._prefetch_stop   = threading.Event()
         if api_key:
             set_token(api_key)
 
@@ -144,7 +209,10 @@ class BDShare:
         return self
 
     def __exit__(self, *_):
-        self.clear_cache()
+        # Shared/persistent backends and the module cache outlive the client.
+        self.stop_prefetch()
+        if self._owns_store and self._store is not None:
+            self._store.clear()
         set_session(None)
 
     @property
@@ -153,67 +221,217 @@ class BDShare:
 
     # -- Cache helpers -------------------------------------------------------
 
-    def _get_cache(self, key: str) -> Optional[Any]:
-        if self.cache_enabled and self._store:
-            return self._store.get(key)
-        return None
+    def _get_cache(self, key: str) -> Any:
+        """Return the cached value for *key*, or ``_MISSING`` on a miss."""
+        if self.cache_enabled and self._store is not None:
+            return self._store.get(key, _MISSING)
+        return _MISSING
+
+    def _get_cache_entry(self, key: str) -> Optional[tuple]:
+        """Return ``(value, fresh)`` for *key*, stale entries included, or ``None``."""
+        if not (self.cache_enabled and self._store is not None):
+            return None
+        get_entry = getattr(self._store, "get_entry", None)
+        if get_entry is None:  # backend without stale support
+            hit = self._store.get(key, _MISSING)
+            return None if hit is _MISSING else (hit, True)
+        return get_entry(key)
 
     def _set_cache(self, key: str, data: Any, ttl: int = 300) -> None:
-        if self.cache_enabled and self._store:
-            self._store.set(key, data, ttl=ttl)
+        if self.cache_enabled and self._store is not None:
+            if self.max_stale and hasattr(self._store, "get_entry"):
+                self._store.set(key, data, ttl=ttl, stale_ttl=self.max_stale)
+            else:
+                self._store.set(key, data, ttl=ttl)
+
+    def _cached(self, key: str, fetch: Callable[[], Any], ttl: int, use_cache: bool = True) -> Any:
+        """
+        Serve *key* from the cache, or call *fetch* and cache its result.
+
+        With ``use_cache=False`` the lookup is skipped but the fresh result
+        still replaces the cached entry. Entries less than ``max_stale``
+        seconds past their TTL are returned immediately (and refreshed in
+        the background) under ``stale_while_revalidate``, and otherwise
+        stand in for the fresh result if DSE cannot be reached.
+        Non-pandas results are cached under their own ``@output`` key.
+        """
+        output = resolve_output(self.output)
+        if output != "pandas":
+            key = f"{key}@{output}"
+        stale = None
+        if use_cache:
+            entry = self._get_cache_entry(key)
+            if entry is not None:
+                if entry[1]:
+                    return entry[0]
+                if self.stale_while_revalidate:
+                    self._refresh_in_background(key, fetch, ttl)
+                    return entry[0]
+                stale = entry
+        try:
+            with _bypass_lookup():
+                data = fetch()
+        except (_FetchError, RequestException) as exc:
+            if stale is None:
+                raise
+            logger.warning("Serving stale %r after upstream failure: %s", key, exc)
+            return stale[0]
+        self._set_cache(key, data, ttl=ttl)
+        return data
+
+    def _refresh_in_background(self, key: str, fetch: Callable[[], Any], ttl: int) -> None:
+        """Refresh *key* on a daemon thread, at most one refresh per key at a time."""
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                with _bypass_lookup():
+                    data = self._rate_limiter(fetch)()
+                self._set_cache(key, data, ttl=ttl)
+            except Exception as exc:
+                logger.warning("Background refresh of %r failed: %s", key, exc)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name=f"bdshare-refresh-{key}", daemon=True).start()
+
+    # -- Warm-up & prefetch ---------------------------------------------------
+
+    def warm(
+        self,
+        endpoints: Optional[List[str]] = None,
+        max_workers: int = 4,
+    ) -> Dict[str, Exception]:
+        """
+        Fetch *endpoints* concurrently and store them in the cache, so the
+        first real request after startup is served warm::
+
+            bd = BDShare()
+            bd.warm(["trading_codes", "pe_ratios", "current_trades"])
+
+        :param endpoints:   Names from ``BDShare._WARMABLE``. Defaults to
+                            trading codes, P/E ratios, sector performance
+                            and the current trade snapshot.
+        :param max_workers: Number of concurrent fetches (still subject to
+                            the shared rate limiter).
+        :return: Mapping of endpoint name to the exception it raised; empty
+                 when every endpoint was fetched.
+        """
+        if not self.cache_enabled:
+            raise BDShareError("Cannot warm a BDShare client with caching disabled.")
+        names = list(endpoints or self._DEFAULT_WARM)
+        unknown = [n for n in names if n not in self._WARMABLE]
+        if unknown:
+            raise ValueError(f"Unknown endpoints {unknown}. Choose from: {list(self._WARMABLE)}")
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bdshare-warm") as pool:
+            futures = {
+                name: pool.submit(getattr(self, self._WARMABLE[name]), use_cache=False)
+                for name in names
+            }
+        errors = {}
+        for name, future in futures.items():
+            exc = future.exception()
+            if exc is not None:
+                logger.warning("Warming %r failed: %s", name, exc)
+                errors[name] = exc
+        return errors
+
+    def start_prefetch(
+        self,
+        endpoints: Optional[List[str]] = None,
+        lead: float = 0.1,
+        max_workers: int = 4,
+    ) -> None:
+        """
+        Warm *endpoints* now, then keep refreshing each one on a background
+        thread shortly before its TTL expires, so hot data is always cached.
+
+        :param endpoints:   As for :meth:`warm`.
+        :param lead:        Fraction of each TTL to refresh early by
+                            (``0.1`` refreshes a 60 s entry after 54 s).
+        :param max_workers: As for :meth:`warm`.
+        """
+        if self._prefetch_thread is not None and self._prefetch_thread.is_alive():
+            raise BDShareError("Prefetch is already running; call stop_prefetch() first.")
+        names = list(endpoints or self._DEFAULT_WARM)
+        self.warm(names, max_workers=max_workers)
+
+        periods = {name: max(self._TTL[name] * (1 - lead), 1.0) for name in names}
+        self._prefetch_stop.clear()
+
+        def loop():
+            due = {name: time.monotonic() + period for name, period in periods.items()}
+            while not self._prefetch_stop.is_set():
+                now = time.monotonic()
+                ready = [name for name, at in due.items() if at <= now]
+                if ready:
+                    self.warm(ready, max_workers=max_workers)
+                    for name in ready:
+                        due[name] = time.monotonic() + periods[name]
+                    continue
+                self._prefetch_stop.wait(min(due.values()) - now)
+
+        self._prefetch_thread = threading.Thread(target=loop, name="bdshare-prefetch", daemon=True)
+        self._prefetch_thread.start()
+
+    def stop_prefetch(self, timeout: Optional[float] = None) -> None:
+        """Stop the background prefetch thread started by :meth:`start_prefetch`."""
+        self._prefetch_stop.set()
+        if self._prefetch_thread is not None:
+            self._prefetch_thread.join(timeout)
+            self._prefetch_thread = None
 
     # -- Market data ---------------------------------------------------------
 
     @_rate_limiter
     def get_market_summary(self, use_cache: bool = True) -> MarketData:
         """Current market summary (indices, volume, market cap)."""
-        key = "market_summary"
-        if use_cache and (hit := self._get_cache(key)):
-            return hit
-        data = get_market_info()
-        self._set_cache(key, data, ttl=60)
-        return data
+        return self._cached(
+            "market_summary", lambda: get_market_info(output=self.output),
+            ttl=self._TTL["market_summary"], use_cache=use_cache,
+        )
 
     @_rate_limiter
     def get_company_profile(self, symbol: str, use_cache: bool = True) -> CompanyInfo:
         """Detailed company profile."""
         _validate_symbol(symbol)
-        key = f"company_profile:{symbol.upper()}"
-        if use_cache and (hit := self._get_cache(key)):
-            return hit
-        data = get_company_info(symbol)
-        self._set_cache(key, data, ttl=3600)
-        return data
+        return self._cached(
+            f"company_profile:{symbol.upper()}",
+            lambda: get_company_info(symbol, output=self.output),
+            ttl=self._TTL["company_profile"],
+            use_cache=use_cache,
+        )
 
     @_rate_limiter
     def get_latest_pe_ratios(self, use_cache: bool = True) -> Dict[str, float]:
         """Latest P/E ratios for all companies."""
-        key = "pe_ratios"
-        if use_cache and (hit := self._get_cache(key)):
-            return hit
-        data = get_latest_pe()
-        self._set_cache(key, data, ttl=3600)
-        return data
+        return self._cached(
+            "pe_ratios", lambda: get_latest_pe(output=self.output),
+            ttl=self._TTL["pe_ratios"], use_cache=use_cache,
+        )
 
     @_rate_limiter
-    def get_top_movers(self, limit: int = 10, use_cache: bool = True):
-        """Top gainers and losers."""
-        key = f"top_movers:{limit}"
-        if use_cache and (hit := self._get_cache(key)):
-            return hit
-        data = get_top_gainers_losers(limit)
-        self._set_cache(key, data, ttl=300)
-        return data
+    def get_top_movers(self, limit: int = 10, use_cache: bool = True, local: bool = False):
+        """Top gainers and losers (``local=True`` ranks the live snapshot)."""
+        return self._cached(
+            f"top_movers:{limit}" + (":local" if local else ""),
+            lambda: get_top_gainers_losers(limit, local=local, output=self.output),
+            ttl=self._TTL["top_movers"],
+            use_cache=use_cache,
+        )
 
     @_rate_limiter
     def get_sector_performance(self, use_cache: bool = True):
         """Sector-wise performance."""
-        key = "sector_performance"
-        if use_cache and (hit := self._get_cache(key)):
-            return hit
-        data = get_sector_performance()
-        self._set_cache(key, data, ttl=300)
-        return data
+        return self._cached(
+            "sector_performance", lambda: get_sector_performance(output=self.output),
+            ttl=self._TTL["sector_performance"], use_cache=use_cache,
+        )
 
     # -- Trading data --------------------------------------------------------
 
@@ -228,43 +446,42 @@ class BDShare:
         """Historical OHLCV data for a symbol."""
         _validate_symbol(symbol)
         _validate_date_range(start_date, end_date)
-        key = f"hist:{symbol}:{start_date}:{end_date}"
-        if use_cache and (hit := self._get_cache(key)):
-            return hit
-        data = get_historical_data(start=start_date, end=end_date, code=symbol)
-        if use_cache:
-            self._set_cache(key, data, ttl=86400)
-        return data
+
+        def fetch():
+            return get_historical_data(start=start_date, end=end_date, code=symbol, output=self.output)
+
+        if not use_cache:
+            with _bypass_lookup():
+                return fetch()
+        return self._cached(f"hist:{symbol}:{start_date}:{end_date}", fetch, ttl=self._TTL["hist"])
 
     @_rate_limiter
     def get_current_trades(self, symbol: Optional[str] = None, use_cache: bool = True):
         """Live trade data (last prices)."""
-        key = f"current_trades:{symbol or 'all'}"
-        if use_cache and (hit := self._get_cache(key)):
-            return hit
-        data = get_current_trade_data(symbol)
-        self._set_cache(key, data, ttl=30)
-        return data
+        return self._cached(
+            f"current_trades:{symbol or 'all'}",
+            lambda: get_current_trade_data(symbol, output=self.output),
+            ttl=self._TTL["current_trades"],
+            use_cache=use_cache,
+        )
 
     @_rate_limiter
     def get_dsex_index(self, symbol: Optional[str] = None, use_cache: bool = True):
         """DSEX index data."""
-        key = f"dsex_index:{symbol or 'all'}"
-        if use_cache and (hit := self._get_cache(key)):
-            return hit
-        data = get_dsex_data(symbol)
-        self._set_cache(key, data, ttl=60)
-        return data
+        return self._cached(
+            f"dsex_index:{symbol or 'all'}",
+            lambda: get_dsex_data(symbol, output=self.output),
+            ttl=self._TTL["dsex_index"],
+            use_cache=use_cache,
+        )
 
     @_rate_limiter
     def get_trading_codes(self, use_cache: bool = True):
         """All current trading codes."""
-        key = "trading_codes"
-        if use_cache and (hit := self._get_cache(key)):
-            return hit
-        data = get_current_trading_code()
-        self._set_cache(key, data, ttl=86400)
-        return data
+        return self._cached(
+            "trading_codes", lambda: get_current_trading_code(output=self.output),
+            ttl=self._TTL["trading_codes"], use_cache=use_cache,
+        )
 
     # -- News ----------------------------------------------------------------
 
@@ -281,17 +498,17 @@ class BDShare:
         :param news_type: 'all', 'agm', 'corporate', or 'psn'
         :param code: Optional trading code filter.
         """
-        key = f"news:{news_type}:{code or 'all'}"
-        if use_cache and (hit := self._get_cache(key)):
-            return hit
-        data = get_news(news_type=news_type, code=code)
-        self._set_cache(key, data, ttl=300)
-        return data
+        return self._cached(
+            f"news:{news_type}:{code or 'all'}",
+            lambda: get_news(news_type=news_type, code=code, output=self.output),
+            ttl=self._TTL["news"],
+            use_cache=use_cache,
+        )
 
     # -- Misc ----------------------------------------------------------------
 
     def clear_cache(self) -> None:
-        if self.cache_enabled and self._store:
+        if self.cache_enabled and self._store is not None:
             self._store.clear()
         clear_cache()
 
@@ -342,6 +559,8 @@ __all__ = [
     "get_basic_historical_data",
     "get_close_price_data",
     "get_last_trade_price_data",
+    "iter_historical_rows",
+    "iter_historical_chunks",
 
     # Trading — deprecated aliases (removed in 2.0.0)
     "get_hist_data",
@@ -360,6 +579,7 @@ __all__ = [
     "get_latest_pe",
     "get_market_info_more_data",
     "get_market_depth_data",
+    "get_market_depth_many",
     "get_sector_performance",
     "get_top_gainers_losers",
 
@@ -368,10 +588,35 @@ __all__ = [
     "get_market_inf",
     "get_market_inf_more_data",
 
+    # Live data
+    "get_trade_quotes",
+    "get_dsex_quotes",
+    "get_top_movers",
+    "rank_snapshot",
+    "SymbolIndex",
+    "TradeSnapshot",
+    "SnapshotDelta",
+    "stream_trades",
+    "astream_trades",
+    "TradeBroker",
+    "Subscription",
+    "TickStore",
+    "BarBuilder",
+    "OrderBookStore",
+    "depth_levels",
+    "AdaptivePoller",
+
     # Utilities
     "Store",
+    "Manifest",
     "Tickers",
     "configure_proxy",
+    "configure_cache",
+    "clear_cache",
+    "SQLiteCache",
+    "set_cache_backend",
+    "get_output",
+    "set_output",
 
     # Types
     "MarketData",
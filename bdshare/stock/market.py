@@ -1,12 +1,20 @@
 import logging
+import threading
+import time
 import pandas as pd
-from typing import Optional
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
+from typing import Iterable, Optional
+from urllib.parse import urlparse
 from bdshare.util import vars as vs
 from bdshare.util.helper import (
     _fetch_table, _safe_num, _parse_html,
     safe_get, safe_post,
-    BDShareError, _session, deprecated,
+    BDShareError, RateLimiter, _session, deprecated,
 )
+from bdshare.util.cache import cached
+from bdshare.util.output import from_frame, from_rows, resolve_output
 
 logger = logging.getLogger(__name__)
 
@@ -23,13 +31,124 @@ _CLS_STRIPPED = "table table-stripped"
 # the actual company data tables begin; all earlier tables are structural noise.
 _COMPANY_INFO_TABLE_OFFSET = 400
 
+# The depth endpoint only answers AJAX requests from a session that has
+# visited the referer page; the cookies it sets are reused until they expire
+# (or for _DEPTH_PRIME_TTL seconds when they carry no expiry).
+_DEPTH_PRIME_TTL = 600.0
+_DSE_HOST = urlparse(vs.DSE_URL).hostname
+_DEPTH_HEADERS = {
+    "X-Requested-With": "XMLHttpRequest",
+    "Referer":          vs.DSE_URL + vs.DSE_MARKET_DEPTH_REFERER_URL,
+}
+_DEPTH_COLUMNS = ["buy_price", "buy_volume", "sell_price", "sell_volume"]
+_depth_lock = threading.Lock()
+_depth_primed_until = 0.0
+
+
+# ---------------------------------------------------------------------------
+# Market depth helpers
+# ---------------------------------------------------------------------------
+
+def _prime_depth_session(force: bool = False) -> None:
+    """Visit the depth referer page once and remember when its cookies expire."""
+    global _depth_primed_until
+    with _depth_lock:
+        now = time.time()
+        if not force and now < _depth_primed_until:
+            return
+        try:
+            _session.head(vs.DSE_URL + vs.DSE_MARKET_DEPTH_REFERER_URL, timeout=10)
+        except requests.RequestException as exc:
+            raise BDShareError(f"Failed to prime market depth session: {exc}") from exc
+        # The shared session also holds cookies for other hosts and stale
+        # ones the server never cleared; only live DSE cookies count.
+        expires = [
+            c.expires for c in _session.cookies
+            if c.expires and c.expires > now and _is_dse_domain(c.domain)
+        ]
+        _depth_primed_until = min([now + _DEPTH_PRIME_TTL, *expires])
+
+
+def _is_dse_domain(domain: str) -> bool:
+    domain = domain.lstrip(".")
+    return domain == _DSE_HOST or domain.endswith("." + _DSE_HOST)
+
+
+def _parse_depth_rows(content: bytes, symbol: str) -> list:
+    """Parse the buy/sell ladder returned by ``ajax/load-instrument.php``."""
+    soup = _parse_html(content)
+    table = soup.find("table", attrs={"class": _CLS_STRIPPED})
+    if table is None:
+        raise BDShareError(f"Market depth table not found for {symbol}.")
+
+    result = []
+
+    for row in table.find_all("tr")[:1]:
+        cols = row.find_all("td", valign="top")
+        for idx, mainrow in enumerate(cols):
+            for inner_row in mainrow.find_all("tr")[2:]:
+                newcols = inner_row.find_all("td")
+                if len(newcols) >= 2:
+                    m = idx * 2
+                    result.append({
+                        _DEPTH_COLUMNS[m]:     _safe_num(newcols[0].text, float),
+                        _DEPTH_COLUMNS[m + 1]: _safe_num(newcols[1].text, int),
+                    })
+
+    return result
+
+
+def _align_depth(rows: list) -> list:
+    """
+    Pair the n-th best bid with the n-th best ask, one record per price level.
+
+    The parsed ladder holds buy and sell rows as separate records; level 0
+    of the result is the best (highest) bid and best (lowest) ask.
+    """
+    bids = sorted((r for r in rows if r.get("buy_price") is not None),
+                  key=lambda r: -r["buy_price"])
+    asks = sorted((r for r in rows if r.get("sell_price") is not None),
+                  key=lambda r: r["sell_price"])
+    return [
+        {**dict.fromkeys(_DEPTH_COLUMNS), **bid, **ask}
+        for bid, ask in zip_longest(bids, asks, fillvalue={})
+    ]
+
+
+def _fetch_depth(symbol: str, retry_count: int, pause: float) -> list:
+    """POST one depth request on the primed session, re-priming once if it went stale."""
+    for attempt in range(2):
+        _prime_depth_session(force=bool(attempt))
+        r = safe_post(
+            vs.DSE_URL + vs.DSE_MARKET_DEPTH_URL,
+            data={"inst": symbol},
+            retries=retry_count,
+            pause=pause,
+            headers=_DEPTH_HEADERS,
+        )
+        try:
+            return _parse_depth_rows(r.content, symbol)
+        except BDShareError:
+            if attempt:
+                raise
+            logger.debug("Depth table missing for %s; re-priming session", symbol)
+
 
 # ---------------------------------------------------------------------------
 # Public API  (canonical names as of v1.1.5)
 # ---------------------------------------------------------------------------
 
-def get_market_info(retry_count: int = 3, pause: float = 0.2) -> pd.DataFrame:
-    """Get current market summary (indices, volumes, market cap)."""
+@cached(ttl=60)
+def get_market_info(
+    retry_count: int = 3,
+    pause: float = 0.2,
+    output: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Get current market summary (indices, volumes, market cap).
+
+    :param output: 'pandas', 'arrow' or 'polars'; defaults to :func:`get_output`.
+    """
     table = _fetch_table(
         vs.DSE_URL + vs.DSE_MARKET_INFO_URL,
         vs.DSE_ALT_URL + vs.DSE_MARKET_INFO_URL,
@@ -60,15 +179,26 @@ def get_market_info(retry_count: int = 3, pause: float = 0.2) -> pd.DataFrame:
 
     if not rows:
         raise BDShareError("No market info data found.")
+    output = resolve_output(output)
+    if output != "pandas":
+        return from_rows(rows, output)
     return pd.DataFrame(rows)
 
 
-def get_company_info(symbol: str, retry_count: int = 3, pause: float = 0.2) -> list:
+@cached(ttl=3600)
+def get_company_info(
+    symbol: str,
+    retry_count: int = 3,
+    pause: float = 0.2,
+    output: Optional[str] = None,
+) -> list:
     """
     Get company information tables for a given symbol.
 
-    :return: list of DataFrames (relevant tables start at index 400 in the page).
+    :return: list of DataFrames (relevant tables start at index 400 in the page),
+             or of Arrow/Polars tables with ``output='arrow'``/``'polars'``.
     """
+    output = resolve_output(output)
     r = safe_get(
         vs.DSE_URL + vs.DSE_COMPANY_INFO_URL,
         params={"name": symbol},
@@ -77,13 +207,20 @@ def get_company_info(symbol: str, retry_count: int = 3, pause: float = 0.2) -> l
         pause=pause,
     )
     try:
-        tables = pd.read_html(r.content)
-        return tables[_COMPANY_INFO_TABLE_OFFSET:]
+        tables = pd.read_html(r.content)[_COMPANY_INFO_TABLE_OFFSET:]
     except Exception as exc:
         raise BDShareError(f"Failed to parse company info for {symbol}: {exc}") from exc
+    if output != "pandas":
+        return [from_frame(t, output) for t in tables]
+    return tables
 
 
-def get_latest_pe(retry_count: int = 3, pause: float = 0.2) -> pd.DataFrame:
+@cached(ttl=3600)
+def get_latest_pe(
+    retry_count: int = 3,
+    pause: float = 0.2,
+    output: Optional[str] = None,
+) -> pd.DataFrame:
     """Get latest P/E ratios for all listed companies."""
     table = _fetch_table(
         vs.DSE_URL + vs.DSE_LPE_URL,
@@ -104,9 +241,14 @@ def get_latest_pe(retry_count: int = 3, pause: float = 0.2) -> pd.DataFrame:
 
     if not rows:
         raise BDShareError("No P/E data found.")
+    output = resolve_output(output)
+    if output != "pandas":
+        # Same positional column names ("0".."8") as the pandas frame.
+        return from_rows([dict(enumerate(row)) for row in rows], output)
     return pd.DataFrame(rows)
 
 
+@cached(ttl=3600)
 def get_market_info_more_data(
     start: Optional[str] = None,
     end: Optional[str] = None,
@@ -114,6 +256,7 @@ def get_market_info_more_data(
     index: Optional[str] = None,
     retry_count: int = 3,
     pause: float = 0.2,
+    output: Optional[str] = None,
 ) -> pd.DataFrame:
     """Get extended historical market summary data via POST.
 
@@ -178,6 +321,14 @@ def get_market_info_more_data(
     if not rows:
         raise BDShareError("No extended market data found.")
 
+    output = resolve_output(output)
+    if output != "pandas":
+        return from_rows(
+            rows, output,
+            columns=["Date", _CODE_COLUMN_MAP[code.upper()]] if code is not None else None,
+            sort_by="Date" if index == "date" else None,
+        )
+
     df = pd.DataFrame(rows)
 
     if code is not None:
@@ -190,43 +341,88 @@ def get_market_info_more_data(
     return df.sort_index(ascending=True)
 
 
-def get_market_depth_data(symbol: str, retry_count: int = 3, pause: float = 0.2) -> pd.DataFrame:
+@cached(ttl=5)
+def get_market_depth_data(
+    symbol: str,
+    retry_count: int = 3,
+    pause: float = 0.2,
+    output: Optional[str] = None,
+) -> pd.DataFrame:
     """Get market depth (order book) for a specific symbol."""
-    # Establish referer cookie and AJAX header before the POST (done once, not per retry).
-    _session.head(vs.DSE_URL + vs.DSE_MARKET_DEPTH_REFERER_URL, timeout=10)
-    _session.headers.update({"X-Requested-With": "XMLHttpRequest"})
+    output = resolve_output(output)
+    rows = _fetch_depth(symbol, retry_count, pause)
+    if output != "pandas":
+        return from_rows(rows, output, columns=_DEPTH_COLUMNS)
+    return pd.DataFrame(rows)
 
-    r = safe_post(
-        vs.DSE_URL + vs.DSE_MARKET_DEPTH_URL,
-        data={"inst": symbol},
-        retries=retry_count,
-        pause=pause,
-    )
 
-    soup = _parse_html(r.content)
-    table = soup.find("table", attrs={"class": _CLS_STRIPPED})
-    if table is None:
-        raise BDShareError(f"Market depth table not found for {symbol}.")
+@cached(ttl=5)
+def get_market_depth_many(
+    symbols: Iterable[str],
+    max_workers: int = 4,
+    max_calls: int = 5,
+    period: float = 1.0,
+    retry_count: int = 3,
+    pause: float = 0.2,
+    output: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Get market depth for several symbols concurrently.
+
+    The depth session is primed once and shared by every request; requests
+    run on a thread pool throttled to ``max_calls`` per ``period`` seconds.
+    Symbols whose depth cannot be fetched are logged and left out.
+
+    :param symbols: Instrument symbols e.g. ['ACI', 'GP'] (case-insensitive).
+    :param max_workers: Concurrent requests in flight.
+    :param max_calls: Rate limit — requests allowed per ``period``.
+    :param period: Rate-limit window in seconds.
+    :param output: 'pandas', 'arrow' or 'polars'; Arrow and Polars results
+                   carry ``symbol`` and ``level`` as columns.
+    :return: DataFrame indexed by (symbol, level) - buy_price, buy_volume,
+             sell_price, sell_volume. ``level`` is the price level: row 0
+             holds the best bid and the best ask, row 1 the next best, and
+             so on, with NaN where one side has fewer levels.
+    :raises BDShareError: If no symbol could be fetched.
+    """
+    output = resolve_output(output)
+    symbols = list(dict.fromkeys(s.strip().upper() for s in symbols))
+    if not symbols:
+        raise BDShareError("No symbols given.")
 
-    result = []
-    matrix = ["buy_price", "buy_volume", "sell_price", "sell_volume"]
+    _prime_depth_session()
+    fetch = RateLimiter(max_calls=max_calls, period=period)(_fetch_depth)
 
-    for row in table.find_all("tr")[:1]:
-        cols = row.find_all("td", valign="top")
-        for idx, mainrow in enumerate(cols):
-            for inner_row in mainrow.find_all("tr")[2:]:
-                newcols = inner_row.find_all("td")
-                if len(newcols) >= 2:
-                    m = idx * 2
-                    result.append({
-                        matrix[m]:     _safe_num(newcols[0].text, float),
-                        matrix[m + 1]: _safe_num(newcols[1].text, int),
-                    })
-
-    return pd.DataFrame(result)
+    def task(symbol: str) -> Optional[list]:
+        try:
+            return fetch(symbol, retry_count, pause)
+        except BDShareError as exc:
+            logger.warning("Skipping market depth for %s: %s", symbol, exc)
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols)))) as pool:
+        books = dict(zip(symbols, pool.map(task, symbols)))
+
+    books = {sym: _align_depth(rows) for sym, rows in books.items() if rows is not None}
+    if not books:
+        raise BDShareError(f"No market depth data found for {symbols}.")
+    if output != "pandas":
+        return from_rows(
+            [{"symbol": sym, "level": level, **row}
+             for sym, rows in books.items() for level, row in enumerate(rows)],
+            output,
+            columns=["symbol", "level", *_DEPTH_COLUMNS],
+        )
+    frames = {sym: pd.DataFrame(rows, columns=_DEPTH_COLUMNS) for sym, rows in books.items()}
+    return pd.concat(frames, names=["symbol", "level"])
 
 
-def get_sector_performance(retry_count: int = 3, pause: float = 0.2) -> pd.DataFrame:
+@cached(ttl=300)
+def get_sector_performance(
+    retry_count: int = 3,
+    pause: float = 0.2,
+    output: Optional[str] = None,
+) -> pd.DataFrame:
     """Get sector-wise performance data."""
     table = _fetch_table(
         vs.DSE_URL + vs.DSE_SECTOR_PERF_URL,
@@ -246,11 +442,37 @@ def get_sector_performance(retry_count: int = 3, pause: float = 0.2) -> pd.DataF
 
     if not rows:
         raise BDShareError("No sector performance data found.")
+    output = resolve_output(output)
+    if output != "pandas":
+        return from_rows(rows, output)
     return pd.DataFrame(rows)
 
 
-def get_top_gainers_losers(limit: int = 10, retry_count: int = 3, pause: float = 0.2) -> pd.DataFrame:
-    """Get top gainers and losers."""
+@cached(ttl=300)
+def get_top_gainers_losers(
+    limit: int = 10,
+    retry_count: int = 3,
+    pause: float = 0.2,
+    local: bool = False,
+    output: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Get top gainers and losers.
+
+    :param local: Rank the shared live trade snapshot instead of requesting
+                  ``top_gainers.php``; ``change`` is then the percentage
+                  change from ``ycp``, and any *limit* is honoured. See
+                  :func:`bdshare.stock.snapshot.get_top_movers` for more
+                  rankings.
+    :param output: 'pandas', 'arrow' or 'polars'; defaults to :func:`get_output`.
+    """
+    output = resolve_output(output)
+    if local:
+        from bdshare.stock.snapshot import get_top_movers
+        top = get_top_movers(limit, ["gainers"])["gainers"]
+        top = top[["symbol", "ltp", "pct_change"]].rename(columns={"pct_change": "change"})
+        return top if output == "pandas" else from_frame(top.reset_index(drop=True), output)
+
     table = _fetch_table(
         vs.DSE_URL + vs.DSE_TOP_GAINERS_URL,
         vs.DSE_ALT_URL + vs.DSE_TOP_GAINERS_URL,
@@ -271,6 +493,8 @@ def get_top_gainers_losers(limit: int = 10, retry_count: int = 3, pause: float =
 
     if not rows:
         raise BDShareError("No top gainers/losers data found.")
+    if output != "pandas":
+        return from_rows(rows, output)
     return pd.DataFrame(rows)
 
 
@@ -4,6 +4,8 @@ from typing import Optional
 from bs4 import BeautifulSoup
 from bdshare.util import vars as vs
 from bdshare.util.helper import _fetch_table, _parse_html, safe_post, BDShareError
+from bdshare.util.cache import cached
+from bdshare.util.output import from_rows, resolve_output
 
 logger = logging.getLogger(__name__)
 
@@ -18,11 +20,24 @@ def _post_news(url: str, alt_url: str, params: dict, retry_count: int, pause: fl
     return _parse_html(r.content)
 
 
+def _to_output(rows: list, output: Optional[str]):
+    """Build the result in the requested container."""
+    output = resolve_output(output)
+    if output != "pandas":
+        return from_rows(rows, output)
+    return pd.DataFrame(rows)
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
-def get_agm_news(retry_count: int = 3, pause: float = 0.2) -> pd.DataFrame:
+@cached(ttl=300)
+def get_agm_news(
+    retry_count: int = 3,
+    pause: float = 0.2,
+    output: Optional[str] = None,
+) -> pd.DataFrame:
     """Get AGM / dividend declarations."""
     table = _fetch_table(
         vs.DSE_URL + vs.DSE_AGM_URL,
@@ -48,15 +63,17 @@ def get_agm_news(retry_count: int = 3, pause: float = 0.2) -> pd.DataFrame:
 
     if not rows:
         raise BDShareError("No AGM news found.")
-    return pd.DataFrame(rows)
+    return _to_output(rows, output)
 
 
+@cached(ttl=300)
 def get_all_news(
     start: Optional[str] = None,
     end: Optional[str] = None,
     code: Optional[str] = None,
     retry_count: int = 3,
     pause: float = 0.2,
+    output: Optional[str] = None,
 ) -> pd.DataFrame:
     """
     Get all DSE news items.
@@ -96,7 +113,7 @@ def get_all_news(
             if label in {"News Title:", "News:", "Post Date:"}:
                 rows.append({label.rstrip(":"): value})
 
-    return pd.DataFrame(rows)
+    return _to_output(rows, output)
 
 
 def _parse_news_rows(table) -> list:
@@ -114,10 +131,12 @@ def _parse_news_rows(table) -> list:
     return rows
 
 
+@cached(ttl=300)
 def get_corporate_announcements(
     code: Optional[str] = None,
     retry_count: int = 3,
     pause: float = 0.2,
+    output: Optional[str] = None,
 ) -> pd.DataFrame:
     """Get corporate announcements (criteria=2)."""
     soup = _post_news(
@@ -133,13 +152,15 @@ def get_corporate_announcements(
     rows = _parse_news_rows(table)
     if not rows:
         raise BDShareError("No corporate announcements found.")
-    return pd.DataFrame(rows)
+    return _to_output(rows, output)
 
 
+@cached(ttl=300)
 def get_price_sensitive_news(
     code: Optional[str] = None,
     retry_count: int = 3,
     pause: float = 0.2,
+    output: Optional[str] = None,
 ) -> pd.DataFrame:
     """Get price-sensitive news (criteria=1)."""
     soup = _post_news(
@@ -155,7 +176,7 @@ def get_price_sensitive_news(
     rows = _parse_news_rows(table)
     if not rows:
         raise BDShareError("No price-sensitive news found.")
-    return pd.DataFrame(rows)
+    return _to_output(rows, output)
 
 
 # Unified dispatcher (matches __init__.py import)
@@ -164,18 +185,22 @@ def get_news(
     code: Optional[str] = None,
     retry_count: int = 3,
     pause: float = 0.2,
+    output: Optional[str] = None,
 ) -> pd.DataFrame:
     """
     Unified news dispatcher.
 
     :param news_type: One of 'all', 'agm', 'corporate', 'psn'
     :param code: Optional trading code filter
+    :param output: 'pandas', 'arrow' or 'polars'; defaults to :func:`get_output`.
     """
     _dispatch = {
-        "all":       lambda: get_all_news(code=code, retry_count=retry_count, pause=pause),
-        "agm":       lambda: get_agm_news(retry_count=retry_count, pause=pause),
-        "corporate": lambda: get_corporate_announcements(code=code, retry_count=retry_count, pause=pause),
-        "psn":       lambda: get_price_sensitive_news(code=code, retry_count=retry_count, pause=pause),
+        "all":       lambda: get_all_news(code=code, retry_count=retry_count, pause=pause, output=output),
+        "agm":       lambda: get_agm_news(retry_count=retry_count, pause=pause, output=output),
+        "corporate": lambda: get_corporate_announcements(code=code, retry_count=retry_count, pause=pause,
+                                                         output=output),
+        "psn":       lambda: get_price_sensitive_news(code=code, retry_count=retry_count, pause=pause,
+                                                      output=output),
     }
     if news_type not in _dispatch:
         raise ValueError(f"Invalid news_type '{news_type}'. Choose from: {list(_dispatch)}")
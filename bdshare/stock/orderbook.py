@@ -0,0 +1,312 @@
+"""
+bdshare.stock.orderbook
+~~~~~~~~~~~~~~~~~~~~~~~
+Compact order-book snapshots: aligned bid/ask level arrays per symbol,
+price-level diffing between successive snapshots and vectorised
+microstructure metrics across every tracked symbol.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bdshare.stock.ticks import _as_datetime64
+from bdshare.util.helper import BDShareError
+
+logger = logging.getLogger(__name__)
+
+_SIDES = ("bid", "ask")
+_DIFF_COLUMNS = ["symbol", "side", "price", "volume", "prev_volume", "volume_delta"]
+
+
+def depth_levels(depth: pd.DataFrame, levels: int = 10) -> Tuple[np.ndarray, ...]:
+    """
+    Align a :func:`get_market_depth_data` frame into fixed-size level arrays.
+
+    The scraped frame holds buy rows and sell rows as separate records with
+    NaN holes; this keeps the populated rows of each side, orders bids
+    best (highest) first and asks best (lowest) first, and pads both to
+    *levels* entries (NaN price, zero volume).
+
+    :return: ``(bid_price, bid_volume, ask_price, ask_volume)`` arrays of
+             length *levels*.
+    """
+    out = []
+    for price_col, volume_col, descending in (
+        ("buy_price", "buy_volume", True),
+        ("sell_price", "sell_volume", False),
+    ):
+        price = np.full(levels, np.nan)
+        volume = np.zeros(levels, dtype=np.int64)
+        if price_col in depth.columns:
+            side = depth[[price_col, volume_col]].dropna(subset=[price_col])
+            p = side[price_col].to_numpy(dtype=np.float64)
+            v = side[volume_col].fillna(0).to_numpy(dtype=np.int64)
+            order = np.argsort(-p if descending else p, kind="stable")[:levels]
+            price[:len(order)] = p[order]
+            volume[:len(order)] = v[order]
+        out += [price, volume]
+    return tuple(out)
+
+
+def _diff_side(
+    symbol: str,
+    side: str,
+    prev_price: np.ndarray,
+    prev_volume: np.ndarray,
+    price: np.ndarray,
+    volume: np.ndarray,
+) -> Optional[pd.DataFrame]:
+    """Volume change at every price level of one side, keyed by price."""
+    prev_mask, mask = ~np.isnan(prev_price), ~np.isnan(price)
+    prices = np.union1d(prev_price[prev_mask], price[mask])
+    if not len(prices):
+        return None
+
+    def at(px: np.ndarray, vol: np.ndarray) -> np.ndarray:
+        out = np.zeros(len(prices), dtype=np.int64)
+        out[np.searchsorted(prices, px)] = vol
+        return out
+
+    old = at(prev_price[prev_mask], prev_volume[prev_mask])
+    new = at(price[mask], volume[mask])
+    changed = old != new
+    if not changed.any():
+        return None
+    return pd.DataFrame({
+        "symbol":       symbol,
+        "side":         side,
+        "price":        prices[changed],
+        "volume":       new[changed],
+        "prev_volume":  old[changed],
+        "volume_delta": new[changed] - old[changed],
+    })
+
+
+class OrderBookStore:
+    """
+    Latest order book of every tracked symbol as ``(max_symbols, levels)``
+    NumPy arrays: ``bid_price``, ``bid_volume``, ``ask_price`` and
+    ``ask_volume``, level 0 being the best price on each side.
+
+    Each :meth:`update` aligns the scraped depth frame once, diffs it
+    against the stored book by price level and overwrites the symbol's
+    row. :meth:`metrics` then computes spread, mid, micro-price, top-N
+    imbalance and depth-weighted price for all symbols in one vectorised
+    pass.
+
+    Usage::
+
+        from bdshare import OrderBookStore, get_market_depth_many
+
+        books = OrderBookStore(levels=10)
+        changes = books.update_many(get_market_depth_many(["ACI", "GP"]))
+        books.metrics(top=5)
+
+    :param levels:      Price levels kept per side.
+    :param max_symbols: Number of distinct symbols that can be tracked.
+    """
+
+    def __init__(self, levels: int = 10, max_symbols: int = 512):
+        if levels <= 0 or max_symbols <= 0:
+            raise ValueError("levels and max_symbols must be positive.")
+        self.levels      = levels
+        self.max_symbols = max_symbols
+
+        shape = (max_symbols, levels)
+        self._price: Dict[str, np.ndarray] = {s: np.full(shape, np.nan) for s in _SIDES}
+        self._volume: Dict[str, np.ndarray] = {s: np.zeros(shape, dtype=np.int64) for s in _SIDES}
+        self._timestamp = np.full(max_symbols, np.datetime64("NaT"), dtype="datetime64[ns]")
+        self._ids: Dict[str, int] = {}
+        self._symbols: List[str] = []
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _symbol_id(self, symbol: str) -> int:
+        sid = self._ids.get(symbol)
+        if sid is None:
+            if len(self._ids) >= self.max_symbols:
+                raise BDShareError(
+                    f"OrderBookStore is full ({self.max_symbols} symbols); cannot add {symbol!r}."
+                )
+            sid = self._ids[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        return sid
+
+    def update(
+        self,
+        symbol: str,
+        depth: pd.DataFrame,
+        timestamp: Optional[datetime] = None,
+    ) -> pd.DataFrame:
+        """
+        Store the latest book for *symbol* and return what changed.
+
+        :param symbol:    Instrument symbol (case-insensitive).
+        :param depth:     Frame from :func:`get_market_depth_data`.
+        :param timestamp: Snapshot time; defaults to now. Timezone-aware
+                          values are stored as naive UTC.
+        :return: DataFrame - symbol, side, price, volume, prev_volume,
+                 volume_delta; one row per price level whose volume changed
+                 (levels that disappeared have ``volume`` 0).
+        """
+        symbol = symbol.upper()
+        sid = self._symbol_id(symbol)
+        bid_price, bid_volume, ask_price, ask_volume = depth_levels(depth, self.levels)
+
+        parts = [
+            _diff_side(symbol, side, self._price[side][sid], self._volume[side][sid], price, volume)
+            for side, price, volume in (
+                ("bid", bid_price, bid_volume),
+                ("ask", ask_price, ask_volume),
+            )
+        ]
+        self._price["bid"][sid], self._volume["bid"][sid] = bid_price, bid_volume
+        self._price["ask"][sid], self._volume["ask"][sid] = ask_price, ask_volume
+        self._timestamp[sid] = _as_datetime64(timestamp)
+
+        parts = [p for p in parts if p is not None]
+        if not parts:
+            return pd.DataFrame(columns=_DIFF_COLUMNS)
+        return pd.concat(parts, ignore_index=True)
+
+    def update_many(
+        self,
+        books: pd.DataFrame,
+        timestamp: Optional[datetime] = None,
+    ) -> pd.DataFrame:
+        """
+        Store several books at once, e.g. from :func:`get_market_depth_many`.
+
+        :param books: Frame indexed by ``(symbol, level)``.
+        :return: Combined change frame, as returned by :meth:`update`.
+        """
+        timestamp = timestamp or datetime.now()
+        diffs = [
+            self.update(str(symbol), depth, timestamp)
+            for symbol, depth in books.groupby(level=0, sort=False)
+        ]
+        diffs = [d for d in diffs if not d.empty]
+        if not diffs:
+            return pd.DataFrame(columns=_DIFF_COLUMNS)
+        return pd.concat(diffs, ignore_index=True)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    @property
+    def symbols(self) -> List[str]:
+        """Tracked symbols, in row order of the level arrays."""
+        return list(self._symbols)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Read-only views of the level arrays for all tracked symbols.
+
+        :return: dict with ``bid_price``, ``bid_volume``, ``ask_price`` and
+                 ``ask_volume``, each shaped ``(len(symbols), levels)``.
+        """
+        n = len(self._symbols)
+        out = {}
+        for side in _SIDES:
+            for name, store in (("price", self._price), ("volume", self._volume)):
+                view = store[side][:n]
+                view.flags.writeable = False
+                out[f"{side}_{name}"] = view
+        return out
+
+    def book(self, symbol: str) -> pd.DataFrame:
+        """
+        Aligned book for one symbol.
+
+        :return: DataFrame indexed by level - bid_price, bid_volume,
+                 ask_price, ask_volume.
+        """
+        sid = self._ids.get(symbol.upper())
+        if sid is None:
+            raise BDShareError(f"Symbol not tracked: {symbol!r}")
+        return pd.DataFrame(
+            {
+                "bid_price":  self._price["bid"][sid],
+                "bid_volume": self._volume["bid"][sid],
+                "ask_price":  self._price["ask"][sid],
+                "ask_volume": self._volume["ask"][sid],
+            },
+            index=pd.RangeIndex(self.levels, name="level"),
+        )
+
+    def metrics(self, top: int = 5) -> pd.DataFrame:
+        """
+        Microstructure metrics for every tracked symbol, vectorised.
+
+        :param top: Levels per side used for the depth-based metrics.
+        :return: DataFrame indexed by symbol - timestamp, best_bid, best_ask,
+                 spread, mid, spread_bps, microprice, bid_depth, ask_depth,
+                 imbalance (``(bid_depth - ask_depth) / (bid_depth + ask_depth)``
+                 over the top levels) and depth_wprice (volume-weighted price
+                 of the top levels on both sides).
+        """
+        n = len(self._symbols)
+        top = max(1, min(top, self.levels))
+        bid_px, ask_px = self._price["bid"][:n], self._price["ask"][:n]
+        bid_vol, ask_vol = self._volume["bid"][:n], self._volume["ask"][:n]
+
+        best_bid, best_ask = bid_px[:, 0], ask_px[:, 0]
+        spread = best_ask - best_bid
+        mid = (best_ask + best_bid) / 2
+
+        bid_depth = bid_vol[:, :top].sum(axis=1)
+        ask_depth = ask_vol[:, :top].sum(axis=1)
+        total = bid_depth + ask_depth
+        notional = (
+            np.where(bid_vol[:, :top] > 0, bid_px[:, :top] * bid_vol[:, :top], 0.0).sum(axis=1)
+            + np.where(ask_vol[:, :top] > 0, ask_px[:, :top] * ask_vol[:, :top], 0.0).sum(axis=1)
+        )
+        top_bid, top_ask = bid_vol[:, 0], ask_vol[:, 0]
+        top_total = top_bid + top_ask
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            imbalance = np.where(total > 0, (bid_depth - ask_depth) / total, np.nan)
+            depth_wprice = np.where(total > 0, notional / total, np.nan)
+            microprice = np.where(
+                top_total > 0, (best_bid * top_ask + best_ask * top_bid) / top_total, np.nan
+            )
+            spread_bps = spread / mid * 1e4
+
+        return pd.DataFrame(
+            {
+                "timestamp":    self._timestamp[:n],
+                "best_bid":     best_bid,
+                "best_ask":     best_ask,
+                "spread":       spread,
+                "mid":          mid,
+                "spread_bps":   spread_bps,
+                "microprice":   microprice,
+                "bid_depth":    bid_depth,
+                "ask_depth":    ask_depth,
+                "imbalance":    imbalance,
+                "depth_wprice": depth_wprice,
+            },
+            index=pd.Index(self._symbols, name="symbol"),
+        )
+
+    def clear(self) -> None:
+        """Forget every tracked symbol and book."""
+        for side in _SIDES:
+            self._price[side].fill(np.nan)
+            self._volume[side].fill(0)
+        self._timestamp.fill(np.datetime64("NaT"))
+        self._ids.clear()
+        self._symbols.clear()
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._ids
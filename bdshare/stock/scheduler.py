@@ -0,0 +1,282 @@
+"""
+bdshare.stock.scheduler
+~~~~~~~~~~~~~~~~~~~~~~~
+Market-hours-aware adaptive polling of DSE endpoints.
+
+Each registered endpoint is polled between a minimum and maximum interval:
+fast right after the open, just before the close and whenever its content
+changed last time; backing off geometrically while the content hash stays
+the same. Polling pauses outside the session, and every request draws from
+one shared token bucket, so total upstream traffic never exceeds a global
+budget regardless of how many endpoints are registered.
+"""
+
+import time
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from bdshare.stock.market import get_market_depth_data, get_market_info, get_top_gainers_losers
+from bdshare.stock.trading import get_current_trade_data
+from bdshare.util.cache import _bypass_lookup
+from bdshare.util.helper import BDShareError
+from bdshare.util.market_hours import dse_now, is_market_open, next_open, seconds_since_open, seconds_to_close
+
+logger = logging.getLogger(__name__)
+
+
+def _content_hash(value: Any) -> str:
+    """Stable digest of a fetched result, used to detect unchanged content."""
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(value, pd.DataFrame):
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        digest.update(repr(list(value.columns)).encode())
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            digest.update(_content_hash(item).encode())
+    else:
+        digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+
+class _TokenBucket:
+    """Allows *rate* requests per *period* seconds, with bursts up to *rate*."""
+
+    def __init__(self, rate: int, period: float):
+        self.capacity = float(rate)
+        self.refill = rate / period
+        self.tokens = float(rate)
+        self._stamp = time.monotonic()
+
+    def _top_up(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._stamp) * self.refill)
+        self._stamp = now
+
+    def take(self) -> bool:
+        self._top_up()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self) -> float:
+        self._top_up()
+        return max(0.0, (1 - self.tokens) / self.refill)
+
+
+class PollJob:
+    """State of one endpoint registered with :class:`AdaptivePoller`."""
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[], Any],
+        min_interval: float,
+        max_interval: float,
+        on_change: Optional[Callable[[str, Any], None]],
+    ):
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("Require 0 < min_interval <= max_interval.")
+        self.name = name
+        self.fetch = fetch
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.on_change = on_change
+        self.interval = min_interval
+        self.next_due = time.monotonic()
+        self.last_hash: Optional[str] = None
+        self.value: Any = None
+        self.polls = 0
+        self.changes = 0
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"PollJob({self.name!r}, interval={self.interval:.1f}s, polls={self.polls})"
+
+
+def _live(fetch: Callable[..., Any], *args: Any) -> Callable[[], Any]:
+    """
+    Wrap a public fetcher as a zero-argument poll that always reaches DSE.
+
+    A functional-cache hit would return the same content for the whole TTL,
+    so the poller would back off while polling the cache.
+    """
+    def poll() -> Any:
+        with _bypass_lookup():
+            return fetch(*args, output="pandas")
+    return poll
+
+
+class AdaptivePoller:
+    """
+    Drive refreshes of several DSE endpoints with adaptive intervals under
+    one global request budget.
+
+    Usage::
+
+        from bdshare.stock.scheduler import AdaptivePoller
+
+        def changed(name, value):
+            print(name, "changed")
+
+        poller = AdaptivePoller.with_defaults(depth_symbols=["GP"], on_change=changed)
+        poller.start()            # background thread
+        ...
+        poller.stop()
+
+    :param budget:       Maximum requests per *budget_period* across all jobs.
+    :param budget_period: Seconds over which *budget* applies.
+    :param backoff:      Interval multiplier after an unchanged poll.
+    :param edge_window:  Seconds after the open and before the close during
+                         which every job polls at its minimum interval.
+    :param exit_at_close: Return from :meth:`run` once the session closes,
+                         instead of sleeping until the next open.
+    """
+
+    def __init__(
+        self,
+        budget: int = 60,
+        budget_period: float = 60.0,
+        backoff: float = 2.0,
+        edge_window: float = 900.0,
+        exit_at_close: bool = False,
+    ):
+        if backoff < 1:
+            raise ValueError("backoff must be >= 1.")
+        self.backoff = backoff
+        self.edge_window = edge_window
+        self.exit_at_close = exit_at_close
+        self.jobs: Dict[str, PollJob] = {}
+        self._bucket = _TokenBucket(budget, budget_period)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def with_defaults(
+        cls,
+        depth_symbols: Iterable[str] = (),
+        on_change: Optional[Callable[[str, Any], None]] = None,
+        **kwargs,
+    ) -> "AdaptivePoller":
+        """
+        A poller preloaded with the live trade table, market summary, top
+        movers and market depth for each of *depth_symbols*.
+        """
+        poller = cls(**kwargs)
+        poller.add("current_trades", _live(get_current_trade_data), 5, 120, on_change)
+        poller.add("market_info", _live(get_market_info), 30, 600, on_change)
+        poller.add("top_movers", _live(get_top_gainers_losers), 30, 600, on_change)
+        for symbol in depth_symbols:
+            poller.add(f"depth:{symbol.upper()}",
+                       _live(get_market_depth_data, symbol), 10, 300, on_change)
+        return poller
+
+    def add(
+        self,
+        name: str,
+        fetch: Callable[[], Any],
+        min_interval: float = 5.0,
+        max_interval: float = 300.0,
+        on_change: Optional[Callable[[str, Any], None]] = None,
+    ) -> PollJob:
+        """
+        Register an endpoint.
+
+        :param fetch:     Zero-argument callable performing the request.
+        :param on_change: Called as ``on_change(name, value)`` whenever the
+                          fetched content differs from the previous poll.
+        """
+        job = self.jobs[name] = PollJob(name, fetch, min_interval, max_interval, on_change)
+        return job
+
+    def latest(self, name: str) -> Any:
+        """The most recent value fetched for *name* (``None`` before the first poll)."""
+        return self.jobs[name].value
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _near_session_edge(self, now: Optional[datetime] = None) -> bool:
+        now = dse_now(now)
+        return (0 <= seconds_since_open(now) < self.edge_window
+                or 0 < seconds_to_close(now) <= self.edge_window)
+
+    def _poll(self, job: PollJob) -> None:
+        job.polls += 1
+        try:
+            value = job.fetch()
+        except BDShareError as exc:
+            logger.warning("Poll of %r failed: %s", job.name, exc)
+            job.interval = min(job.interval * self.backoff, job.max_interval)
+            return
+        digest = _content_hash(value)
+        changed = digest != job.last_hash
+        job.last_hash, job.value = digest, value
+
+        if changed:
+            job.changes += 1
+            job.interval = job.min_interval
+            if job.on_change is not None:
+                job.on_change(job.name, value)
+        else:
+            job.interval = min(job.interval * self.backoff, job.max_interval)
+        if self._near_session_edge():
+            job.interval = job.min_interval
+
+    def run_pending(self) -> float:
+        """
+        Poll every job that is due, earliest first, as far as the budget
+        allows.
+
+        :return: Seconds until the next job is due or a token frees up.
+        """
+        now = time.monotonic()
+        due: List[PollJob] = sorted(
+            (job for job in self.jobs.values() if job.next_due <= now),
+            key=lambda job: job.next_due,
+        )
+        for job in due:
+            if not self._bucket.take():
+                logger.debug("Request budget exhausted; deferring %d job(s)", len(due))
+                return self._bucket.wait_time()
+            self._poll(job)
+            job.next_due = time.monotonic() + job.interval
+        if not self.jobs:
+            return 1.0
+        return max(0.0, min(job.next_due for job in self.jobs.values()) - time.monotonic())
+
+    def run(self) -> None:
+        """Poll until :meth:`stop` is called (or the close, with *exit_at_close*)."""
+        while not self._stop.is_set():
+            if not is_market_open():
+                if self.exit_at_close:
+                    logger.info("DSE session closed; stopping poller.")
+                    return
+                wait = (next_open() - dse_now()).total_seconds()
+                logger.info("DSE session closed; polling resumes in %.0f s.", wait)
+                if self._stop.wait(wait):
+                    return
+                for job in self.jobs.values():
+                    job.interval, job.next_due = job.min_interval, time.monotonic()
+                continue
+            self._stop.wait(self.run_pending())
+
+    def start(self) -> "AdaptivePoller":
+        """Run :meth:`run` on a background daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, name="bdshare-poller", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop polling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
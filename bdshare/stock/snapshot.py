@@ -0,0 +1,369 @@
+"""
+bdshare.stock.snapshot
+~~~~~~~~~~~~~~~~~~~~~~
+Stateful views of the DSE live trade table
+(``latest_share_price_scroll_l.php``): successive full snapshots turned
+into small per-tick deltas, and a shared, symbol-indexed snapshot that
+serves many per-symbol lookups from a single fetch and local rankings.
+"""
+
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from bdshare.stock.trading import get_current_trade_data, get_dsex_data
+from bdshare.util.cache import _bypass_lookup
+from bdshare.util.helper import BDShareError
+
+logger = logging.getLogger(__name__)
+
+# Fields compared between snapshots to decide whether a symbol changed.
+_DELTA_FIELDS = ("ltp", "volume", "trade")
+
+
+def _fetch_trades() -> pd.DataFrame:
+    # Pinned to pandas so a global set_output() does not change these views,
+    # and always live: a functional-cache hit would hide every change.
+    with _bypass_lookup():
+        return get_current_trade_data(output="pandas")
+
+
+def _fetch_dsex() -> pd.DataFrame:
+    with _bypass_lookup():
+        return get_dsex_data(output="pandas")
+
+
+class SnapshotDelta(NamedTuple):
+    """
+    Difference between two consecutive trade snapshots.
+
+    ``changed`` holds the new rows of symbols whose tracked fields moved,
+    plus a ``<field>_delta`` column per tracked field. ``added`` and
+    ``removed`` hold the full rows of symbols that appeared or vanished.
+    """
+
+    timestamp: datetime
+    changed:   pd.DataFrame
+    added:     pd.DataFrame
+    removed:   pd.DataFrame
+
+    @property
+    def empty(self) -> bool:
+        """True when nothing changed since the previous snapshot."""
+        return self.changed.empty and self.added.empty and self.removed.empty
+
+
+class TradeSnapshot:
+    """
+    Keep the last live trade snapshot keyed by symbol and emit only deltas.
+
+    Usage::
+
+        from bdshare import TradeSnapshot
+
+        snap = TradeSnapshot()
+        snap.update()                  # first call: every symbol is "added"
+        delta = snap.update()          # later calls: only what moved
+        print(delta.changed[["symbol", "ltp", "ltp_delta"]])
+
+    :param fields: Columns compared between snapshots.
+    :param fetch:  Zero-argument callable returning a trade DataFrame;
+                   defaults to :func:`get_current_trade_data`.
+    """
+
+    def __init__(
+        self,
+        fields: Sequence[str] = _DELTA_FIELDS,
+        fetch: Optional[Callable[[], pd.DataFrame]] = None,
+    ):
+        self.fields = tuple(fields)
+        self._fetch = fetch or _fetch_trades
+        self._frame: Optional[pd.DataFrame] = None
+        self.updated_at: Optional[datetime] = None
+
+    @property
+    def frame(self) -> Optional[pd.DataFrame]:
+        """The latest snapshot indexed by symbol, or ``None`` before the first update."""
+        return self._frame
+
+    def update(self, df: Optional[pd.DataFrame] = None) -> SnapshotDelta:
+        """
+        Replace the held snapshot and return what changed.
+
+        :param df: A freshly fetched trade DataFrame. Fetched when omitted.
+        """
+        if df is None:
+            df = self._fetch()
+        new = df.drop_duplicates("symbol", keep="last").set_index("symbol")
+        prev = self._frame
+        now = datetime.now()
+
+        if prev is None:
+            delta = SnapshotDelta(now, _empty_like(new, self.fields), new.reset_index(),
+                                  _empty_like(new))
+        else:
+            common = new.index.intersection(prev.index, sort=False)
+            cur_vals = new.loc[common, list(self.fields)]
+            old_vals = prev.loc[common, list(self.fields)]
+            moved = cur_vals.ne(old_vals) & ~(cur_vals.isna() & old_vals.isna())
+            mask = moved.any(axis=1).to_numpy()
+
+            changed = new.loc[common[mask]]
+            deltas = cur_vals[mask] - old_vals[mask]
+            changed = changed.join(deltas.add_suffix("_delta"))
+
+            delta = SnapshotDelta(
+                now,
+                changed.reset_index(),
+                new.loc[new.index.difference(prev.index, sort=False)].reset_index(),
+                prev.loc[prev.index.difference(new.index, sort=False)].reset_index(),
+            )
+
+        self._frame = new
+        self.updated_at = now
+        logger.debug(
+            "Snapshot update: %d changed, %d added, %d removed",
+            len(delta.changed), len(delta.added), len(delta.removed),
+        )
+        return delta
+
+
+def _empty_like(frame: pd.DataFrame, delta_fields: Sequence[str] = ()) -> pd.DataFrame:
+    """Empty frame with *frame*'s columns (and optional delta columns)."""
+    out = frame.iloc[:0].reset_index()
+    for field in delta_fields:
+        out[f"{field}_delta"] = pd.Series(dtype=float)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Indexed snapshot lookups
+# ---------------------------------------------------------------------------
+
+class SymbolIndex:
+    """
+    A full-market snapshot with a prebuilt symbol→row hash index.
+
+    The snapshot is fetched once and reused for *max_age* seconds, so any
+    number of per-symbol reads inside that window cost one download and an
+    O(1) dictionary lookup each. Safe to share between threads.
+
+    Usage::
+
+        from bdshare.stock.snapshot import SymbolIndex
+
+        quotes = SymbolIndex(max_age=10)
+        quotes.get("ACI")["ltp"]
+        quotes.lookup(["ACI", "GP", "BATBC"])
+
+    :param fetch:   Zero-argument callable returning a frame with a
+                    ``symbol`` column; defaults to
+                    :func:`get_current_trade_data`.
+    :param max_age: Seconds a snapshot is reused before refetching.
+    """
+
+    def __init__(
+        self,
+        fetch: Optional[Callable[[], pd.DataFrame]] = None,
+        max_age: float = 5.0,
+    ):
+        self._fetch = fetch or _fetch_trades
+        self.max_age = max_age
+        self._frame: Optional[pd.DataFrame] = None
+        self._index: Dict[str, int] = {}
+        self._fetched_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def refresh(self) -> pd.DataFrame:
+        """Fetch a new snapshot and rebuild the index."""
+        frame = self._fetch().reset_index(drop=True)
+        index = {symbol: pos for pos, symbol in enumerate(frame["symbol"].str.strip().str.upper())}
+        self._frame, self._index = frame, index
+        self._fetched_at = time.monotonic()
+        return frame
+
+    def _current(self, max_age: Optional[float] = None) -> tuple:
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            if self._frame is None or time.monotonic() - self._fetched_at > max_age:
+                self.refresh()
+            return self._frame, self._index
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """The current snapshot, refetched if older than ``max_age``."""
+        return self._current()[0]
+
+    def get(self, symbol: str, max_age: Optional[float] = None) -> pd.Series:
+        """
+        Return the row for *symbol* (case-insensitive).
+
+        :param max_age: Freshness window for this call only; defaults to
+                        the index's ``max_age``.
+        :raises BDShareError: If the symbol is not in the snapshot.
+        """
+        frame, index = self._current(max_age)
+        pos = index.get(symbol.strip().upper())
+        if pos is None:
+            raise BDShareError(f"Symbol not found: {symbol!r}")
+        return frame.iloc[pos]
+
+    def lookup(
+        self,
+        symbols: Iterable[str],
+        strict: bool = True,
+        max_age: Optional[float] = None,
+    ) -> pd.DataFrame:
+        """
+        Return the rows for *symbols*, in the order requested.
+
+        :param strict:  Raise :class:`BDShareError` listing any unknown
+                        symbols; when ``False`` they are skipped.
+        :param max_age: Freshness window for this call only; defaults to
+                        the index's ``max_age``.
+        """
+        frame, index = self._current(max_age)
+        wanted = [s.strip().upper() for s in symbols]
+        missing = [s for s in wanted if s not in index]
+        if missing and strict:
+            raise BDShareError(f"Symbols not found: {missing}")
+        positions = [index[s] for s in wanted if s in index]
+        return frame.iloc[positions].reset_index(drop=True)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.strip().upper() in self._current()[1]
+
+
+_trade_index = SymbolIndex(_fetch_trades)
+_dsex_index  = SymbolIndex(_fetch_dsex)
+
+
+def get_trade_quotes(
+    symbols: Union[str, Iterable[str]],
+    max_age: float = 5.0,
+    strict: bool = True,
+) -> pd.DataFrame:
+    """
+    Live trade rows for one or many symbols from one shared snapshot.
+
+    Unlike calling ``get_current_trade_data(symbol)`` per symbol, every
+    call within *max_age* seconds is served from the same download.
+
+    :param symbols: A symbol or list of symbols (case-insensitive).
+    :param max_age: Seconds the shared snapshot may be reused.
+    :param strict:  Raise on unknown symbols instead of skipping them.
+    :return: DataFrame with the ``get_current_trade_data`` schema, in the
+             order requested.
+    """
+    symbols = [symbols] if isinstance(symbols, str) else symbols
+    return _trade_index.lookup(symbols, strict=strict, max_age=max_age)
+
+
+def get_dsex_quotes(
+    symbols: Union[str, Iterable[str]],
+    max_age: float = 5.0,
+    strict: bool = True,
+) -> pd.DataFrame:
+    """DSEX share rows for one or many symbols; see :func:`get_trade_quotes`."""
+    symbols = [symbols] if isinstance(symbols, str) else symbols
+    return _dsex_index.lookup(symbols, strict=strict, max_age=max_age)
+
+
+# ---------------------------------------------------------------------------
+# Local rankings
+# ---------------------------------------------------------------------------
+
+# Ranking name -> (column, ascending). ``pct_change`` is derived from ltp/ycp.
+RANKINGS: Dict[str, Tuple[str, bool]] = {
+    "gainers":       ("pct_change", False),
+    "losers":        ("pct_change", True),
+    "most_traded":   ("volume", False),
+    "highest_value": ("value", False),
+}
+
+
+def _with_pct_change(frame: pd.DataFrame) -> pd.DataFrame:
+    if "pct_change" in frame.columns:
+        return frame
+    ycp = frame["ycp"].to_numpy(dtype=float)
+    ltp = frame["ltp"].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(ycp > 0, (ltp - ycp) / ycp * 100.0, np.nan)
+    return frame.assign(pct_change=np.round(pct, 2))
+
+
+def rank_snapshot(
+    frame: pd.DataFrame,
+    by: str = "pct_change",
+    n: int = 10,
+    ascending: bool = False,
+) -> pd.DataFrame:
+    """
+    Return the top *n* rows of *frame* by column *by*.
+
+    Uses ``numpy.argpartition`` so only the selected rows are sorted —
+    O(rows + n log n) instead of a full sort. Rows where *by* is missing
+    are ignored.
+
+    :param by:        Column to rank on; ``pct_change`` is computed from
+                      ``ltp`` and ``ycp`` when not present.
+    :param ascending: Rank smallest first (e.g. for losers).
+    """
+    if by == "pct_change":
+        frame = _with_pct_change(frame)
+    values = pd.to_numeric(frame[by], errors="coerce").to_numpy(dtype=float)
+    valid = np.flatnonzero(~np.isnan(values))
+    keys = values[valid] if ascending else -values[valid]
+    n = max(0, min(n, len(valid)))
+    if n == 0:
+        return frame.iloc[:0].reset_index(drop=True)
+    if n < len(valid):
+        part = np.argpartition(keys, n - 1)[:n]
+    else:
+        part = np.arange(len(valid))
+    order = part[np.argsort(keys[part], kind="stable")]
+    return frame.iloc[valid[order]].reset_index(drop=True)
+
+
+def get_top_movers(
+    n: int = 10,
+    rankings: Union[Sequence[str], Mapping[str, Tuple[str, bool]]] = tuple(RANKINGS),
+    max_age: float = 5.0,
+    frame: Optional[pd.DataFrame] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Top-*n* lists computed locally from one live trade snapshot, so every
+    list shares the same timestamp and no extra request is made.
+
+    Usage::
+
+        from bdshare import get_top_movers
+
+        movers = get_top_movers(20)
+        movers["gainers"], movers["losers"], movers["most_traded"]
+
+        get_top_movers(5, {"most_trades": ("trade", False)})
+
+    :param n:        Rows per list.
+    :param rankings: Names from :data:`RANKINGS`, or a mapping of custom
+                     names to ``(column, ascending)``.
+    :param max_age:  Seconds the shared snapshot may be reused.
+    :param frame:    Optional snapshot to rank instead of the shared one.
+    """
+    if not isinstance(rankings, Mapping):
+        unknown = [name for name in rankings if name not in RANKINGS]
+        if unknown:
+            raise ValueError(f"Unknown rankings {unknown}. Choose from: {list(RANKINGS)}")
+        rankings = {name: RANKINGS[name] for name in rankings}
+    if frame is None:
+        frame = _trade_index._current(max_age)[0]
+    frame = _with_pct_change(frame)
+    return {
+        name: rank_snapshot(frame, by=column, n=n, ascending=ascending)
+        for name, (column, ascending) in rankings.items()
+    }
@@ -0,0 +1,385 @@
+"""
+bdshare.stock.stream
+~~~~~~~~~~~~~~~~~~~~
+Polling-based streaming of intraday DSE quotes.
+
+One loop fetches the live trade table on a fixed, drift-free grid and
+yields either full (optionally symbol-filtered) frames or only the deltas
+between ticks. The loop is pull-based: if the consumer falls behind, missed
+ticks are skipped instead of queued, so a slow consumer never causes a
+burst of catch-up requests.
+
+:class:`TradeBroker` runs the same loop on a background thread and fans
+each tick out to any number of in-process subscribers.
+"""
+
+import time
+import queue
+import asyncio
+import logging
+import threading
+from collections import defaultdict, deque
+from typing import (
+    AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Set, Union,
+)
+
+import pandas as pd
+
+from bdshare.stock.snapshot import SnapshotDelta, TradeSnapshot, _fetch_trades
+from bdshare.util.helper import BDShareError
+from bdshare.util.market_hours import is_market_open
+
+logger = logging.getLogger(__name__)
+
+StreamItem = Union[pd.DataFrame, SnapshotDelta]
+
+
+class _TickClock:
+    """Drift-free schedule of ticks every *interval* seconds."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next = time.monotonic()
+
+    def advance(self) -> float:
+        """Move to the next tick and return the seconds to wait for it."""
+        self._next += self.interval
+        now = time.monotonic()
+        if self._next < now:
+            skipped = int((now - self._next) // self.interval) + 1
+            logger.debug("Consumer behind schedule; skipping %d tick(s)", skipped)
+            self._next += skipped * self.interval
+        return self._next - now
+
+
+class _TradePoller:
+    """Shared fetch/filter/diff step behind the sync and async streams."""
+
+    def __init__(
+        self,
+        symbols: Optional[Iterable[str]],
+        deltas: bool,
+        fetch: Optional[Callable[[], pd.DataFrame]],
+    ):
+        self.symbols = {s.strip().upper() for s in symbols} if symbols else None
+        self.fetch = fetch or _fetch_trades
+        self.snapshot = TradeSnapshot() if deltas else None
+
+    def process(self, df: pd.DataFrame) -> Optional[StreamItem]:
+        """Filter a fetched frame and return the item to yield, if any."""
+        if self.symbols is not None:
+            df = df[df["symbol"].str.upper().isin(self.symbols)].reset_index(drop=True)
+        if self.snapshot is None:
+            return df
+        delta = self.snapshot.update(df)
+        return None if delta.empty else delta
+
+
+def _validate(interval: float) -> None:
+    if interval <= 0:
+        raise ValueError("interval must be positive.")
+
+
+def stream_trades(
+    symbols: Optional[Iterable[str]] = None,
+    interval: float = 5.0,
+    deltas: bool = False,
+    until_close: bool = True,
+    fetch: Optional[Callable[[], pd.DataFrame]] = None,
+) -> Iterator[StreamItem]:
+    """
+    Yield live trade data every *interval* seconds.
+
+    Usage::
+
+        from bdshare import stream_trades
+
+        for delta in stream_trades(["ACI", "GP"], interval=10, deltas=True):
+            print(delta.changed[["symbol", "ltp", "ltp_delta"]])
+
+    :param symbols:     Optional symbols to keep (case-insensitive).
+    :param interval:    Seconds between polls.
+    :param deltas:      Yield :class:`SnapshotDelta` objects, and only when
+                        something changed, instead of full frames.
+    :param until_close: Stop once the DSE session is closed.
+    :param fetch:       Zero-argument callable returning a trade DataFrame;
+                        defaults to :func:`get_current_trade_data`.
+    """
+    _validate(interval)
+    poller = _TradePoller(symbols, deltas, fetch)
+    clock = _TickClock(interval)
+    while True:
+        if until_close and not is_market_open():
+            logger.info("DSE session closed; stopping trade stream.")
+            return
+        try:
+            item = poller.process(poller.fetch())
+        except BDShareError as exc:
+            logger.warning("Trade stream poll failed: %s", exc)
+            item = None
+        if item is not None:
+            yield item
+        time.sleep(clock.advance())
+
+
+async def astream_trades(
+    symbols: Optional[Iterable[str]] = None,
+    interval: float = 5.0,
+    deltas: bool = False,
+    until_close: bool = True,
+    fetch: Optional[Callable[[], pd.DataFrame]] = None,
+) -> AsyncIterator[StreamItem]:
+    """
+    Async-iterator version of :func:`stream_trades`; the blocking fetch runs
+    in the default executor so the event loop stays responsive::
+
+        async for frame in astream_trades(interval=5):
+            ...
+    """
+    _validate(interval)
+    poller = _TradePoller(symbols, deltas, fetch)
+    clock = _TickClock(interval)
+    loop = asyncio.get_running_loop()
+    while True:
+        if until_close and not is_market_open():
+            logger.info("DSE session closed; stopping trade stream.")
+            return
+        try:
+            item = poller.process(await loop.run_in_executor(None, poller.fetch))
+        except BDShareError as exc:
+            logger.warning("Trade stream poll failed: %s", exc)
+            item = None
+        if item is not None:
+            yield item
+        await asyncio.sleep(clock.advance())
+
+
+# ---------------------------------------------------------------------------
+# Pub/sub fan-out
+# ---------------------------------------------------------------------------
+
+class Subscription:
+    """
+    One subscriber's bounded queue of stream items.
+
+    When the queue is full the oldest item is dropped (and counted in
+    :attr:`dropped`), so a stalled subscriber never blocks the poller or
+    other subscribers. Iterating yields items until the broker stops or
+    the subscription is closed.
+    """
+
+    def __init__(self, broker: "TradeBroker", symbols: Optional[Set[str]], maxsize: int):
+        self.symbols = frozenset(symbols) if symbols else None
+        self.dropped = 0
+        self._broker = broker
+        self._items: deque = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def _put(self, item: StreamItem) -> None:
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def _finish(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def get(self, timeout: Optional[float] = None) -> StreamItem:
+        """
+        Return the next item, waiting up to *timeout* seconds.
+
+        :raises queue.Empty: If nothing arrived in time, or the stream ended.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self._closed, timeout):
+                raise queue.Empty
+            if not self._items:
+                raise queue.Empty
+            return self._items.popleft()
+
+    def close(self) -> None:
+        """Unsubscribe and end iteration."""
+        self._broker.unsubscribe(self)
+
+    def __iter__(self) -> Iterator[StreamItem]:
+        while True:
+            try:
+                yield self.get()
+            except queue.Empty:
+                return
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._items)
+
+
+class TradeBroker:
+    """
+    In-process broker: one poller fetches each live snapshot once and fans
+    it out to every subscriber, so upstream load stays constant no matter
+    how many consumers exist.
+
+    Usage::
+
+        from bdshare import TradeBroker
+
+        with TradeBroker(interval=5, deltas=True) as broker:
+            alerts = broker.subscribe(["ACI", "GP"])
+            charts = broker.subscribe()            # every symbol
+            for delta in alerts:
+                ...
+
+    Subscribers share the delivered objects; treat them as read-only.
+
+    :param interval:    Seconds between polls.
+    :param deltas:      Publish :class:`SnapshotDelta` objects, only on
+                        change, instead of full frames.
+    :param until_close: Stop polling once the DSE session is closed.
+    :param maxsize:     Default per-subscriber queue length.
+    :param fetch:       Zero-argument callable returning a trade DataFrame.
+    """
+
+    def __init__(
+        self,
+        interval: float = 5.0,
+        deltas: bool = False,
+        until_close: bool = True,
+        maxsize: int = 100,
+        fetch: Optional[Callable[[], pd.DataFrame]] = None,
+    ):
+        _validate(interval)
+        self.interval = interval
+        self.until_close = until_close
+        self.maxsize = maxsize
+        self._poller = _TradePoller(None, deltas, fetch)
+        self._all: Set[Subscription] = set()
+        self._by_symbol: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -- Subscriptions -------------------------------------------------------
+
+    def subscribe(
+        self,
+        symbols: Optional[Iterable[str]] = None,
+        maxsize: Optional[int] = None,
+    ) -> Subscription:
+        """
+        Register a subscriber.
+
+        :param symbols: Optional symbols to receive (case-insensitive);
+                        ``None`` receives every row.
+        :param maxsize: Queue length; defaults to the broker's *maxsize*.
+        """
+        wanted = {s.strip().upper() for s in symbols} if symbols else None
+        sub = Subscription(self, wanted, maxsize or self.maxsize)
+        with self._lock:
+            if wanted is None:
+                self._all.add(sub)
+            else:
+                for symbol in wanted:
+                    self._by_symbol[symbol].add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        """Remove *sub* and end its iteration."""
+        with self._lock:
+            self._all.discard(sub)
+            for symbol in sub.symbols or ():
+                subs = self._by_symbol.get(symbol)
+                if subs is not None:
+                    subs.discard(sub)
+                    if not subs:
+                        del self._by_symbol[symbol]
+        sub._finish()
+
+    # -- Fan-out -------------------------------------------------------------
+
+    def publish(self, item: StreamItem) -> None:
+        """Deliver *item* to every matching subscriber."""
+        with self._lock:
+            everyone = list(self._all)
+            index = {symbol: list(subs) for symbol, subs in self._by_symbol.items()}
+        for sub in everyone:
+            sub._put(item)
+        if not index:
+            return
+
+        if isinstance(item, SnapshotDelta):
+            parts = {
+                name: _route(getattr(item, name), index)
+                for name in ("changed", "added", "removed")
+            }
+            for sub in set().union(*(p.keys() for p in parts.values())):
+                sub._put(SnapshotDelta(
+                    item.timestamp,
+                    *(_take(getattr(item, name), parts[name].get(sub))
+                      for name in ("changed", "added", "removed")),
+                ))
+        else:
+            for sub, positions in _route(item, index).items():
+                sub._put(item.iloc[positions].reset_index(drop=True))
+
+    # -- Poller --------------------------------------------------------------
+
+    def start(self) -> "TradeBroker":
+        """Start the background poller."""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="bdshare-broker", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop polling and end every subscription."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+        with self._lock:
+            subs = self._all.union(*self._by_symbol.values())
+        for sub in subs:
+            sub._finish()
+
+    def _run(self) -> None:
+        clock = _TickClock(self.interval)
+        while not self._stop.is_set():
+            if self.until_close and not is_market_open():
+                logger.info("DSE session closed; stopping trade broker.")
+                break
+            try:
+                item = self._poller.process(self._poller.fetch())
+            except BDShareError as exc:
+                logger.warning("Trade broker poll failed: %s", exc)
+                item = None
+            if item is not None:
+                self.publish(item)
+            self._stop.wait(clock.advance())
+        self.stop()
+
+    def __enter__(self) -> "TradeBroker":
+        return self.start()
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+
+def _route(frame: pd.DataFrame, index: Dict[str, List[Subscription]]) -> Dict[Subscription, List[int]]:
+    """Map each interested subscriber to the row positions it should receive."""
+    picks: Dict[Subscription, List[int]] = defaultdict(list)
+    if frame.empty:
+        return picks
+    for pos, symbol in enumerate(frame["symbol"].str.upper().to_numpy()):
+        for sub in index.get(symbol, ()):
+            picks[sub].append(pos)
+    return picks
+
+
+def _take(frame: pd.DataFrame, positions: Optional[List[int]]) -> pd.DataFrame:
+    return frame.iloc[positions or []].reset_index(drop=True)
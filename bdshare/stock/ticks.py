@@ -0,0 +1,345 @@
+"""
+bdshare.stock.ticks
+~~~~~~~~~~~~~~~~~~~
+Compact, fixed-size intraday tick history for every symbol, and an
+incremental OHLCV bar builder fed by live snapshots.
+"""
+
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from bdshare.util.helper import BDShareError
+
+logger = logging.getLogger(__name__)
+
+# Field -> storage dtype. Missing integer values are stored as 0.
+_TICK_FIELDS = {
+    "ltp":    np.float64,
+    "volume": np.int64,
+    "trade":  np.int64,
+    "value":  np.float64,
+}
+
+
+def _as_datetime64(timestamp: Optional[datetime]) -> np.datetime64:
+    """
+    Tick time as a naive ``datetime64[ns]``, defaulting to now.
+
+    Timezone-aware values are converted to UTC first; NumPy would otherwise
+    warn and silently drop the offset.
+    """
+    when = pd.Timestamp(timestamp or datetime.now())
+    if when.tzinfo is not None:
+        when = when.tz_convert(None)
+    return when.to_datetime64().astype("datetime64[ns]")
+
+
+class TickStore:
+    """
+    Preallocated NumPy ring buffers holding the last *capacity* ticks of
+    each field for up to *max_symbols* symbols.
+
+    Every field is a ``(max_symbols, 2 * capacity)`` array and each value is
+    written twice, at ``pos`` and ``pos + capacity``. That mirror makes the
+    latest *n* ticks of a symbol one contiguous slice, so :meth:`window`
+    always returns zero-copy, read-only views, while :meth:`append` stays
+    O(1) per symbol and vectorised across the whole snapshot. Memory is
+    allocated once and never grows (see :attr:`nbytes`).
+
+    Usage::
+
+        from bdshare import TickStore, get_current_trade_data
+
+        ticks = TickStore(capacity=4096)
+        ticks.append(get_current_trade_data())        # once per poll
+        w = ticks.window("ACI", 120)                  # last 120 ticks
+        w["ltp"], w["volume"], w["timestamp"]
+
+    :param capacity:    Ticks retained per symbol. 3,300 covers a full
+                        session polled every 5 seconds.
+    :param max_symbols: Number of distinct symbols that can be tracked.
+    :param fields:      Columns to keep; a subset of ``ltp``, ``volume``,
+                        ``trade`` and ``value``.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 4096,
+        max_symbols: int = 512,
+        fields: Sequence[str] = tuple(_TICK_FIELDS),
+    ):
+        unknown = set(fields) - set(_TICK_FIELDS)
+        if unknown:
+            raise ValueError(f"Unsupported tick fields {sorted(unknown)}. Choose from: {list(_TICK_FIELDS)}")
+        if capacity <= 0 or max_symbols <= 0:
+            raise ValueError("capacity and max_symbols must be positive.")
+
+        self.capacity    = capacity
+        self.max_symbols = max_symbols
+        self.fields      = tuple(fields)
+
+        width = 2 * capacity
+        self._timestamp = np.zeros((max_symbols, width), dtype="datetime64[ns]")
+        self._data: Dict[str, np.ndarray] = {
+            field: np.zeros((max_symbols, width), dtype=_TICK_FIELDS[field])
+            for field in self.fields
+        }
+        self._head  = np.zeros(max_symbols, dtype=np.int64)   # next write position
+        self._count = np.zeros(max_symbols, dtype=np.int64)   # ticks held
+        self._ids: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _symbol_ids(self, symbols: np.ndarray) -> np.ndarray:
+        ids = np.empty(len(symbols), dtype=np.int64)
+        for i, symbol in enumerate(symbols):
+            sid = self._ids.get(symbol)
+            if sid is None:
+                if len(self._ids) >= self.max_symbols:
+                    raise BDShareError(
+                        f"TickStore is full ({self.max_symbols} symbols); cannot add {symbol!r}."
+                    )
+                sid = self._ids[symbol] = len(self._ids)
+            ids[i] = sid
+        return ids
+
+    def append(
+        self,
+        snapshot: pd.DataFrame,
+        timestamp: Optional[datetime] = None,
+        columns: Optional[Dict[str, str]] = None,
+    ) -> int:
+        """
+        Append one tick per row of *snapshot*.
+
+        :param snapshot:  Frame with a ``symbol`` column and the tracked
+                          fields, e.g. from :func:`get_current_trade_data`.
+        :param timestamp: Tick time; defaults to now. Timezone-aware
+                          values are stored as naive UTC.
+        :param columns:   Optional rename mapping for other sources, e.g.
+                          the ``quotes.txt`` frame from
+                          :func:`get_last_trade_price_data`.
+        :return: Number of ticks appended.
+        """
+        if columns:
+            snapshot = snapshot.rename(columns=columns)
+        snapshot = snapshot.drop_duplicates("symbol", keep="last")
+        if snapshot.empty:
+            return 0
+
+        ids = self._symbol_ids(snapshot["symbol"].astype(str).str.upper().to_numpy())
+        pos = self._head[ids]
+        mirror = pos + self.capacity
+        when = _as_datetime64(timestamp)
+
+        self._timestamp[ids, pos] = when
+        self._timestamp[ids, mirror] = when
+        for field, buf in self._data.items():
+            values = pd.to_numeric(snapshot[field], errors="coerce")
+            if buf.dtype.kind == "i":
+                values = values.fillna(0)
+            values = values.to_numpy(dtype=buf.dtype)
+            buf[ids, pos] = values
+            buf[ids, mirror] = values
+
+        self._head[ids] = (pos + 1) % self.capacity
+        self._count[ids] = np.minimum(self._count[ids] + 1, self.capacity)
+        return len(ids)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def window(self, symbol: str, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Return the latest *n* ticks (default: all held) of *symbol*, oldest
+        first, as read-only zero-copy views keyed by field name plus
+        ``timestamp``.
+
+        :raises KeyError: If *symbol* has never been appended.
+        """
+        sid = self._ids[symbol.upper()]
+        held = int(self._count[sid])
+        n = held if n is None else max(0, min(n, held))
+        end = int(self._head[sid]) + self.capacity
+        sl = slice(end - n, end)
+
+        out = {"timestamp": self._timestamp[sid, sl]}
+        out.update((field, buf[sid, sl]) for field, buf in self._data.items())
+        for view in out.values():
+            view.flags.writeable = False
+        return out
+
+    def frame(self, symbol: str, n: Optional[int] = None) -> pd.DataFrame:
+        """Latest *n* ticks of *symbol* as a DataFrame indexed by timestamp (a copy)."""
+        w = self.window(symbol, n)
+        return pd.DataFrame(
+            {field: w[field] for field in self.fields},
+            index=pd.DatetimeIndex(w["timestamp"], name="timestamp"),
+        )
+
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols tracked so far, in first-seen order."""
+        return list(self._ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Total bytes preallocated for the buffers."""
+        return self._timestamp.nbytes + sum(buf.nbytes for buf in self._data.values())
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._ids
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return (
+            f"TickStore(symbols={len(self._ids)}/{self.max_symbols}, "
+            f"capacity={self.capacity}, nbytes={self.nbytes})"
+        )
+
+
+# Cumulative session totals DSE reports per symbol; bars difference them.
+_CUMULATIVE = ("volume", "value", "trade")
+_BAR_COLUMNS = ["symbol", "start", "open", "high", "low", "close", *_CUMULATIVE]
+
+
+class BarBuilder:
+    """
+    Incremental OHLCV bars from polled live snapshots.
+
+    DSE only publishes the last price and *cumulative* volume, value and
+    trade count. Each snapshot updates every symbol's open/high/low/close
+    in one vectorised step, and when a tick falls into a new interval the
+    finished bars are emitted, with volume/value/trade obtained by
+    differencing the cumulative fields against the previous bar's close.
+
+    Usage::
+
+        from bdshare import BarBuilder, stream_trades
+
+        bars = BarBuilder("1min", on_bar=lambda df: print(df))
+        for snapshot in stream_trades(interval=5):
+            bars.update(snapshot)
+
+    :param interval: Bar length as a pandas offset (``"1min"``, ``"5min"``)
+                     or seconds.
+    :param on_bar:   Optional callback receiving each batch of completed
+                     bars, e.g. to append them to storage.
+    """
+
+    def __init__(
+        self,
+        interval: Union[str, int, float, pd.Timedelta] = "1min",
+        on_bar: Optional[Callable[[pd.DataFrame], None]] = None,
+    ):
+        if isinstance(interval, (int, float)):
+            interval = pd.Timedelta(seconds=interval)
+        self.interval = pd.Timedelta(interval)
+        if self.interval <= pd.Timedelta(0):
+            raise ValueError("interval must be positive.")
+        self.on_bar = on_bar
+        self._bucket: Optional[pd.Timestamp] = None
+        self._state: Optional[pd.DataFrame] = None
+        self._completed: List[pd.DataFrame] = []
+
+    @staticmethod
+    def _prepare(snapshot: pd.DataFrame) -> pd.DataFrame:
+        snap = snapshot.drop_duplicates("symbol", keep="last").set_index("symbol")
+        return snap[["ltp", *_CUMULATIVE]].apply(pd.to_numeric, errors="coerce").astype(float)
+
+    @staticmethod
+    def _open_bars(snap: pd.DataFrame, base: pd.DataFrame) -> pd.DataFrame:
+        """Fresh bar state starting at *snap*, with cumulative baselines *base*."""
+        state = pd.DataFrame(
+            {"open": snap["ltp"], "high": snap["ltp"], "low": snap["ltp"], "close": snap["ltp"]},
+            index=snap.index,
+        )
+        for field in _CUMULATIVE:
+            state[f"base_{field}"] = base[field]
+            state[f"last_{field}"] = snap[field]
+        return state
+
+    def update(self, snapshot: pd.DataFrame, timestamp: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Fold one snapshot into the current bars.
+
+        :param snapshot:  Frame with ``symbol``, ``ltp``, ``volume``,
+                          ``value`` and ``trade`` columns.
+        :param timestamp: Snapshot time; defaults to now.
+        :return: Bars completed by this snapshot (empty if none).
+        """
+        when = pd.Timestamp(timestamp or datetime.now())
+        bucket = when.floor(self.interval)
+        snap = self._prepare(snapshot)
+
+        completed = _empty_bars()
+        if self._state is None:
+            self._state = self._open_bars(snap, snap)
+        elif bucket != self._bucket:
+            completed = self._emit()
+            previous = self._state[[f"last_{f}" for f in _CUMULATIVE]]
+            previous.columns = list(_CUMULATIVE)
+            base = previous.reindex(snap.index).fillna(snap[list(_CUMULATIVE)])
+            self._state = self._open_bars(snap, base)
+        else:
+            state = self._state
+            new = snap.index.difference(state.index, sort=False)
+            if len(new):
+                state = pd.concat([state, self._open_bars(snap.loc[new], snap.loc[new])])
+            ltp = snap["ltp"].reindex(state.index)
+            state["high"] = np.fmax(state["high"], ltp)
+            state["low"] = np.fmin(state["low"], ltp)
+            state["close"] = ltp.fillna(state["close"])
+            for field in _CUMULATIVE:
+                col = f"last_{field}"
+                state[col] = snap[field].reindex(state.index).fillna(state[col])
+            self._state = state
+
+        self._bucket = bucket
+        return completed
+
+    def _emit(self) -> pd.DataFrame:
+        """Turn the current state into finished bars and hand them out."""
+        state = self._state
+        bars = state[["open", "high", "low", "close"]].copy()
+        for field in _CUMULATIVE:
+            last, base = state[f"last_{field}"], state[f"base_{field}"]
+            diff = last - base
+            # A negative difference means the cumulative counter restarted.
+            bars[field] = diff.where(diff >= 0, last)
+        bars.insert(0, "start", self._bucket)
+        bars = bars.rename_axis("symbol").reset_index()[_BAR_COLUMNS]
+
+        self._completed.append(bars)
+        if self.on_bar is not None:
+            self.on_bar(bars)
+        return bars
+
+    def flush(self) -> pd.DataFrame:
+        """Close the in-progress bars (e.g. at session end) and return them."""
+        if self._state is None:
+            return _empty_bars()
+        bars = self._emit()
+        self._state = None
+        self._bucket = None
+        return bars
+
+    @property
+    def bars(self) -> pd.DataFrame:
+        """Every bar completed so far, oldest first."""
+        if not self._completed:
+            return _empty_bars()
+        return pd.concat(self._completed, ignore_index=True)
+
+
+def _empty_bars() -> pd.DataFrame:
+    return pd.DataFrame(columns=_BAR_COLUMNS)
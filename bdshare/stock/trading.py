@@ -1,8 +1,11 @@
 import logging
+import numpy as np
 import pandas as pd
-from typing import Optional
+from typing import Iterator, NamedTuple, Optional
 from bdshare.util import vars as vs
-from bdshare.util.helper import _fetch_table, _safe_num, BDShareError, deprecated
+from bdshare.util.helper import _fetch_table, _safe_num, safe_get, BDShareError, deprecated
+from bdshare.util.cache import cached
+from bdshare.util.output import from_frame, from_records, from_rows, resolve_output
 
 logger = logging.getLogger(__name__)
 
@@ -13,11 +16,66 @@ _CLS_FIXED  = "table table-bordered background-white shares-table fixedHeader"
 _CLS_SHARES = "table table-bordered background-white shares-table"
 _CLS_PLAIN  = "table table-bordered background-white"
 
+_BASIC_COLUMNS = ["date", "open", "high", "low", "close", "volume"]
+
+# Fixed record layouts for raw=True. Missing prices are NaN, missing
+# counts (trade, volume) are 0.
+TRADE_DTYPE = np.dtype([
+    ("symbol", "U16"),
+    ("ltp",    "f8"),
+    ("high",   "f8"),
+    ("low",    "f8"),
+    ("close",  "f8"),
+    ("ycp",    "f8"),
+    ("change", "f8"),
+    ("trade",  "i8"),
+    ("value",  "f8"),
+    ("volume", "i8"),
+])
+BASIC_HISTORICAL_DTYPE = np.dtype([
+    ("date",   "datetime64[D]"),
+    ("open",   "f8"),
+    ("high",   "f8"),
+    ("low",    "f8"),
+    ("close",  "f8"),
+    ("volume", "i8"),
+])
+
+# Casts for trade columns 2..10 (after the serial and symbol cells).
+_TRADE_CASTS = (float, float, float, float, float, float, int, float, int)
+
+
+class HistoricalRow(NamedTuple):
+    """One row of the DSE day-end archive, as yielded by :func:`iter_historical_rows`."""
+    date:   str
+    symbol: str
+    ltp:    Optional[float]
+    high:   Optional[float]
+    low:    Optional[float]
+    open:   Optional[float]
+    close:  Optional[float]
+    ycp:    Optional[float]
+    trade:  Optional[int]
+    value:  Optional[float]
+    volume: Optional[int]
+
+
+# Casts for archive columns 3..11 (after the serial, date and symbol cells).
+_HIST_CASTS = (float, float, float, float, float, float, int, float, int)
+
 
 # ---------------------------------------------------------------------------
 # Shared internal helpers
 # ---------------------------------------------------------------------------
 
+def _trade_values(cols) -> tuple:
+    """symbol, ltp, high, low, close, ycp, change, trade, value, volume of one row."""
+    return (
+        cols[1].text.strip(),
+        *(_safe_num(c.text, cast) for c, cast in zip(cols[2:11], _TRADE_CASTS)),
+    )
+
+
 def _parse_trade_rows(table) -> list:
     """Parse standard 10-column trade rows from a DSE table."""
     rows = []
@@ -25,21 +83,63 @@ def _parse_trade_rows(table) -> list:
         cols = row.find_all("td")
         if len(cols) < 11:
             continue
-        rows.append({
-            "symbol": cols[1].text.strip(),
-            "ltp":    _safe_num(cols[2].text, float),
-            "high":   _safe_num(cols[3].text, float),
-            "low":    _safe_num(cols[4].text, float),
-            "close":  _safe_num(cols[5].text, float),
-            "ycp":    _safe_num(cols[6].text, float),
-            "change": _safe_num(cols[7].text, float),
-            "trade":  _safe_num(cols[8].text, int),
-            "value":  _safe_num(cols[9].text, float),
-            "volume": _safe_num(cols[10].text, int),
-        })
+        rows.append(dict(zip(TRADE_DTYPE.names, _trade_values(cols))))
     return rows
 
 
+def _trade_records(table, symbol: Optional[str]) -> np.ndarray:
+    """
+    Parse trade rows straight into a preallocated :data:`TRADE_DTYPE`
+    array, keeping only *symbol* when given.
+    """
+    trs = table.find_all("tr")[1:]
+    out = np.empty(len(trs), dtype=TRADE_DTYPE)
+    wanted = symbol.upper() if symbol else None
+    n = 0
+    for row in trs:
+        cols = row.find_all("td")
+        if len(cols) < 11:
+            continue
+        sym, ltp, high, low, close, ycp, change, trade, value, volume = _trade_values(cols)
+        if wanted is not None and sym.upper() != wanted:
+            continue
+        out[n] = (sym, ltp, high, low, close, ycp, change, trade or 0, value, volume or 0)
+        n += 1
+    if wanted is not None and not n:
+        raise BDShareError(f"Symbol not found: {symbol!r}")
+    return out[:n]
+
+
+def _basic_records(table) -> np.ndarray:
+    """
+    Parse archive rows straight into a :data:`BASIC_HISTORICAL_DTYPE`
+    array, sorted by date (stable).
+    """
+    trs = table.find_all("tr")[1:]
+    out = np.empty(len(trs), dtype=BASIC_HISTORICAL_DTYPE)
+    n = 0
+    for row in trs:
+        cols = row.find_all("td")
+        if len(cols) < 12:
+            continue
+        try:
+            day = np.datetime64(cols[1].text.strip(), "D")
+        except ValueError:
+            day = np.datetime64("NaT", "D")
+        volume = _safe_num(cols[11].text, int)
+        out[n] = (
+            day,
+            _safe_num(cols[6].text, float),
+            _safe_num(cols[4].text, float),
+            _safe_num(cols[5].text, float),
+            _safe_num(cols[7].text, float),
+            volume or 0,
+        )
+        n += 1
+    out = out[:n]
+    return out[np.argsort(out["date"], kind="stable")]
+
+
 def _filter_symbol(df: pd.DataFrame, symbol: Optional[str]) -> pd.DataFrame:
     """Filter DataFrame by symbol if provided; raise BDShareError if no match."""
     if not symbol:
@@ -50,6 +150,25 @@ def _filter_symbol(df: pd.DataFrame, symbol: Optional[str]) -> pd.DataFrame:
     return filtered
 
 
+def _filter_symbol_rows(rows: list, symbol: Optional[str]) -> list:
+    """Row-level twin of :func:`_filter_symbol`, for non-pandas output."""
+    if not symbol:
+        return rows
+    filtered = [r for r in rows if r["symbol"].upper() == symbol.upper()]
+    if not filtered:
+        raise BDShareError(f"Symbol not found: {symbol!r}")
+    return filtered
+
+
+def _historical_row(cells: list) -> HistoricalRow:
+    """Build a :class:`HistoricalRow` from the text of one archive row's cells."""
+    return HistoricalRow(
+        cells[1].strip(),
+        cells[2].strip(),
+        *(_safe_num(text, cast) for text, cast in zip(cells[3:12], _HIST_CASTS)),
+    )
+
+
 def _parse_historical_rows(table) -> list:
     """Parse all OHLCV + metadata columns from a DSE day-end archive table."""
     rows = []
@@ -57,22 +176,48 @@ def _parse_historical_rows(table) -> list:
         cols = row.find_all("td")
         if len(cols) < 12:
             continue
-        rows.append({
-            "date":   cols[1].text.strip(),
-            "symbol": cols[2].text.strip(),
-            "ltp":    _safe_num(cols[3].text, float),
-            "high":   _safe_num(cols[4].text, float),
-            "low":    _safe_num(cols[5].text, float),
-            "open":   _safe_num(cols[6].text, float),
-            "close":  _safe_num(cols[7].text, float),
-            "ycp":    _safe_num(cols[8].text, float),
-            "trade":  _safe_num(cols[9].text, int),
-            "value":  _safe_num(cols[10].text, float),
-            "volume": _safe_num(cols[11].text, int),
-        })
+        rows.append(_historical_row([c.text for c in cols])._asdict())
     return rows
 
 
+def _iter_table_cells(source, table_class: str) -> Iterator[list]:
+    """
+    Yield the cell texts of each ``<tr>`` (header excluded) of the first
+    table with class *table_class*, parsing *source* incrementally.
+
+    Each row is freed once yielded, so memory stays bounded by one row
+    plus the parser's read buffer regardless of the table length.
+    """
+    from lxml import etree
+
+    depth = 0          # nesting level inside the target table; 0 = outside
+    seen = False
+    first = True
+    for event, elem in etree.iterparse(source, events=("start", "end"), html=True):
+        tag = elem.tag
+        if event == "start":
+            if tag == "table" and (depth or (not seen and elem.get("class") == table_class)):
+                depth += 1
+                seen = True
+            continue
+        if not depth:
+            continue
+        if tag == "tr" and depth == 1:
+            if first:
+                first = False
+            else:
+                yield ["".join(td.itertext()) for td in elem.iterchildren("td")]
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+        elif tag == "table":
+            depth -= 1
+            if not depth:
+                return
+    if not seen:
+        raise BDShareError(f"Table with class={table_class!r} not found.")
+
+
 def _fetch_archive_table(
     start: Optional[str],
     end: Optional[str],
@@ -95,10 +240,13 @@ def _fetch_archive_table(
 # Public API  (canonical names as of v1.1.5)
 # ---------------------------------------------------------------------------
 
+@cached(ttl=30)
 def get_current_trade_data(
     symbol: Optional[str] = None,
     retry_count: int = 3,
     pause: float = 0.2,
+    output: Optional[str] = None,
+    raw: bool = False,
 ) -> pd.DataFrame:
     """
     Get live trade data (last stock prices) for all symbols or a specific one.
@@ -106,6 +254,10 @@ def get_current_trade_data(
     :param symbol: Instrument symbol e.g. 'ACI' (case-insensitive). None returns all.
     :param retry_count: Number of fetch attempts.
     :param pause: Base pause in seconds (exponential back-off applied).
+    :param output: 'pandas', 'arrow' or 'polars'; defaults to :func:`get_output`.
+    :param raw: Return a NumPy structured array of :data:`TRADE_DTYPE`
+                instead, filled directly by the parser (takes precedence
+                over *output*).
     :return: DataFrame - symbol, ltp, high, low, close, ycp, change, trade, value, volume.
     """
     table = _fetch_table(
@@ -115,16 +267,26 @@ def get_current_trade_data(
         pause=pause,
         table_class=_CLS_FIXED,
     )
+    if raw:
+        records = _trade_records(table, symbol)
+        if not len(records):
+            raise BDShareError("No current trade data found.")
+        return records
     rows = _parse_trade_rows(table)
     if not rows:
         raise BDShareError("No current trade data found.")
+    output = resolve_output(output)
+    if output != "pandas":
+        return from_rows(_filter_symbol_rows(rows, symbol), output)
     return _filter_symbol(pd.DataFrame(rows), symbol)
 
 
+@cached(ttl=60)
 def get_dsex_data(
     symbol: Optional[str] = None,
     retry_count: int = 3,
     pause: float = 0.2,
+    output: Optional[str] = None,
 ) -> pd.DataFrame:
     """
     Get DSEX index share price data.
@@ -142,10 +304,18 @@ def get_dsex_data(
     rows = _parse_trade_rows(table)
     if not rows:
         raise BDShareError("No DSEX data found.")
+    output = resolve_output(output)
+    if output != "pandas":
+        return from_rows(_filter_symbol_rows(rows, symbol), output)
     return _filter_symbol(pd.DataFrame(rows), symbol)
 
 
-def get_current_trading_code(retry_count: int = 3, pause: float = 0.2) -> pd.DataFrame:
+@cached(ttl=86400)
+def get_current_trading_code(
+    retry_count: int = 3,
+    pause: float = 0.2,
+    output: Optional[str] = None,
+) -> pd.DataFrame:
     """
     Get the list of all currently traded stock symbols.
 
@@ -165,15 +335,20 @@ def get_current_trading_code(retry_count: int = 3, pause: float = 0.2) -> pd.Dat
     ]
     if not rows:
         raise BDShareError("No trading codes found.")
+    output = resolve_output(output)
+    if output != "pandas":
+        return from_rows(rows, output)
     return pd.DataFrame(rows)
 
 
+@cached(ttl=86400)
 def get_historical_data(
     start: Optional[str] = None,
     end: Optional[str] = None,
     code: str = "All Instrument",
     retry_count: int = 3,
     pause: float = 0.2,
+    output: Optional[str] = None,
 ) -> pd.DataFrame:
     """
     Get full historical OHLCV + metadata, indexed by date (descending).
@@ -188,9 +363,86 @@ def get_historical_data(
     rows = _parse_historical_rows(table)
     if not rows:
         raise BDShareError("No historical data found.")
+    output = resolve_output(output)
+    if output != "pandas":
+        return from_rows(rows, output, sort_by="date", ascending=False)
     return pd.DataFrame(rows).set_index("date").sort_index(ascending=False)
 
 
+def iter_historical_rows(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    code: str = "All Instrument",
+    retry_count: int = 3,
+    pause: float = 0.2,
+) -> Iterator[HistoricalRow]:
+    """
+    Stream the day-end archive one row at a time.
+
+    The response body is parsed incrementally as it downloads, so only the
+    current row is held in memory — suited to long ranges over
+    'All Instrument'. Rows arrive in page order (not sorted) and are not
+    cached.
+
+    :param start: Start date 'YYYY-MM-DD'.
+    :param end:   End date 'YYYY-MM-DD'.
+    :param code:  Instrument symbol or 'All Instrument'.
+    :return: Iterator of :class:`HistoricalRow` named tuples - date, symbol,
+             ltp, high, low, open, close, ycp, trade, value, volume.
+    """
+    r = safe_get(
+        vs.DSE_URL + vs.DSE_DEA_URL,
+        params={"startDate": start, "endDate": end, "inst": code, "archive": "data"},
+        alt_url=vs.DSE_ALT_URL + vs.DSE_DEA_URL,
+        retries=retry_count,
+        pause=pause,
+        stream=True,
+    )
+    with r:
+        r.raw.decode_content = True
+        for cells in _iter_table_cells(r.raw, _CLS_FIXED):
+            if len(cells) >= 12:
+                yield _historical_row(cells)
+
+
+def iter_historical_chunks(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    code: str = "All Instrument",
+    chunk_rows: int = 10_000,
+    retry_count: int = 3,
+    pause: float = 0.2,
+    output: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream the day-end archive as frames of at most *chunk_rows* rows.
+
+    Chunks have the :func:`get_historical_data` schema (indexed by date,
+    or with a ``date`` column for Arrow/Polars output) but keep page order.
+
+    :param chunk_rows: Maximum rows per chunk.
+    :param output: 'pandas', 'arrow' or 'polars'; defaults to :func:`get_output`.
+    """
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be positive.")
+    output = resolve_output(output)
+
+    def build(batch: list):
+        if output != "pandas":
+            return from_records(batch, HistoricalRow._fields, output)
+        return pd.DataFrame.from_records(batch, columns=HistoricalRow._fields).set_index("date")
+
+    batch: list = []
+    for row in iter_historical_rows(start, end, code, retry_count, pause):
+        batch.append(row)
+        if len(batch) >= chunk_rows:
+            yield build(batch)
+            batch = []
+    if batch:
+        yield build(batch)
+
+
+@cached(ttl=86400)
 def get_basic_historical_data(
     start: Optional[str] = None,
     end: Optional[str] = None,
@@ -198,29 +450,45 @@ def get_basic_historical_data(
     index: Optional[str] = None,
     retry_count: int = 3,
     pause: float = 0.2,
+    output: Optional[str] = None,
+    raw: bool = False,
 ) -> pd.DataFrame:
     """
     Get simplified historical OHLCV, sorted ascending (TA-library ready).
 
     :param index: Pass 'date' to set date as the DataFrame index.
+    :param raw:   Return a date-sorted NumPy structured array of
+                  :data:`BASIC_HISTORICAL_DTYPE` instead, filled directly by
+                  the parser (*index* and *output* are ignored).
     :return: DataFrame - date (or index), open, high, low, close, volume.
     """
     table = _fetch_archive_table(start, end, code, retry_count, pause)
+    if raw:
+        records = _basic_records(table)
+        if not len(records):
+            raise BDShareError("No basic historical data found.")
+        return records
     rows = _parse_historical_rows(table)
     if not rows:
         raise BDShareError("No basic historical data found.")
-    df = pd.DataFrame(rows)[["date", "open", "high", "low", "close", "volume"]]
+    output = resolve_output(output)
+    if output != "pandas":
+        return from_rows(rows, output, columns=_BASIC_COLUMNS,
+                         sort_by="date" if index == "date" else None)
+    df = pd.DataFrame(rows)[_BASIC_COLUMNS]
     if index == "date":
         df = df.set_index("date")
     return df.sort_index(ascending=True)
 
 
+@cached(ttl=86400)
 def get_close_price_data(
     start: Optional[str] = None,
     end: Optional[str] = None,
     code: str = "All Instrument",
     retry_count: int = 3,
     pause: float = 0.2,
+    output: Optional[str] = None,
 ) -> pd.DataFrame:
     """
     Get closing prices and prior close (ycp), indexed by date (descending).
@@ -248,10 +516,18 @@ def get_close_price_data(
         })
     if not rows:
         raise BDShareError("No close price data found.")
+    output = resolve_output(output)
+    if output != "pandas":
+        return from_rows(rows, output, sort_by="date", ascending=False)
     return pd.DataFrame(rows).set_index("date").sort_index(ascending=False)
 
 
-def get_last_trade_price_data(retry_count: int = 3, pause: float = 0.2) -> pd.DataFrame:
+@cached(ttl=30)
+def get_last_trade_price_data(
+    retry_count: int = 3,
+    pause: float = 0.2,
+    output: Optional[str] = None,
+) -> pd.DataFrame:
     """
     Get last trade price data from the DSE fixed-width text file.
 
@@ -268,7 +544,8 @@ def get_last_trade_price_data(retry_count: int = 3, pause: float = 0.2) -> pd.Da
                 skiprows=4,
             )
             if not df.empty:
-                return df
+                output = resolve_output(output)
+                return df if output == "pandas" else from_frame(df, output)
         except Exception as exc:
             logger.error("Attempt %d failed for quotes.txt: %s", attempt + 1, exc)
     raise BDShareError(f"Failed to fetch quotes.txt after {retry_count} retries.")
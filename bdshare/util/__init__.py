@@ -1,11 +1,12 @@
 """
 bdshare.util
 ~~~~~~~~~~~~
-Utility layer — exposes Store, Tickers, session/token helpers,
-cache management, and proxy configuration.
+Utility layer — exposes Store, Manifest, Tickers, session/token helpers,
+cache management, result types, proxy configuration, and the DSE session clock.
 """
 
 from bdshare.util.store import Store
+from bdshare.util.manifest import Manifest
 from bdshare.util.tickers import Tickers
 from bdshare.util.session import (
     get_session,
@@ -13,16 +14,32 @@ from bdshare.util.session import (
     get_token,
     set_token,
 )
-from bdshare.util.cache import clear_cache
+from bdshare.util.cache import (
+    SQLiteCache,
+    clear_cache,
+    configure_cache,
+    get_cache_backend,
+    set_cache_backend,
+)
+from bdshare.util.output import get_output, set_output
 from bdshare.util.proxy import configure_proxy
+from bdshare.util.market_hours import is_market_open
 
 __all__ = [
     "Store",
+    "Manifest",
     "Tickers",
     "get_session",
     "set_session",
     "get_token",
     "set_token",
     "clear_cache",
+    "configure_cache",
+    "SQLiteCache",
+    "get_cache_backend",
+    "set_cache_backend",
+    "get_output",
+    "set_output",
     "configure_proxy",
+    "is_market_open",
 ]
\ No newline at end of file
@@ -1,46 +1,138 @@
 """
 bdshare.util.cache
 ~~~~~~~~~~~~~~~~~~
-Simple in-process TTL cache used by the BDShare OOP client,
-plus a module-level ``clear_cache()`` for the functional API.
+Simple in-process TTL cache used by the BDShare OOP client, an
+SQLite-backed cache that is shared by every process on the host, and the
+opt-in ``@cached`` layer (``configure_cache()`` / ``clear_cache()``) used by
+the functional API.
+
+Cached pandas objects are stored as private deep-copied snapshots and
+handed back as copy-on-write views, so callers can freely mutate what
+they receive without corrupting the cache.
 """
 
+import os
 import time
+import inspect
+import pickle
+import sqlite3
+import logging
 import threading
-from typing import Any, Dict, Optional, Tuple
+from datetime import date, datetime
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from bdshare.util.output import resolve_output
+
+logger = logging.getLogger(__name__)
+
+# Returned by ``get(key, _MISSING)`` on a miss, so cached values that are
+# falsy (empty DataFrames, empty lists, 0) are still recognised as hits.
+_MISSING = object()
+
+
+def _copy_on_write() -> bool:
+    """True when pandas copy-on-write semantics are active."""
+    if int(pd.__version__.split(".", 1)[0]) >= 3:
+        return True
+    return pd.options.mode.copy_on_write is True
+
+
+def _is_polars(value: Any) -> bool:
+    return type(value).__module__.startswith("polars") and hasattr(value, "clone")
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Return a private snapshot of *value* suitable for storing in a cache.
+
+    Arrow tables are immutable and stored as-is; Polars frames are cloned,
+    which shares their buffers but not in-place column edits.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return value.copy()
+    if _is_polars(value):
+        return value.clone()
+    if isinstance(value, (list, tuple)):
+        return type(value)(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """
+    Return a caller-owned view of a cached snapshot.
+
+    Under copy-on-write a shallow copy is free and any later mutation
+    copies the touched column only; without it a deep copy is required.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=not _copy_on_write())
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if _is_polars(value):
+        return value.clone()
+    if isinstance(value, (list, tuple)):
+        return type(value)(_thaw(v) for v in value)
+    return value
 
 
 class _TTLCache:
     """
     Thread-safe in-process key/value cache with per-entry TTL.
 
-    Values are evicted lazily on read once their TTL has expired.
+    Values are evicted lazily on read once their TTL — plus any
+    ``stale_ttl`` grace period they were stored with — has expired.
     """
 
     def __init__(self):
-        self._store: Dict[str, Tuple[Any, float]] = {}
+        self._store: Dict[str, Tuple[Any, float, float]] = {}
         self._lock  = threading.Lock()
 
-    def get(self, key: str) -> Optional[Any]:
-        """Return the cached value for *key*, or ``None`` if missing/expired."""
+    def get(self, key: str, default: Any = None) -> Optional[Any]:
+        """
+        Return the cached value for *key*, or *default* if missing/expired.
+
+        Pass ``_MISSING`` as *default* to tell a miss apart from a cached
+        ``None`` or empty result.
+        """
+        entry = self.get_entry(key)
+        if entry is None or not entry[1]:
+            return default
+        return entry[0]
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """
+        Return ``(value, fresh)`` for *key*, including entries past their
+        TTL but still inside their stale grace period, or ``None``.
+        """
+        now = time.monotonic()
         with self._lock:
             entry = self._store.get(key)
             if entry is None:
                 return None
-            value, expires_at = entry
-            if time.monotonic() > expires_at:
+            value, expires_at, evict_at = entry
+            if now > evict_at:
                 del self._store[key]
                 return None
-            return value
+        return _thaw(value), now <= expires_at
 
-    def set(self, key: str, value: Any, ttl: int = 300) -> None:
+    def set(self, key: str, value: Any, ttl: int = 300, stale_ttl: float = 0) -> None:
         """
-        Store *value* under *key* with a TTL of *ttl* seconds.
+        Store a snapshot of *value* under *key* with a TTL of *ttl* seconds.
 
-        :param ttl: Time-to-live in seconds (default 300 = 5 minutes).
+        :param ttl:       Time-to-live in seconds (default 300 = 5 minutes).
+        :param stale_ttl: Extra seconds the expired value stays available
+                          through :meth:`get_entry`.
         """
+        snapshot   = _freeze(value)
+        expires_at = time.monotonic() + ttl
         with self._lock:
-            self._store[key] = (value, time.monotonic() + ttl)
+            self._store[key] = (snapshot, expires_at, expires_at + stale_ttl)
 
     def clear(self) -> None:
         """Evict all cached entries."""
@@ -52,14 +144,300 @@ class _TTLCache:
             return len(self._store)
 
 
-# Module-level singleton used by BDShare client instances
+class SQLiteCache:
+    """
+    Persistent TTL cache in a single SQLite file, safe to share between
+    processes (gunicorn workers, cron jobs, notebook kernels).
+
+    Exposes the same ``get``/``set``/``clear``/``len`` interface as
+    ``_TTLCache`` so it can be passed anywhere a cache backend is accepted::
+
+        from bdshare import BDShare
+        from bdshare.util import SQLiteCache, set_cache_backend
+
+        shared = SQLiteCache()                  # ~/.cache/bdshare/cache.sqlite3
+        bd = BDShare(cache_backend=shared)      # OOP client
+        set_cache_backend(shared)               # functional API
+
+    Values are pickled; every write runs in its own ``BEGIN IMMEDIATE``
+    transaction, so readers only ever see complete entries. The database
+    uses WAL journaling, letting readers proceed while another process
+    writes. When the stored payload exceeds *max_bytes*, expired entries
+    and then those closest to eviction are dropped first.
+
+    :param path:      Database file. Defaults to
+                      ``$XDG_CACHE_HOME/bdshare/cache.sqlite3``.
+    :param max_bytes: Upper bound on the total pickled payload size.
+    :param timeout:   Seconds to wait for a lock held by another process.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        max_bytes: int = 256 * 1024 * 1024,
+        timeout: float = 30.0,
+    ):
+        if path is None:
+            base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+            path = Path(base) / "bdshare" / "cache.sqlite3"
+        self.path      = Path(path)
+        self.max_bytes = max_bytes
+        self.timeout   = timeout
+        self._local    = threading.local()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " evict_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_evict ON cache (evict_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, reopening it after a fork."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._local.conn = conn
+            self._local.pid  = os.getpid()
+        return conn
+
+    def get(self, key: str, default: Any = None) -> Optional[Any]:
+        """Return the cached value for *key*, or *default* if missing/expired."""
+        entry = self.get_entry(key)
+        if entry is None or not entry[1]:
+            return default
+        return entry[0]
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """
+        Return ``(value, fresh)`` for *key*, including entries past their
+        TTL but still inside their stale grace period, or ``None``.
+        """
+        row = self._connect().execute(
+            "SELECT value, expires_at, evict_at FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+        if row is None or now > row[2]:
+            return None
+        try:
+            return pickle.loads(row[0]), now <= row[1]
+        except Exception as exc:
+            logger.warning("Discarding unreadable cache entry %r: %s", key, exc)
+            return None
+
+    def set(self, key: str, value: Any, ttl: int = 300, stale_ttl: float = 0) -> None:
+        """
+        Store *value* under *key* with a TTL of *ttl* seconds.
+
+        :param ttl:       Time-to-live in seconds (default 300 = 5 minutes).
+        :param stale_ttl: Extra seconds the expired value stays available
+                          through :meth:`get_entry`.
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            logger.debug("Not caching %r: %d bytes exceeds max_bytes", key, len(blob))
+            return
+        now  = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, expires_at, evict_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, sqlite3.Binary(blob), len(blob), now + ttl, now + ttl + stale_ttl),
+            )
+            self._evict(conn, now)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop evictable entries, then the soonest-to-expire until under budget."""
+        conn.execute("DELETE FROM cache WHERE evict_at < ?", (now,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM cache ORDER BY evict_at"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM cache WHERE key = ?", doomed)
+
+    def clear(self) -> None:
+        """Evict all cached entries."""
+        self._connect().execute("DELETE FROM cache")
+
+    def __len__(self) -> int:
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM cache WHERE evict_at >= ?", (time.time(),)
+        ).fetchone()[0]
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"SQLiteCache(path={str(self.path)!r})"
+
+
+# Module-level singleton used by the functional API; swap it for a shared
+# backend with ``set_cache_backend()``.
 _cache = _TTLCache()
 
 
+def get_cache_backend() -> Any:
+    """Return the cache backend currently used by the functional API."""
+    return _cache
+
+
+def set_cache_backend(backend: Optional[Any]) -> None:
+    """
+    Replace the module-level cache backend.
+
+    :param backend: Any object exposing ``get``/``set``/``clear``, e.g.
+                    :class:`SQLiteCache`. ``None`` restores a fresh
+                    in-process ``_TTLCache``.
+    """
+    global _cache
+    _cache = backend if backend is not None else _TTLCache()
+
+
 def clear_cache() -> None:
     """
     Clear the module-level cache.
 
-    Called by ``BDShare.clear_cache()`` and ``BDShare.__exit__``.
+    Called by ``BDShare.clear_cache()``. ``BDShare.__exit__`` leaves it
+    alone, since the module cache is shared by every client.
+    """
+    _cache.clear()
+
+
+# ---------------------------------------------------------------------------
+# Functional API caching
+# ---------------------------------------------------------------------------
+
+_settings: Dict[str, Any] = {
+    "enabled": False,   # opt-in: the functional API never caches by default
+    "ttl":     {},      # per-endpoint TTL overrides; 0 disables an endpoint
+}
+
+# Arguments that never change the result, so are left out of cache keys.
+_IGNORED_ARGS = {"retry_count", "pause"}
+_SYMBOL_ARGS  = {"symbol", "code"}
+_DATE_ARGS    = {"start", "end"}
+
+
+def configure_cache(
+    enabled: Optional[bool] = None,
+    ttl: Optional[Dict[str, int]] = None,
+    backend: Optional[Any] = None,
+) -> None:
     """
-    _cache.clear()
\ No newline at end of file
+    Configure caching for the functional API (``get_current_trade_data``,
+    ``get_latest_pe``, ``get_market_info``, ...).
+
+    :param enabled: Turn caching on or off globally.
+    :param ttl:     Per-endpoint TTL overrides in seconds, keyed by function
+                    name. A TTL of ``0`` disables caching for that endpoint.
+    :param backend: Optional backend, as for :func:`set_cache_backend`.
+
+    Example::
+
+        import bdshare
+
+        bdshare.configure_cache(enabled=True, ttl={"get_current_trade_data": 15})
+        bdshare.get_latest_pe()   # fetched
+        bdshare.get_latest_pe()   # served from cache for the next hour
+    """
+    if enabled is not None:
+        _settings["enabled"] = enabled
+    if ttl is not None:
+        _settings["ttl"].update(ttl)
+    if backend is not None:
+        set_cache_backend(backend)
+
+
+def _normalize_arg(name: str, value: Any) -> Any:
+    """Canonicalise an argument so equivalent calls share a cache key."""
+    if name in _DATE_ARGS:
+        if isinstance(value, datetime):
+            return value.date().isoformat()
+        if isinstance(value, date):
+            return value.isoformat()
+        if isinstance(value, str):
+            try:
+                return datetime.strptime(value.strip(), "%Y-%m-%d").date().isoformat()
+            except ValueError:
+                return value.strip()
+    if name in _SYMBOL_ARGS and isinstance(value, str):
+        return value.strip().upper()
+    if name == "output":
+        # None follows set_output(), so resolve it into the key.
+        return resolve_output(value)
+    return value
+
+
+def _make_key(name: str, sig: inspect.Signature, args: tuple, kwargs: dict) -> str:
+    bound = sig.bind(*args, **kwargs)
+    bound.apply_defaults()
+    parts = [
+        f"{arg}={_normalize_arg(arg, value)!r}"
+        for arg, value in sorted(bound.arguments.items())
+        if arg not in _IGNORED_ARGS
+    ]
+    return f"fn:{name}:" + ",".join(parts)
+
+
+_bypass = threading.local()
+
+
+@contextmanager
+def _bypass_lookup() -> Iterator[None]:
+    """
+    Within this block (on this thread) decorated fetchers skip the cache
+    lookup and always fetch, still storing the fresh result. Used by
+    ``BDShare`` refreshes and by the live snapshot, stream and poller
+    fetchers, which must see every change rather than the module cache.
+    """
+    depth = getattr(_bypass, "depth", 0)
+    _bypass.depth = depth + 1
+    try:
+        yield
+    finally:
+        _bypass.depth = depth
+
+
+def cached(ttl: int) -> Callable:
+    """
+    Cache a public fetcher's result in the module-level backend.
+
+    Does nothing until enabled with :func:`configure_cache`. Keys are built
+    from the bound arguments with symbols upper-cased, dates rendered as
+    ``YYYY-MM-DD`` and retry settings ignored.
+
+    :param ttl: Default time-to-live in seconds for this endpoint.
+    """
+    def decorator(func):
+        sig  = inspect.signature(func)
+        name = func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            endpoint_ttl = _settings["ttl"].get(name, ttl)
+            if not _settings["enabled"] or not endpoint_ttl:
+                return func(*args, **kwargs)
+            key = _make_key(name, sig, args, kwargs)
+            if not getattr(_bypass, "depth", 0):
+                hit = _cache.get(key, _MISSING)
+                if hit is not _MISSING:
+                    return hit
+            data = func(*args, **kwargs)
+            _cache.set(key, data, ttl=endpoint_ttl)
+            return data
+        return wrapper
+    return decorator
@@ -8,12 +8,13 @@ Import surface expected by other modules:
     from bdshare.util.helper import (
         _fetch_table, _safe_num, _parse_html,
         safe_get, safe_post,
-        BDShareError, _session, deprecated,
+        BDShareError, _session, deprecated, RateLimiter,
     )
 """
 
 import time
 import logging
+import threading
 import warnings
 from functools import wraps
 from typing import Any, Dict, Optional
@@ -51,6 +52,35 @@ def deprecated(message: str):
     return decorator
 
 
+# ---------------------------------------------------------------------------
+# Rate limiter
+# ---------------------------------------------------------------------------
+
+class RateLimiter:
+    """Sliding-window rate limiter (default: 5 calls / second), thread-safe."""
+
+    def __init__(self, max_calls: int = 5, period: float = 1.0):
+        self.max_calls = max_calls
+        self.period    = period
+        self.calls: list = []
+        self._lock     = threading.Lock()
+
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self._lock:
+                now = time.monotonic()
+                self.calls = [t for t in self.calls if now - t < self.period]
+                if len(self.calls) >= self.max_calls:
+                    sleep_for = self.period - (now - self.calls[0])
+                    if sleep_for > 0:
+                        time.sleep(sleep_for)
+                    self.calls.clear()
+                self.calls.append(time.monotonic())
+            return func(*args, **kwargs)
+        return wrapper
+
+
 # ---------------------------------------------------------------------------
 # Shared HTTP session
 # ---------------------------------------------------------------------------
@@ -88,6 +118,7 @@ def safe_get(
     retries: int = 3,
     pause: float = 0.2,
     timeout: int = 10,
+    stream: bool = False,
 ) -> requests.Response:
     """
     Fetch a URL via GET with retries, an optional fallback URL, and
@@ -106,11 +137,13 @@ def safe_get(
     :param retries:  Total number of attempts.
     :param pause:    Base pause in seconds (doubles each retry).
     :param timeout:  Per-request socket timeout in seconds.
+    :param stream:   Defer reading the body; the caller consumes
+                     ``r.raw`` / ``r.iter_content()`` and closes the response.
     :returns:        The first successful :class:`requests.Response`.
     :raises BDShareError: After all retries are exhausted without success.
     """
     return _request("GET", url, alt_url=alt_url, params=params,
-                    retries=retries, pause=pause, timeout=timeout)
+                    retries=retries, pause=pause, timeout=timeout, stream=stream)
 
 
 # ---------------------------------------------------------------------------
@@ -124,6 +157,7 @@ def safe_post(
     retries: int = 3,
     pause: float = 0.2,
     timeout: int = 10,
+    headers: Optional[Dict] = None,
 ) -> requests.Response:
     """
     POST to a URL with retries, an optional fallback URL, and exponential
@@ -135,11 +169,14 @@ def safe_post(
     :param retries:  Total number of attempts.
     :param pause:    Base pause in seconds (doubles each retry).
     :param timeout:  Per-request socket timeout in seconds.
+    :param headers:  Extra headers for this request only (session headers
+                     are left untouched).
     :returns:        The first successful :class:`requests.Response`.
     :raises BDShareError: After all retries are exhausted without success.
     """
     return _request("POST", url, alt_url=alt_url, data=data,
-                    retries=retries, pause=pause, timeout=timeout)
+                    retries=retries, pause=pause, timeout=timeout,
+                    headers=headers)
 
 
 # ---------------------------------------------------------------------------
@@ -155,6 +192,8 @@ def _request(
     retries: int = 3,
     pause: float = 0.2,
     timeout: int = 10,
+    headers: Optional[Dict] = None,
+    stream: bool = False,
 ) -> requests.Response:
     urls = [u for u in (url, alt_url) if u]
     last_exc: Optional[Exception] = None
@@ -166,10 +205,12 @@ def _request(
         for target in urls:
             try:
                 r = _session.request(
-                    method, target, params=params, data=data, timeout=timeout
+                    method, target, params=params, data=data,
+                    headers=headers, timeout=timeout, stream=stream,
                 )
                 if r.status_code == 200:
                     return r
+                r.close()
                 logger.warning(
                     "HTTP %s from %s (attempt %d/%d)",
                     r.status_code, target, attempt + 1, retries,
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+"""
+bdshare.util.manifest
+~~~~~~~~~~~~~~~~~~~~~
+Per-directory index of Store outputs.
+
+``_manifest.json`` records, for every file under an archive directory, its
+format, row count, size, checksum, schema, ``date`` range, symbol set and
+hive partition values. Readers consult it to open only the files that can
+hold a given symbol and date range.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import pandas as pd
+
+from bdshare.util.store import (
+    _MANIFEST_NAME as MANIFEST_NAME,
+    _SIDECAR_SUFFIX, _SQLITE_EXTS, _SQLITE_TABLE, Store, _atomic,
+)
+
+logger = logging.getLogger(__name__)
+
+_MANIFEST_VERSION = 1
+
+# File extension -> Store format, for files picked up by Manifest.refresh().
+_EXT_FORMATS = {
+    "csv": "csv", "xlsx": "excel", "parquet": "parquet", "json": "json",
+    "jsonl": "json", "feather": "feather",
+    **{ext: "sqlite" for ext in _SQLITE_EXTS},
+}
+
+
+def _checksum(file_path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _partitions(relative: Path) -> Dict[str, str]:
+    """``col=value`` directory names between the root and the file."""
+    return dict(part.split("=", 1) for part in relative.parent.parts if "=" in part)
+
+
+def _frame_stats(data: pd.DataFrame) -> Dict[str, Any]:
+    frame = data.reset_index() if "date" in (data.index.names or []) else data
+    stats: Dict[str, Any] = {
+        "rows":     len(frame),
+        "schema":   {str(c): str(t) for c, t in frame.dtypes.items()},
+        "date_min": None,
+        "date_max": None,
+        "symbols":  None,
+    }
+    if "date" in frame.columns and len(frame):
+        dates = pd.to_datetime(frame["date"], errors="coerce").dropna()
+        if len(dates):
+            stats["date_min"] = dates.min().strftime("%Y-%m-%d")
+            stats["date_max"] = dates.max().strftime("%Y-%m-%d")
+    if "symbol" in frame.columns:
+        stats["symbols"] = sorted(frame["symbol"].dropna().astype(str).str.upper().unique().tolist())
+    return stats
+
+
+def _sqlite_stats(file_path: Path, table: str = _SQLITE_TABLE) -> Dict[str, Any]:
+    """Stats computed inside SQLite, so a large table is never loaded."""
+    with closing(sqlite3.connect(file_path)) as conn:
+        info = conn.execute(f'PRAGMA table_info("{table}")').fetchall()
+        cols = {row[1]: row[2] for row in info}
+        stats: Dict[str, Any] = {
+            "rows":     conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] if cols else 0,
+            "schema":   cols,
+            "date_min": None,
+            "date_max": None,
+            "symbols":  None,
+        }
+        if "date" in cols:
+            stats["date_min"], stats["date_max"] = (
+                v[:10] if v else None
+                for v in conn.execute(f'SELECT MIN("date"), MAX("date") FROM "{table}"').fetchone()
+            )
+        if "symbol" in cols:
+            stats["symbols"] = sorted(
+                str(r[0]).upper()
+                for r in conn.execute(f'SELECT DISTINCT "symbol" FROM "{table}" WHERE "symbol" IS NOT NULL')
+            )
+    return stats
+
+
+def _merge_stats(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine stats of existing rows with those of appended rows."""
+    merged = dict(new, rows=old["rows"] + new["rows"], schema={**old["schema"], **new["schema"]})
+    mins = [d for d in (old["date_min"], new["date_min"]) if d]
+    maxs = [d for d in (old["date_max"], new["date_max"]) if d]
+    merged["date_min"] = min(mins) if mins else None
+    merged["date_max"] = max(maxs) if maxs else None
+    if old["symbols"] is not None and new["symbols"] is not None:
+        merged["symbols"] = sorted(set(old["symbols"]) | set(new["symbols"]))
+    else:
+        merged["symbols"] = None
+    return merged
+
+
+class Manifest:
+    """
+    Index of the Store outputs under *root*, persisted as
+    ``{root}/_manifest.json``.
+
+    Entries are keyed by POSIX path relative to *root* and hold ``format``,
+    ``rows``, ``size``, ``mtime``, ``checksum`` (BLAKE2b), ``schema``,
+    ``date_min``/``date_max``, ``symbols`` (``None`` when the file has no
+    ``symbol`` column) and ``partitions``. :meth:`files` returns only the
+    files whose stats can satisfy a symbol/date query.
+
+    Appending to a file leaves its ``checksum`` ``None`` rather than
+    rehashing the whole file on every append; :meth:`verify` fills it in.
+
+    Usage::
+
+        from bdshare.util import Manifest
+
+        manifest = Manifest("archive")
+        manifest.refresh()                        # index new/changed files
+        manifest.files(symbols=["ACI"], start="2024-05-01", end="2024-05-31")
+
+    The manifest is rewritten atomically; concurrent writers should be
+    serialised by the caller.
+
+    :param root: Archive directory.
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self.path = self.root / MANIFEST_NAME
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            self.entries = json.loads(self.path.read_text()).get("files", {})
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _key(self, file_path: Union[str, Path]) -> str:
+        file_path = Path(file_path)
+        if not file_path.is_absolute():
+            file_path = self.root / file_path
+        return file_path.resolve().relative_to(self.root.resolve()).as_posix()
+
+    def add(
+        self,
+        file_path: Union[str, Path],
+        data: Optional[pd.DataFrame] = None,
+        appended: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Record (or update) the entry for *file_path*.
+
+        :param data:     The frame just written, to avoid re-reading the
+                         file. Without it the file is loaded once.
+        :param appended: *data* holds only rows appended to the file; merge
+                         its stats into the existing entry and defer the
+                         checksum to :meth:`verify`.
+        :return: The new entry.
+        """
+        key = self._key(file_path)
+        full = self.root / key
+        fmt = _EXT_FORMATS.get(full.suffix.lstrip(".").lower())
+        if fmt is None:
+            raise ValueError(f"Not a Store output: {full}")
+
+        partitions = _partitions(Path(key))
+        if fmt == "sqlite":
+            stats = _sqlite_stats(full)
+        else:
+            stats = _frame_stats(data if data is not None else Store.from_file(full).data)
+            if appended and key in self.entries:
+                stats = _merge_stats(self.entries[key], stats)
+        if "symbol" in partitions:
+            stats["symbols"] = [partitions["symbol"].upper()]
+
+        st = full.stat()
+        entry = {
+            "format":     fmt,
+            "size":       st.st_size,
+            "mtime":      st.st_mtime,
+            # Rehashing on every append would cost the whole file each time.
+            "checksum":   None if appended else _checksum(full),
+            "partitions": partitions,
+            **stats,
+        }
+        self.entries[key] = entry
+        return entry
+
+    def remove(self, file_path: Union[str, Path]) -> None:
+        self.entries.pop(self._key(file_path), None)
+
+    def refresh(self) -> int:
+        """
+        Index every Store output under *root* whose size or mtime changed
+        and drop entries for deleted files, then :meth:`save`.
+
+        :return: Number of entries added, updated or removed.
+        """
+        seen, changed = set(), 0
+        for full in sorted(self.root.rglob("*")):
+            name = full.name
+            if (not full.is_file() or name.startswith((".", "_"))
+                    or name.endswith(_SIDECAR_SUFFIX)
+                    or full.suffix.lstrip(".").lower() not in _EXT_FORMATS):
+                continue
+            key = self._key(full)
+            seen.add(key)
+            st = full.stat()
+            old = self.entries.get(key)
+            if old and old["size"] == st.st_size and old["mtime"] == st.st_mtime:
+                continue
+            try:
+                self.add(full)
+                changed += 1
+            except Exception as exc:
+                logger.warning("Skipping %s in manifest: %s", full, exc)
+        for key in set(self.entries) - seen:
+            del self.entries[key]
+            changed += 1
+        self.save()
+        return changed
+
+    def verify(self) -> List[str]:
+        """
+        Check every entry's checksum against its file, computing the ones
+        deferred by appends, then :meth:`save`.
+
+        :return: Keys of entries whose file is missing or no longer matches
+                 its checksum.
+        """
+        bad = []
+        for key, entry in sorted(self.entries.items()):
+            full = self.root / key
+            if not full.is_file():
+                bad.append(key)
+                continue
+            digest = _checksum(full)
+            if entry["checksum"] is None:
+                entry["checksum"] = digest
+            elif entry["checksum"] != digest:
+                bad.append(key)
+        self.save()
+        return bad
+
+    def save(self) -> Path:
+        """Write the manifest atomically."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with _atomic(self.path) as tmp:
+            tmp.write_text(json.dumps({"version": _MANIFEST_VERSION, "files": self.entries}, indent=1))
+        return self.path.resolve()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def files(
+        self,
+        symbols: Optional[Sequence[str]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> List[Path]:
+        """
+        Files that may contain rows for *symbols* within the inclusive
+        *start*/*end* date range (``YYYY-MM-DD``). Files lacking a statistic
+        are never skipped on it.
+        """
+        wanted = {s.upper() for s in symbols} if symbols is not None else None
+        out = []
+        for key, entry in sorted(self.entries.items()):
+            if wanted is not None and entry["symbols"] is not None and not wanted & set(entry["symbols"]):
+                continue
+            if start and entry["date_max"] and entry["date_max"] < start:
+                continue
+            if end and entry["date_min"] and entry["date_min"] > end:
+                continue
+            out.append(self.root / key)
+        return out
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def __repr__(self) -> str:
+        return f"Manifest(root={str(self.root)!r}, files={len(self.entries)})"
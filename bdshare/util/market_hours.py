@@ -0,0 +1,69 @@
+"""
+bdshare.util.market_hours
+~~~~~~~~~~~~~~~~~~~~~~~~~
+DSE trading-session clock.
+
+The regular session runs Sunday–Thursday, 10:00–14:30 Bangladesh time
+(UTC+6, no daylight saving). Exchange holidays are not known here, so on a
+holiday the session is reported open but simply shows no changes.
+"""
+
+from datetime import datetime, time, timedelta, timezone
+from typing import Optional
+
+DSE_TZ = timezone(timedelta(hours=6), "Asia/Dhaka")
+
+SESSION_OPEN  = time(10, 0)
+SESSION_CLOSE = time(14, 30)
+
+# datetime.weekday(): Monday=0 ... Sunday=6. DSE trades Sunday–Thursday.
+TRADING_DAYS = frozenset({6, 0, 1, 2, 3})
+
+
+def dse_now(now: Optional[datetime] = None) -> datetime:
+    """
+    Return *now* (default: the current time) in Bangladesh time.
+
+    Naive datetimes are assumed to already be in Bangladesh time.
+    """
+    if now is None:
+        return datetime.now(DSE_TZ)
+    if now.tzinfo is None:
+        return now.replace(tzinfo=DSE_TZ)
+    return now.astimezone(DSE_TZ)
+
+
+def is_trading_day(now: Optional[datetime] = None) -> bool:
+    """True on Sunday–Thursday in Bangladesh time."""
+    return dse_now(now).weekday() in TRADING_DAYS
+
+
+def is_market_open(now: Optional[datetime] = None) -> bool:
+    """True during the regular DSE session."""
+    local = dse_now(now)
+    return local.weekday() in TRADING_DAYS and SESSION_OPEN <= local.time() < SESSION_CLOSE
+
+
+def seconds_to_close(now: Optional[datetime] = None) -> float:
+    """Seconds until today's session close; negative once it has passed."""
+    local = dse_now(now)
+    close = datetime.combine(local.date(), SESSION_CLOSE, tzinfo=DSE_TZ)
+    return (close - local).total_seconds()
+
+
+def seconds_since_open(now: Optional[datetime] = None) -> float:
+    """Seconds since today's session open; negative before it."""
+    local = dse_now(now)
+    opened = datetime.combine(local.date(), SESSION_OPEN, tzinfo=DSE_TZ)
+    return (local - opened).total_seconds()
+
+
+def next_open(now: Optional[datetime] = None) -> datetime:
+    """The next session open strictly after *now*, in Bangladesh time."""
+    local = dse_now(now)
+    day = local.date()
+    while True:
+        candidate = datetime.combine(day, SESSION_OPEN, tzinfo=DSE_TZ)
+        if candidate > local and candidate.weekday() in TRADING_DAYS:
+            return candidate
+        day += timedelta(days=1)
@@ -0,0 +1,113 @@
+"""
+bdshare.util.output
+~~~~~~~~~~~~~~~~~~~
+Result containers for the fetchers.
+
+Every public fetcher accepts ``output=`` — ``'pandas'`` (default),
+``'arrow'`` (``pyarrow.Table``) or ``'polars'`` (``polars.DataFrame``).
+Arrow and Polars results are built straight from the parsed column lists,
+without an intermediate pandas frame; ``polars`` wraps the Arrow buffers
+zero-copy. ``set_output()`` changes the default for calls that do not pass
+``output=``.
+"""
+
+import importlib
+from operator import itemgetter
+from typing import Any, Dict, List, Literal, Optional, Sequence, get_args
+
+import pandas as pd
+
+OutputFormat = Literal["pandas", "arrow", "polars"]
+_OUTPUTS = get_args(OutputFormat)
+
+# Module -> pip package, for the ImportError hint.
+_PACKAGES = {"pyarrow": "pyarrow", "polars": "polars"}
+
+_settings = {"output": "pandas"}
+
+
+def set_output(output: OutputFormat) -> None:
+    """Set the default result type for fetchers called without ``output=``."""
+    _settings["output"] = resolve_output(output)
+
+
+def get_output() -> str:
+    """Return the default result type."""
+    return _settings["output"]
+
+
+def resolve_output(output: Optional[str]) -> str:
+    """Validate *output*, falling back to the default when it is ``None``."""
+    output = _settings["output"] if output is None else output
+    if output not in _OUTPUTS:
+        raise ValueError(f"Unsupported output {output!r}. Choose from: {_OUTPUTS}")
+    return output
+
+
+def _require(module: str, output: str) -> Any:
+    """Import an optional dependency, explaining how to install it."""
+    try:
+        return importlib.import_module(module)
+    except ImportError as exc:
+        raise ImportError(
+            f"output={output!r} requires the optional dependency {module!r}; "
+            f"install it with: pip install {_PACKAGES[module]}"
+        ) from exc
+
+
+def _arrow_table(columns: Dict[str, list]) -> Any:
+    pa = _require("pyarrow", "arrow")
+    return pa.table({name: pa.array(values) for name, values in columns.items()})
+
+
+def _finish(table: Any, output: str) -> Any:
+    if output == "polars":
+        return _require("polars", "polars").from_arrow(table)
+    return table
+
+
+def from_rows(
+    rows: List[dict],
+    output: str,
+    columns: Optional[Sequence[str]] = None,
+    sort_by: Optional[str] = None,
+    ascending: bool = True,
+) -> Any:
+    """
+    Build an Arrow or Polars result from parsed row dicts.
+
+    Rows are transposed once into per-column lists (missing keys become
+    nulls) and each list becomes one Arrow array.
+
+    :param columns: Columns to keep, in order; defaults to every key seen.
+    :param sort_by: Optional column to sort by (stable).
+    """
+    if columns is None:
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+    if sort_by is not None:
+        # Stable, nulls last — the same order as pandas.sort_index().
+        present = [r for r in rows if r.get(sort_by) is not None]
+        missing = [r for r in rows if r.get(sort_by) is None]
+        rows = sorted(present, key=itemgetter(sort_by), reverse=not ascending) + missing
+    table = _arrow_table({str(col): [row.get(col) for row in rows] for col in columns})
+    return _finish(table, output)
+
+
+def from_records(records: List[tuple], columns: Sequence[str], output: str) -> Any:
+    """Build an Arrow or Polars result from positional row tuples."""
+    values = list(zip(*records)) if records else [()] * len(columns)
+    table = _arrow_table({str(col): list(vals) for col, vals in zip(columns, values)})
+    return _finish(table, output)
+
+
+def from_frame(df: pd.DataFrame, output: str) -> Any:
+    """
+    Convert a pandas result (for endpoints parsed by pandas itself, such as
+    ``read_html``) to Arrow or Polars. A named index becomes a column.
+    """
+    pa = _require("pyarrow", output)
+    df = df.rename(columns=str)
+    table = pa.Table.from_pandas(df, preserve_index=df.index.name is not None or None)
+    if table.schema.metadata:
+        table = table.replace_schema_metadata(None)
+    return _finish(table, output)
@@ -5,20 +5,37 @@ bdshare.util.store
 Data Storage Manager
 
 Features:
-- Multiple file format support (CSV, Excel, Parquet, JSON, Feather)
+- Multiple file format support (CSV, Excel, Parquet, JSON, Feather, SQLite)
 - Automatic directory creation
+- Atomic writes (temp file + rename) and bounded-memory chunk streaming
 - Comprehensive error handling
 - Type hints and documentation
 - File existence checks
 - Compression options
-- Round-trip loading via Store.from_file()
+- Concurrent multi-format export sharing one Arrow conversion
+- Append-only partitioned Parquet datasets and CSV appends, with compaction
+- SQLite upserts indexed on (symbol, date), with a DataFrame query helper
+- Opt-in dtype compaction, restored transparently on load
+- Round-trip loading via Store.from_file(), with column projection,
+  predicate pushdown and memory-mapped Feather reads
 """
 
+import bz2
+import gzip
+import json
 import logging
+import lzma
+import math
+import os
+import sqlite3
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing, contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import List, Literal, Optional, Union, get_args
+from typing import Any, Dict, Iterable, Iterator, List, Literal, NamedTuple, Optional, Sequence, Tuple, Union, get_args
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
@@ -26,16 +43,388 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 # Supported values, derived once from the Literal types
 # ---------------------------------------------------------------------------
-SupportedFormat   = Literal["csv", "excel", "parquet", "json", "feather"]
+SupportedFormat   = Literal["csv", "excel", "parquet", "json", "feather", "sqlite"]
 CompressionOption = Literal["gzip", "bz2", "zip", "xz", None]
 
-_FORMATS     = get_args(SupportedFormat)    # ('csv', 'excel', 'parquet', 'json', 'feather')
+_FORMATS     = get_args(SupportedFormat)    # ('csv', 'excel', 'parquet', 'json', 'feather', 'sqlite')
 _COMPRESSION = get_args(CompressionOption)  # ('gzip', 'bz2', 'zip', 'xz', None)
 
 _EXT_MAP = {
     "excel": "xlsx",  # .xlsx on disk, 'excel' as format name
 }
 
+# Formats pyarrow can write straight from one shared Arrow table.
+_ARROW_FORMATS = {"parquet", "feather"}
+
+# Formats Store.append() can extend without rewriting existing data.
+_APPEND_FORMATS = ("parquet", "csv")
+
+# SQLite: default table, upsert key and rows per executemany() batch.
+_SQLITE_TABLE = "data"
+_SQLITE_KEY   = ("symbol", "date")
+_SQLITE_BATCH = 50_000
+_SQLITE_EXTS  = {"sqlite", "sqlite3", "db"}
+
+# Dataset manifest kept by bdshare.util.manifest.Manifest.
+_MANIFEST_NAME = "_manifest.json"
+
+# Formats Store.save_chunks() can stream; 'json' is written as JSON lines.
+_STREAM_FORMATS = ("csv", "json", "parquet")
+_STREAM_EXT = {"json": "jsonl"}
+
+# Text-mode openers for streamed, optionally compressed output.
+_OPENERS = {None: open, "gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+
+# Partition keys derived from a ``date`` column when not present as columns.
+_DATE_PARTS = {"year": "year", "month": "month", "day": "day"}
+
+
+# Row filters in the pyarrow / ``pandas.read_parquet`` form: a list of
+# ``(column, op, value)`` tuples ANDed together, or a list of such lists ORed.
+Filter  = Tuple[str, str, Any]
+Filters = Union[List[Filter], List[List[Filter]]]
+
+_FILTER_OPS = {
+    "=":      lambda s, v: s == v,
+    "==":     lambda s, v: s == v,
+    "!=":     lambda s, v: s != v,
+    "<":      lambda s, v: s < v,
+    "<=":     lambda s, v: s <= v,
+    ">":      lambda s, v: s > v,
+    ">=":     lambda s, v: s >= v,
+    "in":     lambda s, v: s.isin(list(v)),
+    "not in": lambda s, v: ~s.isin(list(v)),
+}
+
+
+def _dnf(filters: Filters) -> List[List[Filter]]:
+    """Normalise *filters* to a list of AND-groups."""
+    if filters and isinstance(filters[0], tuple):
+        return [list(filters)]
+    return [list(group) for group in filters]
+
+
+def _filter_columns(filters: Optional[Filters]) -> List[str]:
+    return [col for group in _dnf(filters or []) for col, _, _ in group]
+
+
+def _apply_filters(df: pd.DataFrame, filters: Optional[Filters]) -> pd.DataFrame:
+    """Evaluate *filters* on an in-memory frame (formats without pushdown)."""
+    if not filters:
+        return df
+    mask = pd.Series(False, index=df.index)
+    for group in _dnf(filters):
+        part = pd.Series(True, index=df.index)
+        for col, op, value in group:
+            if op not in _FILTER_OPS:
+                raise ValueError(f"Unsupported filter operator {op!r}. Choose from: {list(_FILTER_OPS)}")
+            part &= _FILTER_OPS[op](df[col], value)
+        mask |= part
+    return df[mask]
+
+
+def _cast_filters(filters: Filters, schema: Any) -> Filters:
+    """
+    Cast filter literals on date/timestamp columns to the column's Arrow
+    type; Arrow cannot compare e.g. ``timestamp[us]`` with a string.
+    """
+    import pyarrow as pa
+
+    def cast(col: str, value: Any) -> Any:
+        if col not in schema.names:
+            return value
+        typ = schema.field(col).type
+        if pa.types.is_timestamp(typ):
+            ts = pd.Timestamp(value)
+            if typ.tz and ts.tzinfo is None:
+                ts = ts.tz_localize(typ.tz)
+            elif not typ.tz and ts.tzinfo is not None:
+                ts = ts.tz_convert(None)
+            return pa.scalar(ts, type=typ)
+        if pa.types.is_date(typ):
+            return pa.scalar(pd.Timestamp(value).date(), type=typ)
+        return value
+
+    return [
+        [(col, op, [cast(col, v) for v in value] if op in ("in", "not in") else cast(col, value))
+         for col, op, value in group]
+        for group in _dnf(filters)
+    ]
+
+
+def _select(df: pd.DataFrame, columns: Optional[Sequence[str]]) -> pd.DataFrame:
+    return df if columns is None else df[list(columns)]
+
+
+@contextmanager
+def _atomic(file_path: Path) -> Iterator[Path]:
+    """
+    Yield a temporary sibling of *file_path* and rename it into place on
+    success, so readers only ever see the old file or the complete new one.
+    The temp name keeps the suffix because some writers infer the format
+    from it.
+    """
+    tmp = file_path.with_name(f".{file_path.stem}.{uuid.uuid4().hex[:8]}.tmp{file_path.suffix}")
+    try:
+        yield tmp
+        os.replace(tmp, file_path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------------
+# SQLite helpers
+# ---------------------------------------------------------------------------
+
+_SQL_OPS = {"=": "=", "==": "=", "!=": "!=", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+
+
+def _quote(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _sqlite_type(s: pd.Series) -> str:
+    if pd.api.types.is_bool_dtype(s) or pd.api.types.is_integer_dtype(s):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(s):
+        return "REAL"
+    return "TEXT"
+
+
+def _sql_value(value: Any) -> Any:
+    if isinstance(value, (pd.Timestamp, datetime)):
+        midnight = (value.hour, value.minute, value.second) == (0, 0, 0)
+        return value.strftime("%Y-%m-%d" if midnight else "%Y-%m-%d %H:%M:%S")
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _sqlite_rows(frame: pd.DataFrame) -> Iterator[tuple]:
+    """Rows as Python scalars: NaN/NaT -> NULL, timestamps -> ISO text."""
+    frame = frame.copy()
+    for col in frame.columns:
+        s = frame[col]
+        if pd.api.types.is_datetime64_any_dtype(s):
+            has_time = (s.dropna() != s.dropna().dt.normalize()).any()
+            frame[col] = s.dt.strftime("%Y-%m-%d %H:%M:%S" if has_time else "%Y-%m-%d")
+    return frame.astype(object).where(frame.notna(), None).itertuples(index=False, name=None)
+
+
+def _filters_to_sql(filters: Filters) -> Tuple[str, list]:
+    """Render *filters* as a SQL ``WHERE`` clause and its parameters."""
+    groups, params = [], []
+    for group in _dnf(filters):
+        parts = []
+        for col, op, value in group:
+            if op in ("in", "not in"):
+                values = [_sql_value(v) for v in value]
+                parts.append(f"{_quote(col)} {op.upper()} ({', '.join('?' * len(values))})")
+                params.extend(values)
+            elif op in _SQL_OPS:
+                parts.append(f"{_quote(col)} {_SQL_OPS[op]} ?")
+                params.append(_sql_value(value))
+            else:
+                raise ValueError(f"Unsupported filter operator {op!r}. Choose from: {list(_FILTER_OPS)}")
+        groups.append("(" + " AND ".join(parts) + ")")
+    return " OR ".join(groups), params
+
+
+# ---------------------------------------------------------------------------
+# Dtype compaction
+# ---------------------------------------------------------------------------
+
+# Key of the compaction spec in Arrow schema metadata; text formats keep the
+# spec in a ``<file>.schema.json`` sidecar instead.
+_SPEC_KEY = b"bdshare.compaction"
+_SIDECAR_SUFFIX = ".schema.json"
+
+# Decimal scales tried, smallest first, when storing prices as integers.
+_PRICE_SCALES = (1, 10, 100, 1000, 10000)
+
+
+class CompactionReport(NamedTuple):
+    """Outcome of :func:`compact_dtypes`."""
+    bytes_before: int
+    bytes_after: int
+    dtypes: Dict[str, str]   # column -> compact dtype
+    scale: Dict[str, int]    # column -> decimal scale of integer-encoded floats
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    @property
+    def spec(self) -> Dict[str, Dict]:
+        return {"dtypes": self.dtypes, "scale": self.scale}
+
+
+def _scaled_ints(s: pd.Series) -> Optional[Tuple[pd.Series, int]]:
+    """Encode a float column as int32 ``round(s * scale)`` if that is exact."""
+    values = s.to_numpy(dtype=np.float64, na_value=np.nan)
+    finite = values[~np.isnan(values)]
+    if not len(finite) or not np.isfinite(finite).all():
+        return None
+    for scale in _PRICE_SCALES:
+        scaled = np.round(finite * scale)
+        if np.abs(scaled).max() >= 2 ** 31:
+            return None
+        if np.array_equal(scaled / scale, finite):
+            dtype = "int32" if len(finite) == len(values) else "Int32"
+            return pd.Series(np.round(values * scale), index=s.index).astype(dtype), scale
+    return None
+
+
+def compact_dtypes(df: pd.DataFrame, scale_floats: bool = True) -> Tuple[pd.DataFrame, CompactionReport]:
+    """
+    Shrink a frame to the smallest dtypes that hold its values exactly.
+
+    - integers are downcast to the narrowest signed type;
+    - floats become scaled ``int32`` (``ltp=210.5`` -> ``2105`` with scale
+      10) when every value has few enough decimals, else ``float32`` when
+      that round-trips exactly (only with *scale_floats*);
+    - ``date``/``*_date`` string columns are parsed to ``datetime64``;
+    - other string columns with repeated values become categoricals.
+
+    :return: ``(compacted frame, CompactionReport)``. Undo the float
+             scaling with :func:`restore_dtypes`.
+    """
+    out = {}
+    dtypes: Dict[str, str] = {}
+    scale: Dict[str, int] = {}
+    for col in df.columns:
+        s = df[col]
+        name = str(col).lower()
+        new = s
+        if pd.api.types.is_bool_dtype(s):
+            pass
+        elif pd.api.types.is_integer_dtype(s):
+            new = pd.to_numeric(s, downcast="integer")
+        elif pd.api.types.is_float_dtype(s):
+            encoded = _scaled_ints(s) if scale_floats else None
+            if encoded is not None:
+                new, scale[str(col)] = encoded
+            elif s.astype(np.float32).astype(np.float64).equals(s):
+                new = s.astype(np.float32)
+        elif pd.api.types.is_string_dtype(s) or pd.api.types.is_object_dtype(s):
+            if name == "date" or name.endswith("_date"):
+                try:
+                    new = pd.to_datetime(s)
+                except (ValueError, TypeError):
+                    pass
+            elif len(s) > 1 and s.nunique(dropna=True) <= len(s) // 2:
+                new = s.astype("category")
+        out[col] = new
+        if new.dtype != s.dtype:
+            dtypes[str(col)] = str(new.dtype)
+
+    compact = pd.DataFrame(out, index=df.index)
+    report = CompactionReport(
+        int(df.memory_usage(deep=True).sum()),
+        int(compact.memory_usage(deep=True).sum()),
+        dtypes,
+        scale,
+    )
+    return compact, report
+
+
+def restore_dtypes(df: pd.DataFrame, spec: Dict[str, Dict]) -> pd.DataFrame:
+    """Apply a compaction *spec* to a loaded frame: compact dtypes, unscaled floats."""
+    changes = {}
+    for col, dtype in spec.get("dtypes", {}).items():
+        if col not in df.columns:
+            continue
+        if col in spec.get("scale", {}):
+            changes[col] = df[col].astype("float64") / spec["scale"][col]
+        elif str(df[col].dtype) != dtype:
+            changes[col] = df[col].astype(dtype)
+    return df.assign(**changes) if changes else df
+
+
+def _read_spec(file_path: Path, fmt: str) -> Optional[Dict[str, Dict]]:
+    """Compaction spec stored alongside *file_path*, or None."""
+    try:
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+            meta = pq.read_schema(file_path).metadata or {}
+        elif fmt == "feather":
+            import pyarrow as pa
+            with pa.memory_map(str(file_path)) as source:
+                meta = pa.ipc.open_file(source).schema.metadata or {}
+        else:
+            sidecar = file_path.with_name(file_path.name + _SIDECAR_SUFFIX)
+            return json.loads(sidecar.read_text()) if sidecar.exists() else None
+    except (ImportError, OSError, ValueError):
+        return None
+    return json.loads(meta[_SPEC_KEY]) if _SPEC_KEY in meta else None
+
+
+def _never(col: str) -> List[Filter]:
+    """A contradictory pair of predicates: matches no row."""
+    return [(col, "<", 0), (col, ">", 0)]
+
+
+def _encode_scaled(col: str, op: str, value: Any, factor: int) -> List[Filter]:
+    """
+    Predicates on the stored integers of a scaled column equivalent to
+    ``(col, op, value)`` on the original floats. Values between grid points
+    round the bound inward for ``<``/``<=``/``>``/``>=``, match nothing for
+    ``==``/``in`` and everything for ``!=``/``not in`` (``[]``).
+    """
+    def exact(v: Any) -> Optional[int]:
+        x = v * factor
+        r = round(x)
+        return r if math.isclose(x, r, rel_tol=1e-12, abs_tol=1e-6) else None
+
+    if op in ("in", "not in"):
+        hits = [r for r in map(exact, value) if r is not None]
+        if op == "in":
+            return [(col, op, hits)] if hits else _never(col)
+        return [(col, op, hits)] if hits else []
+    r = exact(value)
+    if op in ("=", "=="):
+        return [(col, op, r)] if r is not None else _never(col)
+    if op == "!=":
+        return [(col, op, r)] if r is not None else []
+    x = r if r is not None else value * factor
+    if op in (">", "<="):
+        return [(col, op, math.floor(x))]
+    if op in (">=", "<"):
+        return [(col, op, math.ceil(x))]
+    return [(col, op, value)]
+
+
+def _encode_filters(filters: Optional[Filters], spec: Optional[Dict[str, Dict]]) -> Optional[Filters]:
+    """
+    Translate filter values into the stored representation of compacted
+    columns. Returns ``None`` when the translated filter matches every row.
+    """
+    if not filters or not spec:
+        return filters
+    scale, dtypes = spec.get("scale", {}), spec.get("dtypes", {})
+
+    def encode(col: str, value: Any) -> Any:
+        if dtypes.get(col, "").startswith("datetime64"):
+            return pd.Timestamp(value)
+        return value
+
+    groups = []
+    for group in _dnf(filters):
+        out: List[Filter] = []
+        for col, op, value in group:
+            if col in scale:
+                out += _encode_scaled(col, op, value, scale[col])
+            else:
+                out.append((col, op, [encode(col, v) for v in value]
+                            if op in ("in", "not in") else encode(col, value)))
+        if not out:
+            return None
+        groups.append(out)
+    return groups
+
+
+def _save_in_worker(store: "Store", fmt: str, compression, index: bool, kwargs: dict) -> Path:
+    """Process-pool entry point (must be a picklable module-level function)."""
+    return store.save(fmt, compression, index=index, **kwargs)
+
 
 class Store:
     """
@@ -85,6 +474,7 @@ class Store:
         self.data = data
         self.name = name or datetime.now().strftime("%Y%m%d-%H%M%S")
         self.path = Path(path) if path else Path.cwd()
+        self.compaction: Optional[CompactionReport] = None
 
     # ------------------------------------------------------------------
     # Internal helpers
@@ -103,6 +493,13 @@ class Store:
                 f"Choose from: {_COMPRESSION}"
             )
 
+    def _ensure_dir(self) -> None:
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+        except OSError as exc:
+            logger.error("Failed to create directory %s: %s", self.path, exc)
+            raise
+
     def _build_path(self, fmt: str) -> Path:
         ext = _EXT_MAP.get(fmt, fmt)
         return self.path / f"{self.name}.{ext}"
@@ -116,6 +513,8 @@ class Store:
         fmt: SupportedFormat = "csv",
         compression: CompressionOption = None,
         index: bool = False,
+        compact: bool = False,
+        manifest: bool = False,
         **kwargs,
     ) -> Path:
         """
@@ -125,12 +524,28 @@ class Store:
         ----------
         fmt : str
             Output format: ``'csv'``, ``'excel'``, ``'parquet'``,
-            ``'json'``, or ``'feather'``.
+            ``'json'``, ``'feather'`` or ``'sqlite'``. SQLite never
+            overwrites: rows are upserted into table ``data`` (``table=``)
+            keyed on ``symbol``/``date`` (``key=``), so re-ingesting a day
+            replaces its rows instead of duplicating them. A named index
+            level in the key (e.g. the ``date`` index of the history
+            fetchers) is written as a column; any other missing key column
+            raises ``ValueError``. Pass ``key=()`` for plain inserts.
         compression : str or None
             Compression codec (``'gzip'``, ``'bz2'``, ``'zip'``, ``'xz'``).
-            Not applicable to Excel or Feather.
+            Not applicable to Excel, Feather or SQLite.
         index : bool
             Whether to write the row index. Default ``False``.
+        compact : bool
+            Shrink dtypes with :func:`compact_dtypes` before writing. Parquet
+            and Feather store the compact types (prices as scaled integers);
+            other formats are written unchanged plus a
+            ``<file>.schema.json`` sidecar. Either way :meth:`from_file`
+            restores the values and compact types, and the bytes saved are
+            logged and kept in :attr:`compaction`. Default ``False``.
+        manifest : bool
+            Record the file's statistics in ``{path}/_manifest.json`` (see
+            :class:`~bdshare.util.manifest.Manifest`). Default ``False``.
         **kwargs
             Forwarded to the underlying pandas writer.
 
@@ -149,27 +564,95 @@ class Store:
         self._validate_format(fmt)
         self._validate_compression(compression)
 
-        try:
-            self.path.mkdir(parents=True, exist_ok=True)
-        except OSError as exc:
-            logger.error("Failed to create directory %s: %s", self.path, exc)
-            raise
+        self._ensure_dir()
+
+        path = self._save_file(fmt, compression, index, compact, **kwargs)
+        if manifest:
+            self._record([path], data=None if fmt == "sqlite" else self.data)
+        return path
+
+    def _save_file(
+        self,
+        fmt: str,
+        compression: Optional[str],
+        index: bool,
+        compact: bool,
+        **kwargs,
+    ) -> Path:
+        if not compact:
+            self._drop_sidecar(fmt)
+            return self._write(fmt, compression, index, None, **kwargs)
+
+        data, report = compact_dtypes(self.data, scale_floats=fmt in _ARROW_FORMATS)
+        self.compaction = report
+        logger.info("Compacted %s: %d -> %d bytes in memory (saved %d)",
+                    self.name, report.bytes_before, report.bytes_after, report.bytes_saved)
 
+        if fmt in _ARROW_FORMATS and not kwargs:
+            import pyarrow as pa
+            table = pa.Table.from_pandas(data, preserve_index=index)
+            table = table.replace_schema_metadata({
+                **(table.schema.metadata or {}),
+                _SPEC_KEY: json.dumps(report.spec).encode(),
+            })
+            return self._write(fmt, compression, index, table, **kwargs)
+        if fmt in _ARROW_FORMATS:
+            raise ValueError("compact=True cannot be combined with extra writer options.")
+
+        path = self._write(fmt, compression, index, None, **kwargs)
+        with _atomic(path.with_name(path.name + _SIDECAR_SUFFIX)) as tmp:
+            tmp.write_text(json.dumps(report.spec))
+        return path
+
+    def _drop_sidecar(self, fmt: str) -> None:
+        """Remove a compaction sidecar left by an earlier ``compact=True`` save."""
+        path = self._build_path(fmt)
+        path.with_name(path.name + _SIDECAR_SUFFIX).unlink(missing_ok=True)
+
+    def _write(
+        self,
+        fmt: str,
+        compression: Optional[str],
+        index: bool,
+        table: Any,
+        **kwargs,
+    ) -> Path:
+        """
+        Write one format, from the shared Arrow *table* when one is given.
+        The file is written under a temporary name and renamed into place.
+        """
         file_path = self._build_path(fmt)
+        if fmt == "sqlite":
+            frame, key = self._sqlite_frame(index, kwargs.pop("key", _SQLITE_KEY))
 
         try:
-            if fmt == "csv":
-                self.data.to_csv(file_path, index=index,
-                                 compression=compression, **kwargs)
-            elif fmt == "excel":
-                self.data.to_excel(file_path, index=index, **kwargs)
-            elif fmt == "parquet":
-                self.data.to_parquet(file_path, index=index,
-                                     compression=compression or "snappy", **kwargs)
-            elif fmt == "json":
-                self.data.to_json(file_path, **kwargs)
-            elif fmt == "feather":
-                self.data.to_feather(file_path, **kwargs)
+            if fmt == "sqlite":
+                # SQLite is transactional; rows are upserted in place.
+                self._write_sqlite(file_path, frame, key, **kwargs)
+                logger.info("Upserted %d rows into %s", len(self.data), file_path)
+                return file_path.resolve()
+
+            with _atomic(file_path) as tmp:
+                if table is not None and fmt == "parquet":
+                    import pyarrow.parquet as pq
+                    pq.write_table(table, tmp, compression=compression or "snappy")
+                elif table is not None and fmt == "feather":
+                    import pyarrow.feather as feather
+                    feather.write_feather(table, tmp, compression="uncompressed")
+                elif fmt == "csv":
+                    self.data.to_csv(tmp, index=index,
+                                     compression=compression, **kwargs)
+                elif fmt == "excel":
+                    self.data.to_excel(tmp, index=index, **kwargs)
+                elif fmt == "parquet":
+                    self.data.to_parquet(tmp, index=index,
+                                         compression=compression or "snappy", **kwargs)
+                elif fmt == "json":
+                    self.data.to_json(tmp, **kwargs)
+                elif fmt == "feather":
+                    # Uncompressed, so memory-mapped reads are zero-copy.
+                    kwargs.setdefault("compression", "uncompressed")
+                    self.data.to_feather(tmp, **kwargs)
 
             logger.info("Saved %d rows to %s", len(self.data), file_path)
             return file_path.resolve()
@@ -178,21 +661,122 @@ class Store:
             logger.error("Failed to save %s: %s", file_path, exc)
             raise IOError(f"Failed to save file: {exc}") from exc
 
+    def _sqlite_frame(self, index: bool, key: Sequence[str]) -> Tuple[pd.DataFrame, List[str]]:
+        """
+        The frame to upsert and its key columns. Named index levels that
+        are part of *key* become columns even with ``index=False``.
+
+        :raises ValueError: If a key column is still missing.
+        """
+        frame = self.data.reset_index() if index else self.data
+        key = [str(k) for k in key]
+        promote = [k for k in key if k not in frame.columns.astype(str) and k in frame.index.names]
+        if promote:
+            frame = frame.reset_index(level=promote)
+        missing = [k for k in key if k not in frame.columns.astype(str)]
+        if missing:
+            raise ValueError(
+                f"SQLite key column(s) {missing} not in the frame; pass key= with "
+                f"existing columns (or key=() for plain inserts)."
+            )
+        return frame, key
+
+    def _write_sqlite(
+        self,
+        file_path: Path,
+        frame: pd.DataFrame,
+        key: List[str],
+        table: str = _SQLITE_TABLE,
+        batch_size: int = _SQLITE_BATCH,
+    ) -> None:
+        """
+        Upsert *frame* into *table* with ``executemany`` in one
+        ``BEGIN IMMEDIATE`` transaction. Missing columns are added, a unique
+        index on the *key* columns makes re-ingested rows replace the old
+        ones, and ``date`` gets its own index for range scans.
+        """
+        cols = [str(c) for c in frame.columns]
+        qt = _quote(table)
+
+        with closing(sqlite3.connect(file_path, timeout=30, isolation_level=None)) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                existing = [row[1] for row in conn.execute(f"PRAGMA table_info({qt})")]
+                if not existing:
+                    conn.execute(f"CREATE TABLE {qt} (" + ", ".join(
+                        f"{_quote(c)} {_sqlite_type(frame[c])}" for c in frame.columns
+                    ) + ")")
+                for c in frame.columns:
+                    if existing and str(c) not in existing:
+                        conn.execute(f"ALTER TABLE {qt} ADD COLUMN {_quote(c)} {_sqlite_type(frame[c])}")
+                if key:
+                    conn.execute(
+                        f"CREATE UNIQUE INDEX IF NOT EXISTS {_quote(f'ux_{table}_' + '_'.join(key))} "
+                        f"ON {qt} ({', '.join(map(_quote, key))})"
+                    )
+                if "date" in cols and key != ["date"]:
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS {_quote(f'ix_{table}_date')} ON {qt} (\"date\")")
+
+                sql = (f"INSERT INTO {qt} ({', '.join(map(_quote, cols))}) "
+                       f"VALUES ({', '.join('?' * len(cols))})")
+                if key:
+                    updates = [c for c in cols if c not in key]
+                    sql += f" ON CONFLICT ({', '.join(map(_quote, key))}) DO " + (
+                        "UPDATE SET " + ", ".join(f"{_quote(c)} = excluded.{_quote(c)}" for c in updates)
+                        if updates else "NOTHING"
+                    )
+                for start in range(0, len(frame), batch_size):
+                    conn.executemany(sql, _sqlite_rows(frame.iloc[start:start + batch_size]))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _to_arrow(self, index: bool) -> Any:
+        """Convert the frame to a ``pyarrow.Table`` once, or None without pyarrow."""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            return None
+        return pa.Table.from_pandas(self.data, preserve_index=index)
+
     def save_multiple(
         self,
         formats: Optional[List[SupportedFormat]] = None,
         compression: CompressionOption = None,
+        index: bool = False,
+        parallel: bool = False,
+        executor: Literal["thread", "process"] = "thread",
+        max_workers: Optional[int] = None,
         **kwargs,
     ) -> List[Path]:
         """
         Save the DataFrame in multiple formats in one call.
 
+        When two or more Arrow-backed formats (Parquet, Feather) are
+        requested without extra writer options, the frame is converted to a
+        ``pyarrow.Table`` once and every such file is written from it.
+
         Parameters
         ----------
         formats : list of str, optional
             Formats to write. Defaults to ``['csv']``.
         compression : str or None
             Compression applied to every format that supports it.
+        index : bool
+            Whether to write the row index. Default ``False``.
+        parallel : bool
+            Write the formats concurrently. The pandas and pyarrow writers
+            release the GIL for most of their work, so total wall time is
+            close to that of the slowest format. Default ``False``.
+        executor : str
+            ``'thread'`` (default) or ``'process'``. A process pool copies
+            the frame into every worker and does not share the Arrow table;
+            use it only for GIL-bound writers such as Excel.
+        max_workers : int, optional
+            Pool size. Defaults to one worker per format.
         **kwargs
             Forwarded to each underlying pandas writer.
 
@@ -203,7 +787,321 @@ class Store:
         """
         if formats is None:
             formats = ["csv"]
-        return [self.save(fmt, compression, **kwargs) for fmt in formats]
+        formats = list(formats)
+        for fmt in formats:
+            self._validate_format(fmt)
+        self._validate_compression(compression)
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unsupported executor {executor!r}. Choose 'thread' or 'process'.")
+
+        self._ensure_dir()
+
+        workers = max_workers or len(formats)
+        if parallel and executor == "process" and len(formats) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(
+                    _save_in_worker,
+                    [self] * len(formats), formats,
+                    [compression] * len(formats), [index] * len(formats),
+                    [kwargs] * len(formats),
+                ))
+
+        table = None
+        if not kwargs and len(_ARROW_FORMATS.intersection(formats)) > 1:
+            table = self._to_arrow(index)
+
+        def write(fmt: str) -> Path:
+            shared = table if fmt in _ARROW_FORMATS else None
+            self._drop_sidecar(fmt)
+            return self._write(fmt, compression, index, shared, **kwargs)
+
+        if parallel and len(formats) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(write, formats))
+        return [write(fmt) for fmt in formats]
+
+    def append(
+        self,
+        fmt: Literal["parquet", "csv"] = "parquet",
+        partition_cols: Optional[List[str]] = None,
+        compression: CompressionOption = None,
+        index: bool = False,
+        manifest: bool = False,
+        **kwargs,
+    ) -> Path:
+        """
+        Append the DataFrame to an existing dataset without rewriting it.
+
+        ``'parquet'`` adds new ``part-*.parquet`` files under the dataset
+        directory ``{path}/{name}/``, optionally partitioned into
+        ``col=value`` sub-directories. ``year``, ``month`` and ``day``
+        partitions are derived from a ``date`` column when the frame has no
+        such column. ``'csv'`` appends rows to ``{name}.csv``, writing the
+        header only when the file is new. Either way the cost is
+        proportional to the new rows, not to the size of the dataset.
+
+        Parameters
+        ----------
+        fmt : str
+            ``'parquet'`` (default) or ``'csv'``.
+        partition_cols : list of str, optional
+            Parquet only — columns to partition by, e.g.
+            ``['symbol', 'year']``.
+        compression : str or None
+            Codec for the new data. Parquet defaults to snappy.
+        index : bool
+            Whether to write the row index. Default ``False``.
+        manifest : bool
+            Record the new part files (or the grown CSV) in
+            ``{path}/_manifest.json``. Default ``False``.
+        **kwargs
+            Forwarded to ``pandas.DataFrame.to_csv`` or
+            ``pyarrow.parquet.write_to_dataset``.
+
+        Returns
+        -------
+        Path
+            The dataset directory (Parquet) or the CSV file.
+
+        Examples
+        --------
+        Daily archiving::
+
+            Store(get_current_trade_data(), name="trades", path="archive").append(
+                partition_cols=["symbol"]
+            )
+        """
+        if fmt not in _APPEND_FORMATS:
+            raise ValueError(f"Cannot append to {fmt!r}. Choose from: {_APPEND_FORMATS}")
+        self._validate_compression(compression)
+        self._ensure_dir()
+
+        if fmt == "csv":
+            file_path = self._build_path("csv")
+            try:
+                self.data.to_csv(file_path, mode="a", header=not file_path.exists(),
+                                 index=index, compression=compression, **kwargs)
+            except Exception as exc:
+                logger.error("Failed to append to %s: %s", file_path, exc)
+                raise IOError(f"Failed to append to file: {exc}") from exc
+            logger.info("Appended %d rows to %s", len(self.data), file_path)
+            if manifest:
+                self._record([file_path], data=self.data, appended=True)
+            return file_path.resolve()
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        root = self.path / self.name
+        frame = self._with_partitions(partition_cols or [])
+        token = uuid.uuid4().hex
+        try:
+            pq.write_to_dataset(
+                pa.Table.from_pandas(frame, preserve_index=index),
+                root,
+                partition_cols=partition_cols or None,
+                basename_template=f"part-{token}-{{i}}.parquet",
+                compression=compression or "snappy",
+                **kwargs,
+            )
+        except Exception as exc:
+            logger.error("Failed to append to dataset %s: %s", root, exc)
+            raise IOError(f"Failed to append to dataset: {exc}") from exc
+        logger.info("Appended %d rows to dataset %s", len(frame), root)
+        if manifest:
+            self._record(sorted(root.rglob(f"part-{token}-*.parquet")))
+        return root.resolve()
+
+    def _record(
+        self,
+        paths: List[Path],
+        data: Optional[pd.DataFrame] = None,
+        appended: bool = False,
+        removed: Sequence[Path] = (),
+    ) -> None:
+        """Update ``{path}/_manifest.json`` for files just written or removed."""
+        from bdshare.util.manifest import Manifest
+
+        manifest = Manifest(self.path)
+        for p in removed:
+            manifest.remove(p)
+        for p in paths:
+            manifest.add(p, data=data, appended=appended)
+        manifest.save()
+
+    def _with_partitions(self, partition_cols: List[str]) -> pd.DataFrame:
+        """Add ``year``/``month``/``day`` partition columns derived from ``date``."""
+        derived = [c for c in partition_cols if c not in self.data.columns]
+        if not derived:
+            return self.data
+        unknown = [c for c in derived if c not in _DATE_PARTS or "date" not in self.data.columns]
+        if unknown:
+            raise ValueError(f"Partition columns not found in data: {unknown}")
+        dates = pd.to_datetime(self.data["date"])
+        return self.data.assign(**{c: getattr(dates.dt, _DATE_PARTS[c]) for c in derived})
+
+    def compact(self, min_files: int = 2) -> int:
+        """
+        Merge the part files of every partition of the Parquet dataset
+        written by :meth:`append` into a single file per partition.
+
+        The merged file is written under a temporary name and renamed into
+        place before the originals are removed, so readers never see a
+        partition with missing rows.
+
+        Parameters
+        ----------
+        min_files : int
+            Only partitions holding at least this many part files are
+            rewritten. Default ``2``.
+
+        Returns
+        -------
+        int
+            Number of part files merged away.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        root = self.path / self.name
+        if not root.is_dir():
+            raise FileNotFoundError(f"No dataset at {root}")
+
+        removed = 0
+        for leaf, _, files in os.walk(root):
+            parts = sorted(Path(leaf) / f for f in files
+                           if f.startswith("part-") and f.endswith(".parquet"))
+            if len(parts) < max(min_files, 2):
+                continue
+            merged = pa.concat_tables(
+                [pq.read_table(p) for p in parts], promote_options="default"
+            )
+            target = Path(leaf) / f"part-{uuid.uuid4().hex}-0.parquet"
+            tmp = target.with_name(f".{target.name}.tmp")
+            pq.write_table(merged, tmp)
+            os.replace(tmp, target)
+            for p in parts:
+                p.unlink()
+            if (self.path / _MANIFEST_NAME).exists():
+                self._record([target], removed=parts)
+            removed += len(parts) - 1
+            logger.info("Compacted %d part files in %s", len(parts), leaf)
+        return removed
+
+    @classmethod
+    def save_chunks(
+        cls,
+        chunks: Iterable[pd.DataFrame],
+        name: str,
+        path: Optional[Union[str, Path]] = None,
+        fmt: Literal["csv", "json", "parquet"] = "csv",
+        compression: CompressionOption = None,
+        index: bool = False,
+        **kwargs,
+    ) -> Path:
+        """
+        Stream an iterator of DataFrame chunks to one file, holding only one
+        chunk in memory at a time.
+
+        CSV gets a single header, ``'json'`` is written as JSON lines
+        (``{name}.jsonl``) and each chunk becomes one Parquet row group, all
+        with the schema of the first chunk. The file is renamed into place
+        only after the last chunk, so an interrupted export never leaves a
+        truncated file behind.
+
+        Parameters
+        ----------
+        chunks : iterable of pd.DataFrame
+            E.g. a generator over a chunked historical fetch.
+        name : str
+            Base filename without extension.
+        path : str or Path, optional
+            Output directory. Defaults to the current working directory.
+        fmt : str
+            ``'csv'`` (default), ``'json'`` or ``'parquet'``.
+        compression : str or None
+            ``'gzip'``, ``'bz2'`` or ``'xz'`` for CSV/JSON; the Parquet
+            codec otherwise (default snappy).
+        index : bool
+            Whether to write the row index (CSV and Parquet). Default ``False``.
+        **kwargs
+            Forwarded to ``to_csv`` / ``to_json`` or
+            ``pyarrow.parquet.ParquetWriter``.
+
+        Returns
+        -------
+        Path
+            Absolute path of the saved file.
+
+        Raises
+        ------
+        ValueError
+            If *fmt* or *compression* is not supported, or *chunks* is empty.
+        IOError
+            If the file cannot be written.
+        """
+        if fmt not in _STREAM_FORMATS:
+            raise ValueError(f"Cannot stream {fmt!r}. Choose from: {_STREAM_FORMATS}")
+        if fmt != "parquet" and compression not in _OPENERS:
+            raise ValueError(
+                f"Unsupported streaming compression {compression!r}. "
+                f"Choose from: {list(_OPENERS)}"
+            )
+
+        directory = Path(path) if path else Path.cwd()
+        directory.mkdir(parents=True, exist_ok=True)
+        file_path = directory / f"{name}.{_STREAM_EXT.get(fmt, fmt)}"
+
+        rows = 0
+        try:
+            with _atomic(file_path) as tmp:
+                if fmt == "parquet":
+                    rows = cls._stream_parquet(chunks, tmp, compression, index, **kwargs)
+                else:
+                    if fmt == "json":
+                        kwargs.setdefault("date_format", "iso")
+                    header = True
+                    with _OPENERS[compression](tmp, "wt", newline="") as fh:
+                        for chunk in chunks:
+                            if fmt == "csv":
+                                # Header once, even when leading chunks are empty.
+                                chunk.to_csv(fh, header=header, index=index, **kwargs)
+                                header = False
+                            elif len(chunk):
+                                chunk.to_json(fh, orient="records", lines=True, **kwargs)
+                            rows += len(chunk)
+                if not rows:
+                    raise ValueError("No rows to write.")
+        except ValueError:
+            raise
+        except Exception as exc:
+            logger.error("Failed to stream %s: %s", file_path, exc)
+            raise IOError(f"Failed to save file: {exc}") from exc
+
+        logger.info("Streamed %d rows to %s", rows, file_path)
+        return file_path.resolve()
+
+    @staticmethod
+    def _stream_parquet(chunks, tmp: Path, compression, index: bool, **kwargs) -> int:
+        """Write each chunk as one row group of a single Parquet file."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        rows, writer = 0, None
+        try:
+            for chunk in chunks:
+                if writer is None:
+                    table = pa.Table.from_pandas(chunk, preserve_index=index)
+                    writer = pq.ParquetWriter(tmp, table.schema,
+                                              compression=compression or "snappy", **kwargs)
+                else:
+                    table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=index)
+                writer.write_table(table)
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
 
     def get_file_size(self, fmt: SupportedFormat = "csv") -> int:
         """
@@ -226,13 +1124,25 @@ class Store:
         cls,
         file_path: Union[str, Path],
         fmt: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Filters] = None,
         **kwargs,
     ) -> "Store":
         """
         Create a Store instance by loading data from an existing file.
 
         The format is inferred from the file extension when *fmt* is not
-        supplied. ``xlsx`` and ``xls`` are treated as ``'excel'``.
+        supplied. ``xlsx`` and ``xls`` are treated as ``'excel'``, and a
+        directory is read as a dataset with :meth:`from_dataset`. Files
+        written with ``save(compact=True)`` come back with their original
+        values in the compact dtypes.
+
+        *columns* and *filters* are pushed down to the reader wherever the
+        format allows it: Parquet skips row groups and partitions whose
+        statistics rule the filter out, Feather is memory-mapped and only
+        the projected columns are touched (zero-copy for the uncompressed
+        files :meth:`save` writes), and CSV is scanned in chunks so
+        only matching rows are kept in memory.
 
         Parameters
         ----------
@@ -240,6 +1150,14 @@ class Store:
             Path to the file to load.
         fmt : str, optional
             Explicit format override.
+        columns : list of str, optional
+            Columns to load. Defaults to all.
+        filters : list, optional
+            Row filters as ``(column, op, value)`` tuples, ANDed together
+            (or a list of such lists, ORed), e.g.
+            ``[("symbol", "in", ["ACI", "GP"]), ("date", ">=", "2024-01-01")]``.
+            Operators: ``=``, ``==``, ``!=``, ``<``, ``<=``, ``>``, ``>=``,
+            ``in``, ``not in``.
         **kwargs
             Forwarded to the underlying pandas reader.
 
@@ -255,9 +1173,17 @@ class Store:
         """
         file_path = Path(file_path)
 
+        if file_path.is_dir():
+            return cls.from_dataset(file_path, fmt=fmt or "parquet",
+                                    columns=columns, filters=filters, **kwargs)
         if fmt is None:
             ext = file_path.suffix.lstrip(".").lower()
             fmt = "excel" if ext in {"xlsx", "xls"} else ext
+            if ext == "jsonl":
+                fmt = "json"
+                kwargs.setdefault("lines", True)
+            elif ext in _SQLITE_EXTS:
+                fmt = "sqlite"
 
         if fmt not in _FORMATS:
             raise ValueError(
@@ -266,21 +1192,262 @@ class Store:
             )
 
         readers = {
-            "csv":     pd.read_csv,
+            "csv":     cls._read_csv,
             "excel":   pd.read_excel,
-            "parquet": pd.read_parquet,
+            "parquet": cls._read_parquet,
             "json":    pd.read_json,
-            "feather": pd.read_feather,
+            "feather": cls._read_feather,
+            "sqlite":  cls._read_sqlite,
         }
+        pushdown = fmt in ("csv", "parquet", "feather", "sqlite")
 
         try:
-            data = readers[fmt](file_path, **kwargs)
+            spec = _read_spec(file_path, fmt)
+            if fmt in _ARROW_FORMATS:
+                data = readers[fmt](file_path, columns, _encode_filters(filters, spec), **kwargs)
+                if spec:
+                    data = restore_dtypes(data, spec)
+            elif pushdown and not spec:
+                data = readers[fmt](file_path, columns, filters, **kwargs)
+            else:
+                data = (readers[fmt](file_path, None, None, **kwargs) if pushdown
+                        else readers[fmt](file_path, **kwargs))
+                if spec:
+                    data = restore_dtypes(data, spec)
+                data = _select(_apply_filters(data, filters), columns)
             logger.info("Loaded %d rows from %s", len(data), file_path)
             return cls(data=data, name=file_path.stem, path=file_path.parent)
         except Exception as exc:
             logger.error("Failed to load %s: %s", file_path, exc)
             raise
 
+    @classmethod
+    def query(
+        cls,
+        file_path: Union[str, Path],
+        sql: Optional[str] = None,
+        params: Sequence[Any] = (),
+        table: str = _SQLITE_TABLE,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Filters] = None,
+        symbols: Optional[Sequence[str]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Query a SQLite file written by ``save("sqlite")``.
+
+        Either run raw *sql* with *params*, or let the helper build an
+        indexed lookup from *symbols* and an inclusive *start*/*end* date
+        range (``YYYY-MM-DD``) plus any extra *filters*.
+
+        Examples
+        --------
+        ::
+
+            Store.query("archive.sqlite", symbols=["ACI"],
+                        start="2023-05-04", end="2023-05-04", columns=["close"])
+            Store.query("archive.sqlite",
+                        "SELECT symbol, AVG(close) AS avg_close FROM data GROUP BY symbol")
+
+        Returns
+        -------
+        pd.DataFrame
+            Result rows.
+        """
+        if sql is None:
+            filters = list(_dnf(filters)) if filters else [[]]
+            extra = []
+            if symbols is not None:
+                extra.append(("symbol", "in", [str(x).upper() for x in symbols]))
+            if start is not None:
+                extra.append(("date", ">=", start))
+            if end is not None:
+                extra.append(("date", "<=", end))
+            filters = [group + extra for group in filters]
+
+            cols = ", ".join(map(_quote, columns)) if columns else "*"
+            sql = f"SELECT {cols} FROM {_quote(table)}"
+            params = []
+            if any(filters):
+                where, params = _filters_to_sql(filters)
+                sql += f" WHERE {where}"
+
+        with closing(sqlite3.connect(file_path, timeout=30)) as conn:
+            return pd.read_sql_query(sql, conn, params=list(params))
+
+    @classmethod
+    def _read_sqlite(cls, file_path: Path, columns, filters, table: str = _SQLITE_TABLE) -> pd.DataFrame:
+        return cls.query(file_path, table=table, columns=columns, filters=filters)
+
+    @classmethod
+    def from_manifest(
+        cls,
+        root: Union[str, Path],
+        symbols: Optional[Sequence[str]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Filters] = None,
+        refresh: bool = False,
+    ) -> "Store":
+        """
+        Load the rows for *symbols* between *start* and *end* (inclusive,
+        ``YYYY-MM-DD``) from an archive directory, opening only the files
+        whose manifest statistics can match.
+
+        Parameters
+        ----------
+        root : str or Path
+            Archive directory holding ``_manifest.json``.
+        symbols, start, end
+            Query; each is optional.
+        columns, filters
+            As for :meth:`from_file`, applied to every opened file.
+        refresh : bool
+            Re-index new or changed files first. Default ``False``.
+
+        Returns
+        -------
+        Store
+            New Store instance named after the archive directory.
+        """
+        from bdshare.util.manifest import Manifest
+
+        root = Path(root)
+        manifest = Manifest(root)
+        if refresh:
+            manifest.refresh()
+
+        extra = []
+        if symbols is not None:
+            extra.append(("symbol", "in", [str(x).upper() for x in symbols]))
+        if start is not None:
+            extra.append(("date", ">=", start))
+        if end is not None:
+            extra.append(("date", "<=", end))
+        groups = [group + extra for group in (_dnf(filters) if filters else [[]])]
+        query = groups if any(groups) else None
+
+        frames = []
+        for file_path in manifest.files(symbols, start, end):
+            entry = manifest.entries[manifest._key(file_path)]
+            if entry["partitions"]:
+                # Hive part files lack their partition columns; add them back
+                # before filtering in memory.
+                data = cls.from_file(file_path).data.assign(**entry["partitions"])
+                frames.append(_select(_apply_filters(data, query), columns))
+            else:
+                frames.append(cls.from_file(file_path, columns=columns, filters=query).data)
+
+        data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns or [])
+        logger.info("Loaded %d rows from %d of %d manifest files under %s",
+                    len(data), len(frames), len(manifest), root)
+        return cls(data=data, name=root.name, path=root.parent)
+
+    @classmethod
+    def from_dataset(
+        cls,
+        source: Union[str, Path, Iterable[Union[str, Path]]],
+        fmt: Literal["parquet", "feather"] = "parquet",
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Filters] = None,
+        **kwargs,
+    ) -> "Store":
+        """
+        Load a multi-file dataset — a directory written by :meth:`append`,
+        or an explicit list of files — as one frame.
+
+        Hive ``col=value`` directories become columns, and *filters* on
+        them prune whole partitions before any file is opened; filters on
+        other columns are checked against Parquet row-group statistics.
+
+        Parameters
+        ----------
+        source : str, Path or list of paths
+            Dataset directory or files.
+        fmt : str
+            ``'parquet'`` (default) or ``'feather'``.
+        columns, filters
+            As for :meth:`from_file`.
+        **kwargs
+            Forwarded to ``pyarrow.dataset.Dataset.to_table``.
+
+        Returns
+        -------
+        Store
+            New Store instance named after the dataset directory.
+        """
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        if fmt not in _ARROW_FORMATS:
+            raise ValueError(f"Unsupported dataset format {fmt!r}. Choose from: {sorted(_ARROW_FORMATS)}")
+
+        if isinstance(source, (str, Path)):
+            root, source = Path(source), str(source)
+        else:
+            source = [str(p) for p in source]
+            root = Path(source[0]).parent if source else Path.cwd()
+
+        try:
+            dataset = ds.dataset(source, format="ipc" if fmt == "feather" else fmt,
+                                 partitioning="hive")
+            table = dataset.to_table(
+                columns=list(columns) if columns is not None else None,
+                filter=pq.filters_to_expression(_cast_filters(filters, dataset.schema)) if filters else None,
+                **kwargs,
+            )
+            data = table.to_pandas()
+            logger.info("Loaded %d rows from dataset %s", len(data), root)
+            return cls(data=data, name=root.stem, path=root.parent)
+        except Exception as exc:
+            logger.error("Failed to load dataset %s: %s", root, exc)
+            raise
+
+    @staticmethod
+    def _read_parquet(file_path: Path, columns, filters, **kwargs) -> pd.DataFrame:
+        if filters:
+            import pyarrow.parquet as pq
+            filters = _cast_filters(filters, pq.read_schema(file_path))
+        return pd.read_parquet(file_path, columns=columns, filters=filters, **kwargs)
+
+    @staticmethod
+    def _read_feather(file_path: Path, columns, filters, memory_map: bool = True, **kwargs) -> pd.DataFrame:
+        """
+        Memory-mapped Arrow IPC read; only projected columns are paged in.
+        Zero-copy only for uncompressed files (as written by :meth:`save`);
+        compressed buffers are decompressed into memory.
+        """
+        import pyarrow.feather as feather
+        import pyarrow.parquet as pq
+
+        if filters:
+            needed = list(dict.fromkeys([*(columns or []), *_filter_columns(filters)]))
+            table = feather.read_table(file_path, columns=needed if columns else None,
+                                       memory_map=memory_map, **kwargs)
+            table = table.filter(pq.filters_to_expression(_cast_filters(filters, table.schema)))
+            if columns is not None:
+                table = table.select(list(columns))
+        else:
+            table = feather.read_table(file_path, columns=columns,
+                                       memory_map=memory_map, **kwargs)
+        return table.to_pandas()
+
+    @staticmethod
+    def _read_csv(file_path: Path, columns, filters, chunksize: int = 100_000, **kwargs) -> pd.DataFrame:
+        """Chunked scan keeping only the projected columns of matching rows."""
+        if not filters:
+            return pd.read_csv(file_path, usecols=columns, **kwargs)
+        usecols = None
+        if columns is not None:
+            usecols = list(dict.fromkeys([*columns, *_filter_columns(filters)]))
+        chunks = [
+            _select(_apply_filters(chunk, filters), columns)
+            for chunk in pd.read_csv(file_path, usecols=usecols, chunksize=chunksize, **kwargs)
+        ]
+        return pd.concat(chunks, ignore_index=True)
+
     # ------------------------------------------------------------------
     # Dunder helpers
     # ------------------------------------------------------------------
@@ -0,0 +1,87 @@
+# _*_ coding:utf-8 _*_
+'''
+Offline tests for the streaming day-end archive readers
+'''
+import io
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from bdshare import get_historical_data, iter_historical_chunks, iter_historical_rows
+from bdshare.stock import trading
+from bdshare.stock.trading import HistoricalRow
+from bdshare.util.helper import BDShareError, _parse_html
+
+
+def _archive_html(n):
+    rows = "".join(
+        f"<tr><td>{i + 1}</td><td>2024-05-{i % 28 + 1:02d}</td><td>SYM{i}</td>"
+        "<td>210.5</td><td>212</td><td>209</td><td>209.5</td><td>210</td><td>208</td>"
+        f"<td>1,200</td><td>25.3</td><td>{i * 10:,}</td></tr>"
+        for i in range(n)
+    )
+    return (
+        "<html><body><table class='table'><tr><td>nav</td></tr></table>"
+        f"<table class='{trading._CLS_FIXED}'><tr><th>#</th><th>DATE</th></tr>{rows}</table>"
+        "</body></html>"
+    ).encode()
+
+
+def _response(content):
+    r = mock.MagicMock()
+    r.raw = io.BytesIO(content)
+    r.__enter__.return_value = r
+    return r
+
+
+class TestArchiveStream(unittest.TestCase):
+    """
+    Test suite for iter_historical_rows / iter_historical_chunks
+    """
+
+    def _patch(self, content):
+        patcher = mock.patch.object(trading, "safe_get", return_value=_response(content))
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def test_rows_match_table_parser(self):
+        html = _archive_html(5)
+        get = self._patch(html)
+        rows = list(iter_historical_rows("2024-05-01", "2024-05-31", "ACI"))
+        self.assertTrue(get.call_args.kwargs["stream"])
+        self.assertEqual(get.call_args.kwargs["params"]["inst"], "ACI")
+
+        table = _parse_html(html).find("table", attrs={"class": trading._CLS_FIXED})
+        self.assertEqual([r._asdict() for r in rows], trading._parse_historical_rows(table))
+        self.assertIsInstance(rows[0], HistoricalRow)
+        self.assertEqual(rows[4].volume, 40)
+
+    def test_chunks_are_bounded(self):
+        self._patch(_archive_html(25))
+        chunks = list(iter_historical_chunks(chunk_rows=10))
+        self.assertEqual([len(c) for c in chunks], [10, 10, 5])
+        self.assertEqual(chunks[0].index.name, "date")
+        self.assertEqual(chunks[2]["symbol"].iloc[-1], "SYM24")
+
+    def test_chunks_schema_matches_historical_data(self):
+        html = _archive_html(3)
+        self._patch(html)
+        chunk = next(iter_historical_chunks())
+        with mock.patch.object(trading, "_fetch_table",
+                               return_value=_parse_html(html).find("table", attrs={"class": trading._CLS_FIXED})):
+            df = get_historical_data()
+        pd.testing.assert_frame_equal(chunk.sort_index(ascending=False), df)
+
+    def test_missing_table_raises(self):
+        self._patch(b"<html><body><p>maintenance</p></body></html>")
+        with self.assertRaises(BDShareError):
+            list(iter_historical_rows())
+
+    def test_invalid_chunk_rows(self):
+        with self.assertRaises(ValueError):
+            next(iter_historical_chunks(chunk_rows=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,357 @@
+# _*_ coding:utf-8 _*_
+'''
+Offline tests for the BDShare cache layer
+'''
+import os
+import time
+import tempfile
+import unittest
+import datetime as dt
+import multiprocessing
+from unittest import mock
+
+import pandas as pd
+
+import bdshare
+from bdshare import BDShare
+from bdshare.util.helper import BDShareError
+from bdshare.util import cache as cache_mod
+from bdshare.util.cache import _TTLCache, _MISSING, SQLiteCache, cached, configure_cache
+from bdshare.util.helper import _parse_html
+
+
+def _frame():
+    return pd.DataFrame({"symbol": ["ACI", "GP"], "ltp": [210.5, 300.1]})
+
+
+class TestTTLCache(unittest.TestCase):
+    """
+    Test suite for the in-process TTL cache
+    """
+
+    def test_miss_returns_sentinel(self):
+        cache = _TTLCache()
+        self.assertIs(cache.get("nope", _MISSING), _MISSING)
+        self.assertIsNone(cache.get("nope"))
+
+    def test_empty_frame_is_a_hit(self):
+        cache = _TTLCache()
+        cache.set("empty", pd.DataFrame())
+        hit = cache.get("empty", _MISSING)
+        self.assertIsNot(hit, _MISSING)
+        self.assertTrue(hit.empty)
+
+    def test_expired_entry_is_a_miss(self):
+        cache = _TTLCache()
+        cache.set("k", _frame(), ttl=-1)
+        self.assertIs(cache.get("k", _MISSING), _MISSING)
+        self.assertEqual(len(cache), 0)
+
+    def test_mutating_result_does_not_corrupt_cache(self):
+        cache = _TTLCache()
+        original = _frame()
+        cache.set("k", original)
+        original.loc[0, "ltp"] = -1.0
+
+        first = cache.get("k")
+        first.loc[0, "ltp"] = 0.0
+        first["extra"] = 1
+
+        second = cache.get("k")
+        self.assertEqual(second.loc[0, "ltp"], 210.5)
+        self.assertNotIn("extra", second.columns)
+
+    def test_stale_entry_within_grace(self):
+        cache = _TTLCache()
+        cache.set("k", _frame(), ttl=-1, stale_ttl=60)
+        self.assertIs(cache.get("k", _MISSING), _MISSING)
+        value, fresh = cache.get_entry("k")
+        self.assertFalse(fresh)
+        self.assertEqual(len(value), 2)
+        cache.set("gone", _frame(), ttl=-2, stale_ttl=1)
+        self.assertIsNone(cache.get_entry("gone"))
+
+    def test_list_of_frames_is_snapshotted(self):
+        cache = _TTLCache()
+        cache.set("k", [_frame(), _frame()])
+        hit = cache.get("k")
+        hit[0].loc[0, "ltp"] = 0.0
+        self.assertEqual(cache.get("k")[0].loc[0, "ltp"], 210.5)
+
+
+def _write_from_child(path, key):
+    SQLiteCache(path).set(key, _frame(), ttl=60)
+
+
+class TestSQLiteCache(unittest.TestCase):
+    """
+    Test suite for the persistent SQLite cache backend
+    """
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "cache.sqlite3")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip_and_miss(self):
+        cache = SQLiteCache(self.path)
+        self.assertIs(cache.get("k", _MISSING), _MISSING)
+        cache.set("k", _frame())
+        pd.testing.assert_frame_equal(cache.get("k"), _frame())
+        self.assertEqual(len(cache), 1)
+
+    def test_expired_entry_is_a_miss(self):
+        cache = SQLiteCache(self.path)
+        cache.set("k", _frame(), ttl=-1)
+        self.assertIs(cache.get("k", _MISSING), _MISSING)
+
+    def test_shared_between_processes(self):
+        proc = multiprocessing.get_context("spawn").Process(
+            target=_write_from_child, args=(self.path, "child")
+        )
+        proc.start()
+        proc.join(30)
+        self.assertEqual(proc.exitcode, 0)
+        pd.testing.assert_frame_equal(SQLiteCache(self.path).get("child"), _frame())
+
+    def test_stale_entry_within_grace(self):
+        cache = SQLiteCache(self.path)
+        cache.set("k", _frame(), ttl=-1, stale_ttl=60)
+        self.assertIsNone(cache.get("k"))
+        value, fresh = cache.get_entry("k")
+        self.assertFalse(fresh)
+        pd.testing.assert_frame_equal(value, _frame())
+
+    def test_size_limit_evicts_soonest_to_expire(self):
+        cache = SQLiteCache(self.path, max_bytes=4000)
+        cache.set("short", "x" * 1500, ttl=10)
+        cache.set("long", "y" * 1500, ttl=1000)
+        cache.set("new", "z" * 1500, ttl=100)
+        self.assertIsNone(cache.get("short"))
+        self.assertIsNotNone(cache.get("long"))
+        self.assertIsNotNone(cache.get("new"))
+
+    def test_client_accepts_backend(self):
+        cache = SQLiteCache(self.path)
+        with mock.patch.object(bdshare, "get_market_info", return_value=_frame()) as fetch:
+            BDShare(cache_backend=cache).get_market_summary()
+            BDShare(cache_backend=cache).get_market_summary()
+        self.assertEqual(fetch.call_count, 1)
+
+    def test_exit_leaves_shared_backend_intact(self):
+        cache = SQLiteCache(self.path)
+        with mock.patch.object(bdshare, "get_market_info", return_value=_frame()):
+            with BDShare(cache_backend=cache) as bd:
+                bd.get_market_summary()
+        self.assertEqual(len(cache), 1)
+
+        with mock.patch.object(bdshare, "get_market_info", return_value=_frame()):
+            with BDShare() as bd:
+                bd.get_market_summary()
+        self.assertEqual(len(bd._store), 0)
+
+
+class TestClientCache(unittest.TestCase):
+    """
+    Test suite for BDShare getter cache hits
+    """
+
+    def test_dataframe_result_is_served_from_cache(self):
+        with mock.patch.object(bdshare, "get_market_info", return_value=_frame()) as fetch:
+            bd = BDShare()
+            first = bd.get_market_summary()
+            second = bd.get_market_summary()
+        self.assertEqual(fetch.call_count, 1)
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_use_cache_false_refetches(self):
+        with mock.patch.object(bdshare, "get_latest_pe", return_value=_frame()) as fetch:
+            bd = BDShare()
+            bd.get_latest_pe_ratios()
+            bd.get_latest_pe_ratios(use_cache=False)
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_cache_disabled_always_fetches(self):
+        with mock.patch.object(bdshare, "get_sector_performance", return_value=_frame()) as fetch:
+            bd = BDShare(cache_enabled=False)
+            bd.get_sector_performance()
+            bd.get_sector_performance()
+        self.assertEqual(fetch.call_count, 2)
+
+
+class TestStaleServing(unittest.TestCase):
+    """
+    Test suite for serve-stale-on-error and stale-while-revalidate
+    """
+
+    def _expire(self, bd, key):
+        value, _ = bd._store.get_entry(key)
+        bd._store.set(key, value, ttl=-1, stale_ttl=bd.max_stale)
+
+    def test_serves_stale_on_upstream_error(self):
+        bd = BDShare(max_stale=60)
+        with mock.patch.object(bdshare, "get_market_info", return_value=_frame()):
+            bd.get_market_summary()
+        self._expire(bd, "market_summary")
+        with mock.patch.object(bdshare, "get_market_info", side_effect=BDShareError("down")):
+            df = bd.get_market_summary()
+        pd.testing.assert_frame_equal(df, _frame())
+
+    def test_error_propagates_without_stale_value(self):
+        bd = BDShare(max_stale=60)
+        with mock.patch.object(bdshare, "get_market_info", side_effect=BDShareError("down")):
+            with self.assertRaises(BDShareError):
+                bd.get_market_summary()
+
+    def test_stale_while_revalidate_refreshes_in_background(self):
+        bd = BDShare(max_stale=60, stale_while_revalidate=True)
+        with mock.patch.object(bdshare, "get_market_info", return_value=_frame()):
+            bd.get_market_summary()
+        self._expire(bd, "market_summary")
+
+        newer = _frame().assign(ltp=[1.0, 2.0])
+        with mock.patch.object(bdshare, "get_market_info", return_value=newer) as fetch:
+            stale = bd.get_market_summary()
+            deadline = time.monotonic() + 5
+            while bd._refreshing and time.monotonic() < deadline:
+                time.sleep(0.01)
+        pd.testing.assert_frame_equal(stale, _frame())
+        self.assertEqual(fetch.call_count, 1)
+        pd.testing.assert_frame_equal(bd.get_market_summary(), newer)
+
+
+class TestWarm(unittest.TestCase):
+    """
+    Test suite for BDShare.warm() and the prefetch scheduler
+    """
+
+    def test_warm_fills_cache_concurrently(self):
+        patches = {
+            name: mock.patch.object(bdshare, name, return_value=_frame())
+            for name in ("get_current_trading_code", "get_latest_pe",
+                         "get_sector_performance", "get_current_trade_data")
+        }
+        fetches = {name: p.start() for name, p in patches.items()}
+        self.addCleanup(mock.patch.stopall)
+
+        bd = BDShare()
+        self.assertEqual(bd.warm(), {})
+        bd.get_trading_codes()
+        bd.get_latest_pe_ratios()
+        bd.get_current_trades()
+        for fetch in fetches.values():
+            self.assertEqual(fetch.call_count, 1)
+
+    def test_warm_reports_failures(self):
+        with mock.patch.object(bdshare, "get_market_info", side_effect=BDShareError("down")):
+            errors = BDShare().warm(["market_summary"])
+        self.assertIsInstance(errors["market_summary"], BDShareError)
+
+    def test_warm_rejects_unknown_endpoint(self):
+        with self.assertRaises(ValueError):
+            BDShare().warm(["nope"])
+
+    def test_prefetch_refreshes_before_expiry(self):
+        bd = BDShare()
+        bd._TTL = dict(BDShare._TTL, market_summary=1)
+        with mock.patch.object(bdshare, "get_market_info", return_value=_frame()) as fetch:
+            bd.start_prefetch(["market_summary"])
+            deadline = time.monotonic() + 5
+            while fetch.call_count < 2 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            bd.stop_prefetch(timeout=5)
+        self.assertGreaterEqual(fetch.call_count, 2)
+        self.assertIsNone(bd._prefetch_thread)
+
+
+_TRADE_HTML = """
+<table class="table table-bordered background-white shares-table fixedHeader">
+<tr><th>#</th></tr>
+<tr><td>1</td><td>ACI</td><td>210.5</td><td>212</td><td>209</td><td>210</td>
+<td>208</td><td>2.5</td><td>1,200</td><td>35.2</td><td>160,000</td></tr>
+<tr><td>2</td><td>GP</td><td>300.1</td><td>301</td><td>298</td><td>300</td>
+<td>299</td><td>1.1</td><td>900</td><td>20.4</td><td>70,000</td></tr>
+</table>
+"""
+
+
+class TestFunctionalCache(unittest.TestCase):
+    """
+    Test suite for the opt-in functional API caching layer
+    """
+
+    def setUp(self):
+        self._settings = {"enabled": cache_mod._settings["enabled"],
+                          "ttl": dict(cache_mod._settings["ttl"])}
+        cache_mod.set_cache_backend(None)
+
+    def tearDown(self):
+        cache_mod._settings.update(self._settings)
+        cache_mod.set_cache_backend(None)
+
+    def test_disabled_by_default(self):
+        calls = []
+
+        @cached(ttl=60)
+        def fetch(symbol=None):
+            calls.append(symbol)
+            return _frame()
+
+        fetch("ACI")
+        fetch("ACI")
+        self.assertEqual(len(calls), 2)
+
+    def test_keys_are_normalised(self):
+        calls = []
+
+        @cached(ttl=60)
+        def fetch(start=None, end=None, code="All Instrument", retry_count=3, pause=0.2):
+            calls.append(code)
+            return _frame()
+
+        configure_cache(enabled=True)
+        fetch("2024-01-01", dt.date(2024, 1, 31), "aci")
+        fetch(dt.datetime(2024, 1, 1, 9, 30), "2024-01-31", code=" ACI ", retry_count=5)
+        self.assertEqual(len(calls), 1)
+
+    def test_ttl_zero_disables_endpoint(self):
+        calls = []
+
+        @cached(ttl=60)
+        def fetch():
+            calls.append(1)
+            return _frame()
+
+        configure_cache(enabled=True, ttl={"fetch": 0})
+        fetch()
+        fetch()
+        self.assertEqual(len(calls), 2)
+
+    def test_public_function_is_cached_and_clearable(self):
+        table = _parse_html(_TRADE_HTML.encode()).find("table")
+        configure_cache(enabled=True)
+        with mock.patch("bdshare.stock.trading._fetch_table", return_value=table) as fetch:
+            first = bdshare.get_current_trade_data("aci")
+            second = bdshare.get_current_trade_data("ACI")
+            bdshare.clear_cache()
+            bdshare.get_current_trade_data("ACI")
+        self.assertEqual(fetch.call_count, 2)
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(first.iloc[0]["ltp"], 210.5)
+
+    def test_client_refresh_bypasses_functional_cache(self):
+        table = _parse_html(_TRADE_HTML.encode()).find("table")
+        configure_cache(enabled=True)
+        with mock.patch("bdshare.stock.trading._fetch_table", return_value=table) as fetch:
+            bdshare.get_current_trade_data()          # primes the functional cache
+            bd = BDShare()
+            bd.get_current_trades()
+            bd.get_current_trades(use_cache=False)
+            bd.warm(["current_trades"])
+        self.assertEqual(fetch.call_count, 4)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
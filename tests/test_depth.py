@@ -0,0 +1,183 @@
+# _*_ coding:utf-8 _*_
+'''
+Offline tests for BDShare market depth helpers
+'''
+import time
+import unittest
+import warnings
+from unittest import mock
+
+import pandas as pd
+
+import numpy as np
+
+from bdshare import OrderBookStore, depth_levels, get_market_depth_data, get_market_depth_many
+from bdshare.stock import market
+from bdshare.util.helper import BDShareError
+
+
+def _depth_html(buys, sells):
+    def side(levels):
+        rows = "".join(f"<tr><td>{p}</td><td>{v}</td></tr>" for p, v in levels)
+        return f"<td valign='top'><table><tr><th>x</th></tr><tr><th>y</th></tr>{rows}</table></td>"
+    return (
+        "<html><body><table class='table table-stripped'><tr>"
+        f"{side(buys)}{side(sells)}"
+        "</tr></table></body></html>"
+    ).encode()
+
+
+_BOOKS = {
+    "ACI": _depth_html([(210.0, 500), (209.9, 1200)], [(210.2, 300)]),
+    "GP":  _depth_html([(300.0, 100)], [(300.5, 250), (300.6, 900)]),
+}
+
+
+def _post(url, data=None, **kwargs):
+    symbol = data["inst"]
+    if symbol not in _BOOKS:
+        raise BDShareError(f"boom {symbol}")
+    return mock.Mock(content=_BOOKS[symbol])
+
+
+class TestMarketDepth(unittest.TestCase):
+    """
+    Test suite for the primed-session market depth fetchers
+    """
+
+    def setUp(self):
+        market._depth_primed_until = 0.0
+        self.head = mock.patch.object(market._session, "head").start()
+        self.post = mock.patch.object(market, "safe_post", side_effect=_post).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_single_symbol_parses_both_sides(self):
+        df = get_market_depth_data("ACI")
+        self.assertEqual(df["buy_price"].dropna().tolist(), [210.0, 209.9])
+        self.assertEqual(df["sell_volume"].dropna().tolist(), [300])
+
+    def test_session_primed_once_and_headers_per_request(self):
+        get_market_depth_data("ACI")
+        get_market_depth_data("GP")
+        self.assertEqual(self.head.call_count, 1)
+        self.assertEqual(
+            self.post.call_args.kwargs["headers"]["X-Requested-With"], "XMLHttpRequest"
+        )
+        self.assertNotIn("X-Requested-With", market._session.headers)
+
+    def test_reprimes_after_expiry(self):
+        get_market_depth_data("ACI")
+        market._depth_primed_until = 0.0
+        get_market_depth_data("ACI")
+        self.assertEqual(self.head.call_count, 2)
+
+    def test_many_combines_by_symbol_and_skips_failures(self):
+        df = get_market_depth_many(["aci", "GP", "NOPE", "ACI"], max_workers=3)
+        self.assertEqual(df.index.names, ["symbol", "level"])
+        self.assertEqual(list(df.index.unique("symbol")), ["ACI", "GP"])
+        self.assertEqual(df.loc["GP"]["sell_price"].dropna().tolist(), [300.5, 300.6])
+        self.assertEqual(self.head.call_count, 1)
+
+    def test_many_aligns_rows_by_price_level(self):
+        df = get_market_depth_many(["ACI", "GP"])
+        aci, gp = df.loc["ACI"], df.loc["GP"]
+        self.assertEqual(aci.loc[0, ["buy_price", "sell_price"]].tolist(), [210.0, 210.2])
+        self.assertEqual(aci.loc[1, "buy_price"], 209.9)
+        self.assertTrue(np.isnan(aci.loc[1, "sell_price"]))
+        self.assertTrue(np.isnan(gp.loc[1, "buy_price"]))
+        self.assertEqual(gp.loc[1, "sell_price"], 300.6)
+        self.assertEqual(len(df), 4)
+
+    def test_prime_expiry_ignores_stale_and_foreign_cookies(self):
+        from requests.cookies import create_cookie
+
+        now = time.time()
+        cookies = [
+            create_cookie("old", "1", domain=".dsebd.org", expires=int(now - 60)),
+            create_cookie("ads", "1", domain="example.com", expires=int(now + 30)),
+            create_cookie("PHPSESSID", "1", domain="dsebd.org", expires=int(now + 300)),
+        ]
+        for cookie in cookies:
+            market._session.cookies.set_cookie(cookie)
+        self.addCleanup(lambda: [market._session.cookies.clear(c.domain, c.path, c.name)
+                                 for c in cookies])
+        market._prime_depth_session()
+        self.assertAlmostEqual(market._depth_primed_until, now + 300, delta=2)
+
+    def test_many_raises_when_nothing_fetched(self):
+        with self.assertRaises(BDShareError):
+            get_market_depth_many(["NOPE"])
+
+
+
+def _depth_frame(buys, sells):
+    rows = [{"buy_price": p, "buy_volume": v} for p, v in buys]
+    rows += [{"sell_price": p, "sell_volume": v} for p, v in sells]
+    return pd.DataFrame(rows)
+
+
+class TestOrderBookStore(unittest.TestCase):
+    """
+    Test suite for the aligned order-book store
+    """
+
+    def test_depth_levels_aligns_and_pads(self):
+        bid_px, bid_vol, ask_px, ask_vol = depth_levels(
+            _depth_frame([(9.9, 10), (10.0, 20)], [(10.2, 5), (10.1, 7)]), levels=3
+        )
+        np.testing.assert_array_equal(bid_px[:2], [10.0, 9.9])
+        np.testing.assert_array_equal(bid_vol, [20, 10, 0])
+        np.testing.assert_array_equal(ask_px[:2], [10.1, 10.2])
+        self.assertTrue(np.isnan(ask_px[2]))
+
+    def test_update_diffs_by_price_level(self):
+        books = OrderBookStore(levels=3)
+        first = books.update("aci", _depth_frame([(10.0, 20)], [(10.1, 7)]))
+        self.assertEqual(len(first), 2)
+
+        diff = books.update("ACI", _depth_frame([(10.0, 25), (9.9, 4)], [(10.2, 3)]))
+        got = {(r.side, r.price): (r.volume, r.volume_delta) for r in diff.itertuples()}
+        self.assertEqual(got, {
+            ("bid", 10.0): (25, 5),
+            ("bid", 9.9):  (4, 4),
+            ("ask", 10.1): (0, -7),
+            ("ask", 10.2): (3, 3),
+        })
+        self.assertTrue(books.update("ACI", _depth_frame([(10.0, 25), (9.9, 4)], [(10.2, 3)])).empty)
+
+    def test_aware_timestamps_stored_as_utc(self):
+        books = OrderBookStore()
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            books.update("ACI", _depth_frame([(10.0, 1)], []), pd.Timestamp("2024-05-05 10:30", tz="Asia/Dhaka"))
+        self.assertEqual(books.metrics().loc["ACI", "timestamp"], pd.Timestamp("2024-05-05 04:30"))
+
+    def test_metrics_vectorised_across_symbols(self):
+        books = OrderBookStore(levels=2)
+        books.update("ACI", _depth_frame([(10.0, 30), (9.9, 10)], [(10.2, 10), (10.3, 10)]))
+        books.update("GP", _depth_frame([], [(300.0, 5)]))
+        m = books.metrics(top=2)
+
+        aci = m.loc["ACI"]
+        self.assertAlmostEqual(aci["spread"], 0.2)
+        self.assertAlmostEqual(aci["mid"], 10.1)
+        self.assertAlmostEqual(aci["imbalance"], (40 - 20) / 60)
+        self.assertAlmostEqual(aci["microprice"], (10.0 * 10 + 10.2 * 30) / 40)
+        self.assertAlmostEqual(aci["depth_wprice"], (300 + 99 + 102 + 103) / 60)
+        self.assertTrue(np.isnan(m.loc["GP", "spread"]))
+        self.assertEqual(m.loc["GP", "imbalance"], -1.0)
+
+    def test_update_many_from_combined_frame(self):
+        combined = pd.concat(
+            {"ACI": _depth_frame([(10.0, 1)], []), "GP": _depth_frame([], [(300.0, 2)])},
+            names=["symbol", "level"],
+        )
+        books = OrderBookStore()
+        diff = books.update_many(combined)
+        self.assertEqual(sorted(diff["symbol"]), ["ACI", "GP"])
+        self.assertEqual(books.symbols, ["ACI", "GP"])
+        self.assertFalse(books.arrays()["bid_price"].flags.writeable)
+
+
+if __name__ == '__main__':
+    unittest.main()
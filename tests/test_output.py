@@ -0,0 +1,184 @@
+# _*_ coding:utf-8 _*_
+'''
+Offline tests for the Arrow / Polars output modes and raw NumPy records
+'''
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # output='arrow' needs the optional extra
+    pa = None
+
+import bdshare
+from bdshare import (
+    BDShare,
+    get_basic_historical_data,
+    get_current_trade_data,
+    get_historical_data,
+    get_market_depth_many,
+    get_news,
+    get_output,
+    set_output,
+)
+from bdshare.stock import market, news, trading
+from bdshare.util.cache import configure_cache
+from bdshare.util.helper import BDShareError, _parse_html
+
+
+def _table(rows):
+    body = "".join("<tr>" + "".join(f"<td>{c}</td>" for c in row) + "</tr>" for row in rows)
+    return _parse_html(f"<table><tr><th>h</th></tr>{body}</table>".encode()).find("table")
+
+
+_TRADES = _table([
+    [1, "ACI", "210.5", "212", "209", "210", "208", "2.5", "1,200", "25.3", "120,000"],
+    [2, "GP", "300", "301", "299", "300", "300", "0", "800", "40.1", "90,000"],
+])
+
+_ARCHIVE = _table([
+    [1, "2024-05-01", "ACI", "210", "212", "209", "209.5", "210", "208", "1200", "25.3", "120000"],
+    [2, "2024-05-03", "ACI", "214", "215", "211", "211", "214", "210", "1300", "27.0", "130000"],
+    [3, "2024-05-02", "ACI", "210", "211", "208", "210", "210", "210", "1100", "23.1", "110000"],
+])
+
+
+@unittest.skipUnless(pa, "pyarrow is not installed")
+class TestOutputModes(unittest.TestCase):
+    """
+    Test suite for output='arrow' / 'polars' on the fetchers
+    """
+
+    def tearDown(self):
+        set_output("pandas")
+        configure_cache(enabled=False)
+
+    def test_trade_data_as_arrow(self):
+        with mock.patch.object(trading, "_fetch_table", return_value=_TRADES):
+            table = get_current_trade_data(output="arrow")
+        self.assertIsInstance(table, pa.Table)
+        self.assertEqual(table.column_names[:3], ["symbol", "ltp", "high"])
+        self.assertEqual(table.column("volume").to_pylist(), [120000, 90000])
+        self.assertEqual(table.schema.field("ltp").type, pa.float64())
+
+    def test_arrow_symbol_filter_matches_pandas(self):
+        with mock.patch.object(trading, "_fetch_table", return_value=_TRADES):
+            table = get_current_trade_data("gp", output="arrow")
+            self.assertEqual(table.column("symbol").to_pylist(), ["GP"])
+            with self.assertRaises(BDShareError):
+                get_current_trade_data("XYZ", output="arrow")
+
+    def test_historical_order_matches_pandas(self):
+        with mock.patch.object(trading, "_fetch_table", return_value=_ARCHIVE):
+            df = get_historical_data(code="ACI")
+            table = get_historical_data(code="ACI", output="arrow")
+        pd.testing.assert_frame_equal(
+            table.to_pandas().set_index("date"), df, check_dtype=False,
+        )
+
+    def test_global_default_and_cache_key(self):
+        configure_cache(enabled=True)
+        bdshare.clear_cache()
+        with mock.patch.object(trading, "_fetch_table", return_value=_TRADES) as fetch:
+            self.assertIsInstance(get_current_trade_data(), pd.DataFrame)
+            set_output("arrow")
+            self.assertEqual(get_output(), "arrow")
+            self.assertIsInstance(get_current_trade_data(), pa.Table)
+            self.assertIsInstance(get_current_trade_data(output="arrow"), pa.Table)
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_news_and_depth_as_arrow(self):
+        page = _parse_html(
+            b"<table class='table-news'><tr><th>h</th></tr>"
+            b"<tr><td>ACI</td><td>Dividend</td><td>2024-05-01</td></tr></table>"
+        )
+        with mock.patch.object(news, "_post_news", return_value=page):
+            table = get_news("psn", output="arrow")
+        self.assertEqual(table.column_names, ["code", "news", "date"])
+
+        html = (
+            "<table class='table table-stripped'><tr>"
+            "<td valign='top'><table><tr><th>x</th></tr><tr><th>y</th></tr>"
+            "<tr><td>210</td><td>500</td></tr></table></td></tr></table>"
+        ).encode()
+        market._depth_primed_until = 0.0
+        with mock.patch.object(market._session, "head"), \
+                mock.patch.object(market, "safe_post", return_value=mock.Mock(content=html)):
+            table = get_market_depth_many(["ACI", "GP"], output="arrow")
+        self.assertEqual(table.column_names[:2], ["symbol", "level"])
+        self.assertEqual(table.column("symbol").to_pylist(), ["ACI", "GP"])
+
+    def test_polars_missing_dependency_hint(self):
+        with mock.patch.dict(sys.modules, {"polars": None}), \
+                mock.patch.object(trading, "_fetch_table", return_value=_TRADES):
+            with self.assertRaisesRegex(ImportError, "pip install polars"):
+                get_current_trade_data(output="polars")
+
+    def test_invalid_output(self):
+        with self.assertRaises(ValueError):
+            set_output("numpy")
+
+    def test_client_output(self):
+        with mock.patch.object(bdshare, "get_market_info", return_value=pa.table({"a": [1]})) as fetch:
+            bd = BDShare(output="arrow")
+            bd.get_market_summary()
+            bd.get_market_summary()
+        fetch.assert_called_once_with(output="arrow")
+        self.assertIn("market_summary@arrow", bd._store._store)
+
+
+class TestRawRecords(unittest.TestCase):
+    """
+    Test suite for raw=True structured-array results
+    """
+
+    def tearDown(self):
+        configure_cache(enabled=False)
+
+    def test_trade_records(self):
+        with mock.patch.object(trading, "_fetch_table", return_value=_TRADES):
+            records = get_current_trade_data(raw=True)
+            df = get_current_trade_data()
+        self.assertEqual(records.dtype, trading.TRADE_DTYPE)
+        self.assertEqual(records["symbol"].tolist(), df["symbol"].tolist())
+        np.testing.assert_array_equal(records["ltp"], df["ltp"].to_numpy())
+        self.assertEqual(records["volume"].tolist(), [120000, 90000])
+
+    def test_trade_records_symbol_filter(self):
+        with mock.patch.object(trading, "_fetch_table", return_value=_TRADES):
+            self.assertEqual(get_current_trade_data("aci", raw=True)["symbol"].tolist(), ["ACI"])
+            with self.assertRaises(BDShareError):
+                get_current_trade_data("XYZ", raw=True)
+
+    def test_missing_values(self):
+        table = _table([[1, "ACI", "--", "212", "209", "210", "208", "2.5", "", "25.3", "-"]])
+        with mock.patch.object(trading, "_fetch_table", return_value=table):
+            record = get_current_trade_data(raw=True)[0]
+        self.assertTrue(np.isnan(record["ltp"]))
+        self.assertEqual((record["trade"], record["volume"]), (0, 0))
+
+    def test_basic_records_sorted_by_date(self):
+        with mock.patch.object(trading, "_fetch_table", return_value=_ARCHIVE):
+            records = get_basic_historical_data(code="ACI", raw=True)
+        self.assertEqual(records.dtype, trading.BASIC_HISTORICAL_DTYPE)
+        self.assertEqual(records["date"].astype(str).tolist(),
+                         ["2024-05-01", "2024-05-02", "2024-05-03"])
+        self.assertEqual(records["close"].tolist(), [210.0, 210.0, 214.0])
+        self.assertEqual(records["volume"].tolist(), [120000, 110000, 130000])
+
+    def test_cached_records_are_copies(self):
+        configure_cache(enabled=True)
+        bdshare.clear_cache()
+        with mock.patch.object(trading, "_fetch_table", return_value=_TRADES):
+            first = get_current_trade_data(raw=True)
+            first["ltp"] = 0
+            second = get_current_trade_data(raw=True)
+        self.assertEqual(second["ltp"].tolist(), [210.5, 300.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
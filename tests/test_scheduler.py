@@ -0,0 +1,126 @@
+# _*_ coding:utf-8 _*_
+'''
+Offline tests for the BDShare adaptive polling scheduler
+'''
+import unittest
+from unittest import mock
+from datetime import datetime
+
+import pandas as pd
+
+from bdshare import AdaptivePoller
+from bdshare.stock import trading
+from bdshare.util.cache import clear_cache, configure_cache
+from bdshare.util.helper import BDShareError, _parse_html
+from bdshare.util.market_hours import DSE_TZ
+
+_MIDDAY = datetime(2024, 5, 5, 12, 0, tzinfo=DSE_TZ)   # Sunday, mid-session
+_OPENING = datetime(2024, 5, 5, 10, 5, tzinfo=DSE_TZ)
+
+
+class _Feed:
+    def __init__(self, *values):
+        self.values, self.calls = list(values), 0
+
+    def __call__(self):
+        self.calls += 1
+        value = self.values[min(self.calls, len(self.values)) - 1]
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+def _frame(ltp):
+    return pd.DataFrame({"symbol": ["ACI"], "ltp": [ltp]})
+
+
+def _trade_table(ltp):
+    """The live trade table as scraped, with one ACI row."""
+    cells = [1, "ACI", ltp, "212", "209", "210", "208", "2.5", "1,200", "25.3", "120,000"]
+    row = "<tr>" + "".join(f"<td>{c}</td>" for c in cells) + "</tr>"
+    return _parse_html(f"<table><tr><th>h</th></tr>{row}</table>".encode()).find("table")
+
+
+class TestAdaptivePoller(unittest.TestCase):
+    """
+    Test suite for the market-hours-aware adaptive poller
+    """
+
+    def setUp(self):
+        patcher = mock.patch("bdshare.stock.scheduler.dse_now", return_value=_MIDDAY)
+        patcher.start()
+        self.addCleanup(mock.patch.stopall)
+
+    def _poll(self, poller, times):
+        for _ in range(times):
+            for job in poller.jobs.values():
+                job.next_due = 0
+            poller.run_pending()
+
+    def test_backs_off_while_unchanged(self):
+        poller = AdaptivePoller(backoff=2.0)
+        job = poller.add("trades", _Feed(_frame(1.0)), min_interval=5, max_interval=30)
+        self._poll(poller, 5)
+        self.assertEqual(job.interval, 30)
+        self.assertEqual(job.changes, 1)
+
+    def test_change_resets_to_min_and_notifies(self):
+        seen = []
+        feed = _Feed(_frame(1.0), _frame(1.0), _frame(2.0))
+        poller = AdaptivePoller()
+        job = poller.add("trades", feed, 5, 60, on_change=lambda name, value: seen.append(name))
+        self._poll(poller, 2)
+        self.assertEqual(job.interval, 10)
+        self._poll(poller, 1)
+        self.assertEqual(job.interval, 5)
+        self.assertEqual(seen, ["trades", "trades"])
+        self.assertEqual(poller.latest("trades")["ltp"].iloc[0], 2.0)
+
+    def test_fast_near_session_edges(self):
+        with mock.patch("bdshare.stock.scheduler.dse_now", return_value=_OPENING):
+            poller = AdaptivePoller(edge_window=900)
+            job = poller.add("trades", _Feed(_frame(1.0)), 5, 60)
+            self._poll(poller, 4)
+        self.assertEqual(job.interval, 5)
+
+    def test_global_budget_is_shared(self):
+        poller = AdaptivePoller(budget=3, budget_period=3600)
+        feeds = [_Feed(_frame(float(i))) for i in range(5)]
+        for i, feed in enumerate(feeds):
+            poller.add(f"job{i}", feed, 1, 10)
+        wait = poller.run_pending()
+        self.assertEqual(sum(feed.calls for feed in feeds), 3)
+        self.assertGreater(wait, 0)
+
+    def test_errors_back_off(self):
+        poller = AdaptivePoller()
+        job = poller.add("depth", _Feed(BDShareError("down")), 5, 60)
+        self._poll(poller, 2)
+        self.assertEqual(job.interval, 20)
+        self.assertIsNone(poller.latest("depth"))
+
+    def test_defaults_bypass_functional_cache(self):
+        configure_cache(enabled=True)
+        self.addCleanup(configure_cache, enabled=False)
+        clear_cache()
+        poller = AdaptivePoller.with_defaults()
+        job = poller.jobs["current_trades"]
+        poller.jobs = {"current_trades": job}
+        tables = [_trade_table(210.5), _trade_table(211.0)]
+        with mock.patch.object(trading, "_fetch_table", side_effect=tables) as fetch:
+            self._poll(poller, 2)
+        self.assertEqual(fetch.call_count, 2)
+        self.assertEqual(job.changes, 2)
+        self.assertEqual(job.interval, 5)
+
+    def test_run_exits_outside_session(self):
+        poller = AdaptivePoller(exit_at_close=True)
+        feed = _Feed(_frame(1.0))
+        poller.add("trades", feed)
+        with mock.patch("bdshare.stock.scheduler.is_market_open", return_value=False):
+            poller.run()
+        self.assertEqual(feed.calls, 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
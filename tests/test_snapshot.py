@@ -0,0 +1,198 @@
+# _*_ coding:utf-8 _*_
+'''
+Offline tests for BDShare live snapshot helpers
+'''
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from bdshare import (
+    SymbolIndex, TradeSnapshot, get_top_gainers_losers, get_top_movers,
+    get_trade_quotes, rank_snapshot,
+)
+from bdshare.stock import snapshot, trading
+from bdshare.util.cache import clear_cache, configure_cache
+from bdshare.util.helper import BDShareError, _parse_html
+
+
+def _trades(**overrides):
+    rows = {
+        "symbol": ["ACI", "GP", "BATBC"],
+        "ltp":    [210.5, 300.1, 520.0],
+        "high":   [212.0, 301.0, 525.0],
+        "low":    [209.0, 298.0, 515.0],
+        "close":  [210.0, 300.0, 519.0],
+        "ycp":    [208.0, 299.0, 510.0],
+        "change": [2.5, 1.1, 10.0],
+        "trade":  [1200, 900, 400],
+        "value":  [35.2, 20.4, 12.1],
+        "volume": [160000, 70000, 23000],
+    }
+    rows.update(overrides)
+    return pd.DataFrame(rows)
+
+
+def _trade_table(ltp):
+    """The live trade table as scraped, with one ACI row."""
+    cells = [1, "ACI", ltp, "212", "209", "210", "208", "2.5", "1,200", "25.3", "120,000"]
+    row = "<tr>" + "".join(f"<td>{c}</td>" for c in cells) + "</tr>"
+    return _parse_html(f"<table><tr><th>h</th></tr>{row}</table>".encode()).find("table")
+
+
+class TestTradeSnapshot(unittest.TestCase):
+    """
+    Test suite for the live trade snapshot delta engine
+    """
+
+    def test_first_update_adds_everything(self):
+        delta = TradeSnapshot().update(_trades())
+        self.assertEqual(len(delta.added), 3)
+        self.assertTrue(delta.changed.empty)
+        self.assertTrue(delta.removed.empty)
+
+    def test_unchanged_snapshot_is_empty(self):
+        snap = TradeSnapshot()
+        snap.update(_trades())
+        self.assertTrue(snap.update(_trades()).empty)
+
+    def test_changed_rows_and_deltas(self):
+        snap = TradeSnapshot()
+        snap.update(_trades())
+        delta = snap.update(_trades(ltp=[211.0, 300.1, 520.0], volume=[160500, 70000, 23000]))
+        self.assertEqual(delta.changed["symbol"].tolist(), ["ACI"])
+        row = delta.changed.iloc[0]
+        self.assertAlmostEqual(row["ltp_delta"], 0.5)
+        self.assertEqual(row["volume_delta"], 500)
+
+    def test_added_and_removed_symbols(self):
+        snap = TradeSnapshot()
+        snap.update(_trades())
+        nxt = _trades().iloc[:2]
+        nxt = pd.concat([nxt, _trades(symbol=["NEW", "X", "Y"]).iloc[:1]], ignore_index=True)
+        delta = snap.update(nxt)
+        self.assertEqual(delta.added["symbol"].tolist(), ["NEW"])
+        self.assertEqual(delta.removed["symbol"].tolist(), ["BATBC"])
+        self.assertTrue(delta.changed.empty)
+
+    def test_missing_values_are_not_changes(self):
+        snap = TradeSnapshot()
+        snap.update(_trades(ltp=[None, 300.1, 520.0]))
+        self.assertTrue(snap.update(_trades(ltp=[None, 300.1, 520.0])).empty)
+
+    def test_fetches_when_no_frame_given(self):
+        snap = TradeSnapshot(fetch=_trades)
+        snap.update()
+        self.assertEqual(len(snap.frame), 3)
+
+    def test_live_fetch_bypasses_functional_cache(self):
+        configure_cache(enabled=True)
+        self.addCleanup(configure_cache, enabled=False)
+        clear_cache()
+        tables = [_trade_table(210.5), _trade_table(211.0)]
+        with mock.patch.object(trading, "_fetch_table", side_effect=tables) as fetch:
+            snap = TradeSnapshot()
+            snap.update()
+            delta = snap.update()
+        self.assertEqual(fetch.call_count, 2)
+        self.assertEqual(delta.changed["ltp"].tolist(), [211.0])
+
+
+class _Counter:
+    def __init__(self, frame):
+        self.frame, self.calls = frame, 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.frame
+
+
+class TestSymbolIndex(unittest.TestCase):
+    """
+    Test suite for indexed snapshot lookups
+    """
+
+    def test_many_lookups_share_one_fetch(self):
+        fetch = _Counter(_trades())
+        index = SymbolIndex(fetch, max_age=60)
+        self.assertEqual(index.get("aci")["ltp"], 210.5)
+        rows = index.lookup(["BATBC", "ACI"])
+        self.assertEqual(rows["symbol"].tolist(), ["BATBC", "ACI"])
+        self.assertIn("gp", index)
+        self.assertEqual(fetch.calls, 1)
+
+    def test_refetches_after_max_age(self):
+        fetch = _Counter(_trades())
+        index = SymbolIndex(fetch, max_age=0)
+        index.get("ACI")
+        index.get("ACI")
+        self.assertEqual(fetch.calls, 2)
+
+    def test_unknown_symbols(self):
+        index = SymbolIndex(_Counter(_trades()))
+        with self.assertRaises(BDShareError):
+            index.get("NOPE")
+        with self.assertRaises(BDShareError):
+            index.lookup(["ACI", "NOPE"])
+        self.assertEqual(index.lookup(["ACI", "NOPE"], strict=False)["symbol"].tolist(), ["ACI"])
+
+    def test_get_trade_quotes(self):
+        with mock.patch("bdshare.stock.snapshot.get_current_trade_data", return_value=_trades()) as fetch:
+            snapshot._trade_index._frame = None
+            rows = get_trade_quotes(["gp", "aci"], max_age=60)
+            row = get_trade_quotes("BATBC", max_age=60)
+        self.assertEqual(rows["symbol"].tolist(), ["GP", "ACI"])
+        self.assertEqual(len(row), 1)
+        self.assertEqual(fetch.call_count, 1)
+
+    def test_max_age_is_per_call(self):
+        with mock.patch("bdshare.stock.snapshot.get_current_trade_data", return_value=_trades()) as fetch:
+            snapshot._trade_index._frame = None
+            get_trade_quotes("ACI", max_age=0)
+            self.assertEqual(snapshot._trade_index.max_age, 5.0)
+            get_trade_quotes("ACI", max_age=60)
+            get_top_movers(3, max_age=60)
+            get_trade_quotes("ACI", max_age=0)
+        self.assertEqual(fetch.call_count, 2)
+
+
+class TestLocalRankings(unittest.TestCase):
+    """
+    Test suite for top-N rankings computed from the live snapshot
+    """
+
+    def test_rank_matches_full_sort(self):
+        frame = _trades()
+        top = rank_snapshot(frame, by="value", n=2)
+        self.assertEqual(top["symbol"].tolist(), ["ACI", "GP"])
+        bottom = rank_snapshot(frame, by="value", n=5, ascending=True)
+        self.assertEqual(bottom["symbol"].tolist(), ["BATBC", "GP", "ACI"])
+
+    def test_pct_change_and_missing_values(self):
+        frame = _trades(ycp=[200.0, 0.0, 500.0], ltp=[210.0, 300.0, None])
+        top = rank_snapshot(frame, n=10)
+        self.assertEqual(top["symbol"].tolist(), ["ACI"])
+        self.assertEqual(top["pct_change"].iloc[0], 5.0)
+
+    def test_get_top_movers_from_one_snapshot(self):
+        movers = get_top_movers(1, frame=_trades())
+        self.assertEqual(set(movers), {"gainers", "losers", "most_traded", "highest_value"})
+        self.assertEqual(movers["gainers"]["symbol"].tolist(), ["BATBC"])
+        self.assertEqual(movers["losers"]["symbol"].tolist(), ["GP"])
+        self.assertEqual(movers["most_traded"]["symbol"].tolist(), ["ACI"])
+        custom = get_top_movers(1, {"fewest_trades": ("trade", True)}, frame=_trades())
+        self.assertEqual(custom["fewest_trades"]["symbol"].tolist(), ["BATBC"])
+        with self.assertRaises(ValueError):
+            get_top_movers(1, ["nope"], frame=_trades())
+
+    def test_top_gainers_losers_local_option(self):
+        with mock.patch("bdshare.stock.snapshot.get_current_trade_data", return_value=_trades()) as fetch:
+            snapshot._trade_index._frame = None
+            df = get_top_gainers_losers(2, local=True)
+        self.assertEqual(list(df.columns), ["symbol", "ltp", "change"])
+        self.assertEqual(df["symbol"].tolist(), ["BATBC", "ACI"])
+        self.assertEqual(fetch.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,358 @@
+# _*_ coding:utf-8 _*_
+'''
+Offline tests for the Store persistence helper
+'''
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow
+except ImportError:  # Parquet, Feather and dataset tests need the optional extra
+    pyarrow = None
+
+from bdshare.util import Manifest, Store
+from bdshare.util.manifest import _checksum
+from bdshare.util.store import _apply_filters
+
+requires_arrow = unittest.skipUnless(pyarrow, "pyarrow is not installed")
+
+
+def _history():
+    return pd.DataFrame({
+        "date":   ["2024-01-01", "2024-01-01", "2024-01-02", "2024-01-02"],
+        "symbol": ["ACI", "GP", "ACI", "GP"],
+        "open":   [210.0, 300.0, 211.0, 301.5],
+        "close":  [211.0, 301.5, 212.5, 299.0],
+        "volume": [1000, 2000, 1500, 2500],
+    })
+
+
+class TestStore(unittest.TestCase):
+    """
+    Test suite for Store writes and loads
+    """
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.df = _history()
+
+    @requires_arrow
+    def test_save_multiple_sequential_and_parallel_match(self):
+        formats = ["csv", "parquet", "feather", "json"]
+        serial = Store(self.df, name="serial", path=self.tmp).save_multiple(formats)
+        threaded = Store(self.df, name="threaded", path=self.tmp).save_multiple(
+            formats, parallel=True
+        )
+        self.assertEqual([p.suffix for p in threaded], [".csv", ".parquet", ".feather", ".json"])
+        for a, b in zip(serial, threaded):
+            pd.testing.assert_frame_equal(Store.from_file(a).data, Store.from_file(b).data)
+        pd.testing.assert_frame_equal(Store.from_file(threaded[1]).data, self.df)
+
+    @requires_arrow
+    def test_save_multiple_process_pool(self):
+        paths = Store(self.df, name="proc", path=self.tmp).save_multiple(
+            ["csv", "parquet"], parallel=True, executor="process", max_workers=2
+        )
+        pd.testing.assert_frame_equal(Store.from_file(paths[1]).data, self.df)
+
+    def test_save_multiple_rejects_bad_format_before_writing(self):
+        with self.assertRaises(ValueError):
+            Store(self.df, name="bad", path=self.tmp).save_multiple(["csv", "xml"], parallel=True)
+        self.assertFalse((self.tmp / "bad.csv").exists())
+
+
+    def test_append_csv_writes_header_once(self):
+        store = Store(self.df, name="daily", path=self.tmp)
+        store.append("csv")
+        store.append("csv")
+        loaded = Store.from_file(self.tmp / "daily.csv").data
+        self.assertEqual(len(loaded), 2 * len(self.df))
+        self.assertEqual(list(loaded.columns), list(self.df.columns))
+
+    @requires_arrow
+    def test_append_partitioned_parquet_and_compact(self):
+        for day in ("2024-01-01", "2024-01-02", "2025-03-04"):
+            chunk = self.df.assign(date=day)
+            Store(chunk, name="trades", path=self.tmp).append(partition_cols=["symbol", "year"])
+
+        leaf = self.tmp / "trades" / "symbol=ACI" / "year=2024"
+        self.assertEqual(len(list(leaf.glob("part-*.parquet"))), 2)
+
+        removed = Store(self.df, name="trades", path=self.tmp).compact()
+        self.assertEqual(removed, 2)  # ACI/2024 and GP/2024 each merged 2 -> 1
+        self.assertEqual(len(list(leaf.glob("part-*.parquet"))), 1)
+
+        loaded = Store.from_file(self.tmp / "trades").data
+        self.assertEqual(len(loaded), 3 * len(self.df))
+        self.assertEqual(sorted(loaded["symbol"].astype(str).unique()), ["ACI", "GP"])
+
+    @requires_arrow
+    def test_append_rejects_unknown_partition(self):
+        with self.assertRaises(ValueError):
+            Store(self.df.drop(columns="date"), name="x", path=self.tmp).append(partition_cols=["year"])
+
+
+    @requires_arrow
+    def test_from_file_projects_and_filters_every_format(self):
+        store = Store(self.df, name="hist", path=self.tmp)
+        filters = [("symbol", "in", ["ACI"]), ("date", ">=", "2024-01-02")]
+        for fmt in ("csv", "parquet", "feather", "json"):
+            path = store.save(fmt)
+            got = Store.from_file(path, columns=["close"], filters=filters).data
+            self.assertEqual(list(got.columns), ["close"], fmt)
+            self.assertEqual(got["close"].tolist(), [212.5], fmt)
+
+    @requires_arrow
+    def test_string_date_filters_on_datetime_columns(self):
+        df = self.df.assign(date=pd.to_datetime(self.df["date"]))
+        filters = [("date", ">=", "2024-01-02")]
+        for fmt in ("parquet", "feather"):
+            root = self.tmp / fmt
+            path = Store(df, name="dt", path=root).save(fmt, manifest=True)
+            got = Store.from_file(path, columns=["close"], filters=filters).data
+            self.assertEqual(sorted(got["close"]), [212.5, 299.0], fmt)
+            got = Store.from_manifest(root, start="2024-01-02", end="2024-01-02",
+                                      columns=["close"]).data
+            self.assertEqual(sorted(got["close"]), [212.5, 299.0], fmt)
+        Store(df, name="trades", path=self.tmp).append(partition_cols=["symbol"])
+        got = Store.from_dataset(self.tmp / "trades", filters=filters).data
+        self.assertEqual(len(got), 2)
+
+    @requires_arrow
+    def test_feather_is_memory_mapped_without_copies(self):
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        big = pd.DataFrame({"close": np.arange(200_000, dtype="float64")})
+        path = Store(big, name="big", path=self.tmp).save("feather")
+        before = pa.total_allocated_bytes()
+        table = feather.read_table(path, memory_map=True)
+        self.assertLess(pa.total_allocated_bytes() - before, big["close"].nbytes // 10)
+        self.assertEqual(table.num_rows, len(big))
+
+    def test_from_file_or_filters(self):
+        path = Store(self.df, name="hist", path=self.tmp).save("csv")
+        got = Store.from_file(path, filters=[[("symbol", "=", "GP"), ("volume", ">", 2000)],
+                                             [("close", "<", 211.5)]]).data
+        self.assertEqual(got["close"].tolist(), [211.0, 299.0])
+
+    @requires_arrow
+    def test_from_dataset_prunes_partitions(self):
+        Store(self.df, name="trades", path=self.tmp).append(partition_cols=["symbol"])
+        got = Store.from_dataset(self.tmp / "trades", columns=["date", "close"],
+                                 filters=[("symbol", "=", "GP")]).data
+        self.assertEqual(got["close"].tolist(), [301.5, 299.0])
+        files = sorted((self.tmp / "trades").rglob("*.parquet"))
+        self.assertEqual(len(Store.from_dataset(files).data), len(self.df))
+
+
+    def test_compact_dtypes_is_lossless(self):
+        from bdshare.util.store import compact_dtypes, restore_dtypes
+
+        compact, report = compact_dtypes(self.df)
+        self.assertEqual(report.scale, {"open": 10, "close": 10})
+        self.assertEqual(str(compact["volume"].dtype), "int16")
+        self.assertEqual(str(compact["symbol"].dtype), "category")
+        self.assertTrue(str(compact["date"].dtype).startswith("datetime64"))
+        self.assertGreater(report.bytes_saved, 0)
+
+        restored = restore_dtypes(compact, report.spec)
+        self.assertEqual(restored["close"].tolist(), self.df["close"].tolist())
+
+    @requires_arrow
+    def test_save_compact_round_trips_binary_and_text(self):
+        for fmt in ("parquet", "feather", "csv"):
+            store = Store(self.df, name="compact", path=self.tmp)
+            path = store.save(fmt, compact=True)
+            self.assertGreater(store.compaction.bytes_saved, 0)
+
+            loaded = Store.from_file(path).data
+            self.assertEqual(loaded["close"].tolist(), self.df["close"].tolist(), fmt)
+            self.assertEqual(str(loaded["volume"].dtype), "int16", fmt)
+            self.assertEqual(str(loaded["symbol"].dtype), "category", fmt)
+
+            got = Store.from_file(path, columns=["close"],
+                                  filters=[("close", ">", 300.0), ("date", ">=", "2024-01-02")]).data
+            self.assertEqual(got["close"].tolist(), [], fmt)
+            got = Store.from_file(path, columns=["close"], filters=[("close", "in", [301.5, 212.5])]).data
+            self.assertEqual(sorted(got["close"].tolist()), [212.5, 301.5], fmt)
+
+    @requires_arrow
+    def test_compact_filters_between_grid_points(self):
+        cases = [
+            [("close", ">", 211.05)],
+            [("close", ">=", 299.01)],
+            [("close", "<", 211.04)],
+            [("close", "<=", 299.04)],
+            [("close", "==", 211.05)],
+            [("close", "!=", 211.05)],
+            [("close", "in", [211.05, 212.5])],
+            [("close", "not in", [211.05])],
+            [[("close", "==", 211.05)], [("symbol", "==", "GP")]],
+        ]
+        for fmt in ("parquet", "feather"):
+            path = Store(self.df, name="grid", path=self.tmp).save(fmt, compact=True)
+            for filters in cases:
+                got = Store.from_file(path, columns=["close"], filters=filters).data
+                want = _apply_filters(self.df, filters)["close"]
+                self.assertEqual(sorted(got["close"]), sorted(want), (fmt, filters))
+
+    def test_plain_save_drops_stale_sidecar(self):
+        store = Store(self.df, name="plain", path=self.tmp)
+        store.save("csv", compact=True)
+        store.save("csv")
+        self.assertFalse((self.tmp / "plain.csv.schema.json").exists())
+        self.assertEqual(str(Store.from_file(self.tmp / "plain.csv").data["volume"].dtype), "int64")
+
+    def test_save_multiple_drops_stale_sidecar(self):
+        store = Store(self.df, name="multi", path=self.tmp)
+        store.save("csv", compact=True)
+        csv, _ = store.save_multiple(["csv", "json"])
+        self.assertFalse((self.tmp / "multi.csv.schema.json").exists())
+        loaded = Store.from_file(csv).data
+        self.assertEqual(str(loaded["close"].dtype), "float64")
+        self.assertEqual(str(loaded["symbol"].dtype), str(self.df["symbol"].dtype))
+
+
+    def _chunks(self):
+        for _, chunk in self.df.groupby("date", sort=True):
+            yield chunk
+
+    @requires_arrow
+    def test_save_chunks_streams_every_format(self):
+        for fmt, compression in (("csv", None), ("csv", "gzip"), ("json", None), ("parquet", None)):
+            path = Store.save_chunks(self._chunks(), name=f"stream-{compression}", path=self.tmp,
+                                     fmt=fmt, compression=compression)
+            extra = {"compression": compression} if compression else {}
+            loaded = Store.from_file(path, **extra)
+            self.assertEqual(loaded.data["close"].tolist(), self.df["close"].tolist(), fmt)
+
+        import pyarrow.parquet as pq
+        self.assertEqual(pq.ParquetFile(self.tmp / "stream-None.parquet").num_row_groups, 2)
+
+    def test_save_chunks_csv_header_once_after_empty_chunk(self):
+        chunks = iter([self.df.iloc[:0], self.df])
+        path = Store.save_chunks(chunks, name="lead", path=self.tmp, fmt="csv")
+        self.assertEqual(path.read_text().count("date,symbol"), 1)
+        self.assertEqual(len(Store.from_file(path).data), len(self.df))
+
+    def test_failed_writes_leave_no_partial_file(self):
+        def broken():
+            yield self.df
+            raise RuntimeError("fetch died")
+
+        with self.assertRaises(IOError):
+            Store.save_chunks(broken(), name="broken", path=self.tmp)
+        with self.assertRaises(ValueError):
+            Store.save_chunks(iter([]), name="empty", path=self.tmp)
+
+        store = Store(self.df, name="atomic", path=self.tmp)
+        store.save("csv")
+        with self.assertRaises(IOError):
+            store.save("csv", not_a_pandas_option=True)
+        self.assertEqual(len(Store.from_file(self.tmp / "atomic.csv").data), len(self.df))
+        self.assertEqual(sorted(p.name for p in self.tmp.iterdir() if p.name.startswith(".")), [])
+
+
+    def test_sqlite_upsert_and_indexed_query(self):
+        store = Store(self.df, name="archive", path=self.tmp)
+        db = store.save("sqlite")
+        revised = self.df.iloc[2:].assign(close=[213.0, 298.0])
+        Store(revised, name="archive", path=self.tmp).save("sqlite")
+
+        everything = Store.from_file(db).data
+        self.assertEqual(len(everything), len(self.df))  # re-ingested day replaced, not duplicated
+
+        got = Store.query(db, symbols=["aci"], start="2024-01-02", end="2024-01-02", columns=["close"])
+        self.assertEqual(got["close"].tolist(), [213.0])
+
+        plan = Store.query(db, "EXPLAIN QUERY PLAN SELECT close FROM data WHERE symbol = ? AND date = ?",
+                           params=["ACI", "2024-01-02"])
+        self.assertIn("ux_data_symbol_date", " ".join(plan["detail"]))
+
+        got = Store.from_file(db, columns=["symbol"], filters=[("volume", ">=", 2000)]).data
+        self.assertEqual(sorted(got["symbol"]), ["GP", "GP"])
+
+    def test_sqlite_keeps_date_index_in_key(self):
+        hist = self.df[self.df["symbol"] == "ACI"].set_index("date")
+        db = Store(hist, name="hist", path=self.tmp).save("sqlite")
+        got = Store.from_file(db).data
+        self.assertEqual(sorted(got["date"]), ["2024-01-01", "2024-01-02"])
+
+        with self.assertRaises(ValueError):
+            Store(self.df.drop(columns="date"), name="nodate", path=self.tmp).save("sqlite")
+        Store(self.df.drop(columns="date"), name="nodate", path=self.tmp).save("sqlite", key=("symbol",))
+
+    def test_sqlite_write_rolls_back_on_error(self):
+        db = Store(self.df, name="tx", path=self.tmp).save("sqlite")
+        bad = self.df.assign(date="2030-01-01", open=[1.0, 2.0, [3.0], 4.0])
+        with self.assertRaises(IOError):
+            Store(bad, name="tx", path=self.tmp).save("sqlite", batch_size=2)
+        self.assertEqual(len(Store.from_file(db).data), len(self.df))
+
+    @requires_arrow
+    def test_manifest_records_stats_and_skips_files(self):
+        for day in ("2024-01-01", "2024-01-02"):
+            frame = self.df[self.df["date"] == day]
+            Store(frame, name=f"day-{day}", path=self.tmp).save("parquet", manifest=True)
+        Store(self.df.assign(symbol="BATBC"), name="batbc", path=self.tmp).save("csv", manifest=True)
+
+        manifest = Manifest(self.tmp)
+        entry = manifest.entries["day-2024-01-02.parquet"]
+        self.assertEqual((entry["rows"], entry["date_min"], entry["symbols"]), (2, "2024-01-02", ["ACI", "GP"]))
+        self.assertEqual(len(entry["checksum"]), 32)
+
+        self.assertEqual([p.name for p in manifest.files(symbols=["gp"], start="2024-01-02")],
+                         ["day-2024-01-02.parquet"])
+        got = Store.from_manifest(self.tmp, symbols=["ACI"], columns=["date", "close"]).data
+        self.assertEqual(got["close"].tolist(), [211.0, 212.5])
+
+    def test_manifest_defers_checksum_on_csv_append(self):
+        store = Store(self.df, name="daily", path=self.tmp)
+        with mock.patch("bdshare.util.manifest._checksum", wraps=_checksum) as checksum:
+            store.append("csv", manifest=True)
+            store.append("csv", manifest=True)
+        checksum.assert_not_called()
+
+        manifest = Manifest(self.tmp)
+        self.assertIsNone(manifest.entries["daily.csv"]["checksum"])
+        self.assertEqual(manifest.entries["daily.csv"]["rows"], 2 * len(self.df))
+        self.assertEqual(manifest.verify(), [])
+        self.assertEqual(len(Manifest(self.tmp).entries["daily.csv"]["checksum"]), 32)
+
+        with open(self.tmp / "daily.csv", "a") as fh:
+            fh.write("2024-01-03,ACI,1,1,1\n")
+        self.assertEqual(manifest.verify(), ["daily.csv"])
+
+    @requires_arrow
+    def test_manifest_refresh_indexes_partitions_and_deletions(self):
+        store = Store(self.df, name="trades", path=self.tmp)
+        store.append(partition_cols=["symbol"], manifest=True)
+        store.append(partition_cols=["symbol"], manifest=True)
+        self.assertEqual(len(Manifest(self.tmp)), 4)
+
+        store.compact()
+        manifest = Manifest(self.tmp)
+        self.assertEqual(len(manifest), 2)
+        self.assertEqual(len(manifest.files(symbols=["GP"])), 1)
+
+        got = Store.from_manifest(self.tmp, symbols=["GP"], end="2024-01-01").data
+        self.assertEqual((got["close"].tolist(), got["symbol"].unique().tolist()), ([301.5, 301.5], ["GP"]))
+
+        Store(self.df, name="loose", path=self.tmp).save("json")
+        for p in (self.tmp / "trades" / "symbol=GP").glob("*.parquet"):
+            p.unlink()
+        self.assertEqual(manifest.refresh(), 2)  # loose.json added, GP part removed
+        self.assertEqual(sorted(Manifest(self.tmp)), ["loose.json", "trades/symbol=ACI/" +
+                                                      next((self.tmp / "trades" / "symbol=ACI").glob("*")).name])
+
+
+if __name__ == '__main__':
+    unittest.main()
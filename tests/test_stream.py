@@ -0,0 +1,179 @@
+# _*_ coding:utf-8 _*_
+'''
+Offline tests for BDShare streaming helpers and the DSE session clock
+'''
+import queue
+import asyncio
+import unittest
+from unittest import mock
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from bdshare import SnapshotDelta, TradeBroker, astream_trades, stream_trades
+from bdshare.stock import trading
+from bdshare.util.cache import clear_cache, configure_cache
+from bdshare.util.helper import BDShareError, _parse_html
+from bdshare.util.market_hours import is_market_open, next_open, seconds_to_close
+
+
+def _trades(ltp=210.5):
+    return pd.DataFrame({
+        "symbol": ["ACI", "GP"],
+        "ltp":    [ltp, 300.1],
+        "trade":  [1200, 900],
+        "volume": [160000, 70000],
+    })
+
+
+def _trade_table(ltp):
+    """The live trade table as scraped, with one ACI row."""
+    cells = [1, "ACI", ltp, "212", "209", "210", "208", "2.5", "1,200", "25.3", "120,000"]
+    row = "<tr>" + "".join(f"<td>{c}</td>" for c in cells) + "</tr>"
+    return _parse_html(f"<table><tr><th>h</th></tr>{row}</table>".encode()).find("table")
+
+
+class _Feed:
+    """Callable returning a scripted sequence of frames."""
+
+    def __init__(self, *frames):
+        self.frames = list(frames)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        frame = self.frames[min(self.calls, len(self.frames)) - 1]
+        if isinstance(frame, Exception):
+            raise frame
+        return frame
+
+
+class TestMarketHours(unittest.TestCase):
+    """
+    Test suite for the DSE session clock
+    """
+
+    def test_session_boundaries(self):
+        # 2024-05-05 is a Sunday (trading day); 2024-05-03 is a Friday.
+        self.assertTrue(is_market_open(datetime(2024, 5, 5, 10, 0)))
+        self.assertFalse(is_market_open(datetime(2024, 5, 5, 14, 30)))
+        self.assertFalse(is_market_open(datetime(2024, 5, 3, 11, 0)))
+
+    def test_aware_datetimes_are_converted(self):
+        # 05:00 UTC is 11:00 in Dhaka.
+        self.assertTrue(is_market_open(datetime(2024, 5, 5, 5, 0, tzinfo=timezone.utc)))
+
+    def test_next_open_skips_weekend(self):
+        nxt = next_open(datetime(2024, 5, 2, 15, 0))   # Thursday after close
+        self.assertEqual((nxt.month, nxt.day, nxt.hour), (5, 5, 10))
+        self.assertEqual(seconds_to_close(datetime(2024, 5, 5, 14, 0)), 1800)
+
+
+class TestStreamTrades(unittest.TestCase):
+    """
+    Test suite for the sync and async trade streams
+    """
+
+    def test_symbol_filter(self):
+        stream = stream_trades(["aci"], interval=0.01, until_close=False, fetch=_Feed(_trades()))
+        frame = next(stream)
+        self.assertEqual(frame["symbol"].tolist(), ["ACI"])
+
+    def test_delta_mode_skips_unchanged_ticks(self):
+        feed = _Feed(_trades(), _trades(), _trades(), _trades(211.0))
+        stream = stream_trades(interval=0.01, deltas=True, until_close=False, fetch=feed)
+        first, second = next(stream), next(stream)
+        self.assertIsInstance(second, SnapshotDelta)
+        self.assertEqual(len(first.added), 2)
+        self.assertEqual(second.changed["symbol"].tolist(), ["ACI"])
+        self.assertEqual(feed.calls, 4)
+
+    def test_live_fetch_bypasses_functional_cache(self):
+        configure_cache(enabled=True)
+        self.addCleanup(configure_cache, enabled=False)
+        clear_cache()
+        tables = [_trade_table(ltp) for ltp in (210.5, 211.0, 211.5)]
+        with mock.patch.object(trading, "_fetch_table", side_effect=tables):
+            stream = stream_trades(interval=0.01, until_close=False)
+            ltps = [next(stream)["ltp"].iloc[0] for _ in range(3)]
+        self.assertEqual(ltps, [210.5, 211.0, 211.5])
+
+    def test_upstream_errors_are_skipped(self):
+        feed = _Feed(BDShareError("down"), _trades())
+        frame = next(stream_trades(interval=0.01, until_close=False, fetch=feed))
+        self.assertEqual(len(frame), 2)
+
+    def test_stops_when_market_closed(self):
+        with mock.patch("bdshare.stock.stream.is_market_open", return_value=False):
+            self.assertEqual(list(stream_trades(fetch=_Feed(_trades()))), [])
+
+    def test_async_stream(self):
+        async def take(n):
+            out = []
+            async for frame in astream_trades(interval=0.01, until_close=False,
+                                              fetch=_Feed(_trades())):
+                out.append(frame)
+                if len(out) == n:
+                    break
+            return out
+
+        frames = asyncio.run(take(2))
+        self.assertEqual(len(frames), 2)
+
+
+class TestTradeBroker(unittest.TestCase):
+    """
+    Test suite for the pub/sub trade broker
+    """
+
+    def test_fan_out_by_symbol(self):
+        broker = TradeBroker(until_close=False)
+        everyone = broker.subscribe()
+        aci = broker.subscribe(["aci"])
+        nobody = broker.subscribe(["NONE"])
+        broker.publish(_trades())
+        self.assertEqual(len(everyone.get(timeout=1)), 2)
+        self.assertEqual(aci.get(timeout=1)["symbol"].tolist(), ["ACI"])
+        with self.assertRaises(queue.Empty):
+            nobody.get(timeout=0.01)
+
+    def test_drop_oldest_when_full(self):
+        broker = TradeBroker(until_close=False)
+        sub = broker.subscribe(maxsize=2)
+        for ltp in (1.0, 2.0, 3.0):
+            broker.publish(_trades(ltp))
+        self.assertEqual(sub.dropped, 1)
+        self.assertEqual(sub.get()["ltp"].iloc[0], 2.0)
+        self.assertEqual(len(sub), 1)
+
+    def test_delta_fan_out(self):
+        broker = TradeBroker(deltas=True, until_close=False)
+        gp = broker.subscribe(["GP"])
+        delta = SnapshotDelta(datetime.now(), _trades(), _trades().iloc[:0], _trades().iloc[:0])
+        broker.publish(delta)
+        got = gp.get(timeout=1)
+        self.assertIsInstance(got, SnapshotDelta)
+        self.assertEqual(got.changed["symbol"].tolist(), ["GP"])
+        self.assertTrue(got.added.empty)
+
+    def test_single_poller_serves_all_subscribers(self):
+        feed = _Feed(_trades())
+        broker = TradeBroker(interval=0.05, until_close=False, fetch=feed)
+        subs = [broker.subscribe(["ACI"]) for _ in range(5)]
+        with broker:
+            frames = [sub.get(timeout=2) for sub in subs]
+        self.assertEqual(len(frames), 5)
+        self.assertLess(feed.calls, len(subs))
+        list(subs[0])  # iteration ends once the broker has stopped
+
+    def test_unsubscribe_ends_iteration(self):
+        broker = TradeBroker(until_close=False)
+        sub = broker.subscribe(["ACI"])
+        sub.close()
+        broker.publish(_trades())
+        self.assertEqual(list(sub), [])
+        self.assertEqual(broker._by_symbol, {})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
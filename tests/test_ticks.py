@@ -0,0 +1,132 @@
+# _*_ coding:utf-8 _*_
+'''
+Offline tests for BDShare intraday tick storage
+'''
+import unittest
+import warnings
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from bdshare import BarBuilder, TickStore
+from bdshare.util.helper import BDShareError
+
+
+def _snapshot(ltp, volume, symbols=("ACI", "GP")):
+    return pd.DataFrame({
+        "symbol": list(symbols),
+        "ltp":    [ltp, ltp + 100],
+        "volume": [volume, volume * 2],
+        "trade":  [10, 20],
+        "value":  [1.5, 3.0],
+    })
+
+
+class TestTickStore(unittest.TestCase):
+    """
+    Test suite for the ring-buffer tick store
+    """
+
+    def test_append_and_window(self):
+        ticks = TickStore(capacity=8)
+        t0 = datetime(2024, 5, 5, 10, 0)
+        for i in range(3):
+            ticks.append(_snapshot(200.0 + i, 1000 + i), timestamp=t0 + timedelta(seconds=5 * i))
+        w = ticks.window("aci")
+        self.assertEqual(w["ltp"].tolist(), [200.0, 201.0, 202.0])
+        self.assertEqual(w["volume"].dtype, np.int64)
+        self.assertEqual(w["timestamp"][-1], np.datetime64(t0 + timedelta(seconds=10), "ns"))
+        self.assertEqual(ticks.window("GP", 2)["ltp"].tolist(), [301.0, 302.0])
+
+    def test_aware_timestamps_stored_as_utc(self):
+        ticks = TickStore(capacity=4)
+        dhaka = timezone(timedelta(hours=6))
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            ticks.append(_snapshot(200.0, 1000), timestamp=datetime(2024, 5, 5, 10, 30, tzinfo=dhaka))
+        self.assertEqual(ticks.window("ACI")["timestamp"][-1], np.datetime64("2024-05-05T04:30", "ns"))
+
+    def test_wraparound_keeps_latest_contiguous(self):
+        ticks = TickStore(capacity=4)
+        for i in range(10):
+            ticks.append(_snapshot(float(i), i))
+        w = ticks.window("ACI")
+        self.assertEqual(w["ltp"].tolist(), [6.0, 7.0, 8.0, 9.0])
+        self.assertIsNotNone(w["ltp"].base)          # a view, not a copy
+        self.assertFalse(w["ltp"].flags.writeable)
+
+    def test_memory_is_fixed(self):
+        ticks = TickStore(capacity=16, max_symbols=4)
+        before = ticks.nbytes
+        for i in range(100):
+            ticks.append(_snapshot(float(i), i))
+        self.assertEqual(ticks.nbytes, before)
+
+    def test_symbol_limit(self):
+        ticks = TickStore(capacity=4, max_symbols=1)
+        with self.assertRaises(BDShareError):
+            ticks.append(_snapshot(1.0, 1))
+
+    def test_missing_values_and_rename(self):
+        ticks = TickStore(capacity=4, fields=("ltp", "volume"))
+        raw = pd.DataFrame({"TRADING_CODE": ["ACI"], "LTP": [None], "VOLUME": [None]})
+        ticks.append(raw, columns={"TRADING_CODE": "symbol", "LTP": "ltp", "VOLUME": "volume"})
+        w = ticks.window("ACI")
+        self.assertTrue(np.isnan(w["ltp"][0]))
+        self.assertEqual(w["volume"][0], 0)
+        self.assertEqual(list(ticks.frame("ACI").columns), ["ltp", "volume"])
+
+
+class TestBarBuilder(unittest.TestCase):
+    """
+    Test suite for the incremental OHLCV bar builder
+    """
+
+    def setUp(self):
+        self.t0 = datetime(2024, 5, 5, 10, 0, 0)
+
+    def _feed(self, builder, seconds, ltp, volume, symbols=("ACI", "GP")):
+        return builder.update(_snapshot(ltp, volume, symbols), self.t0 + timedelta(seconds=seconds))
+
+    def test_bar_ohlc_and_differenced_volume(self):
+        builder = BarBuilder("1min")
+        self._feed(builder, 0, 200.0, 1000)
+        self._feed(builder, 20, 205.0, 1100)
+        self._feed(builder, 40, 198.0, 1250)
+        done = self._feed(builder, 65, 201.0, 1300)
+
+        aci = done.set_index("symbol").loc["ACI"]
+        self.assertEqual(
+            (aci["open"], aci["high"], aci["low"], aci["close"]),
+            (200.0, 205.0, 198.0, 198.0),
+        )
+        self.assertEqual(aci["volume"], 250)
+        self.assertEqual(aci["start"], pd.Timestamp(self.t0))
+
+        last = builder.flush().set_index("symbol").loc["ACI"]
+        self.assertEqual(last["volume"], 50)     # 1300 - 1250
+        self.assertEqual(last["open"], 201.0)
+        self.assertEqual(len(builder.bars), 4)
+
+    def test_new_symbol_mid_bar(self):
+        builder = BarBuilder(60)
+        self._feed(builder, 0, 200.0, 1000, symbols=("ACI", "GP"))
+        self._feed(builder, 10, 210.0, 1000, symbols=("ACI", "NEW"))
+        bars = builder.flush().set_index("symbol")
+        self.assertEqual(sorted(bars.index), ["ACI", "GP", "NEW"])
+        self.assertEqual(bars.loc["NEW", "open"], 310.0)
+
+    def test_on_bar_callback(self):
+        seen = []
+        builder = BarBuilder("1min", on_bar=seen.append)
+        self._feed(builder, 0, 200.0, 1000)
+        self.assertEqual(seen, [])
+        self._feed(builder, 61, 201.0, 1010)
+        self.assertEqual(len(seen), 1)
+        self.assertEqual(list(seen[0].columns),
+                         ["symbol", "start", "open", "high", "low", "close", "volume", "value", "trade"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)